@@ -1,31 +1,116 @@
 """Root agent for ADK - placed in agent/ subdirectory for ADK discovery."""
-from google.adk.agents import SequentialAgent, LoopAgent
-from .subagents.a1_hazard_agent import create_hazard_agent
-from .subagents.a2_permit_agent import create_permit_agent
-from .subagents.a3_validator_agent import create_validator_agent
-from .subagents.a4_refiner_agent import create_refiner_agent
-"""
-Create root agent that orchestrates A1 → A2 → A3 sequential workflow.
-
-Uses ADK's SequentialAgent to coordinate the sequential execution.
-"""
-# Create sub-agents
-initial_hazard_agent = create_hazard_agent()
-permit_generation_agent = create_permit_agent()
-permit_validation_agent = create_validator_agent()
-permit_refiner_agent = create_refiner_agent()
-
-permit_refinement_loop = LoopAgent(
-    name="permit_refinement_loop",
-    sub_agents=[permit_validation_agent,permit_refiner_agent],
-    max_iterations=2,
+import threading
+from typing import TYPE_CHECKING, Optional, Union
+from .config.settings import (
+    PIPELINE_CACHE, OBSERVABILITY_ENABLED, CONTEXT_PREFETCH, TOOL_MEMO, STARTUP_MODE, STARTUP_WARMUP,
 )
+from .startup import start_warmup
 
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+    from google.adk.models import BaseLlm
+
+_root_agent: Optional["BaseAgent"] = None
+_root_agent_lock = threading.Lock()
+
+
+def create_root_agent(model: Optional[Union[str, "BaseLlm"]] = None) -> "BaseAgent":
+    """
+    Create root agent that orchestrates A1 → A2 → A3 sequential workflow.
+
+    Uses ADK's SequentialAgent to coordinate the sequential execution.
+
+    Args:
+        model: Model for every LLM sub-agent (e.g., a benchmark stand-in);
+            None keeps each sub-agent's own Gemini model
+
+    Returns:
+        The pipeline, wrapped in the result cache when PIPELINE_CACHE is enabled
+    """
+    # Imported here so that importing this module (STARTUP_MODE=lazy) loads neither ADK nor the tools and their dependencies
+    from google.adk.agents import SequentialAgent, LoopAgent
+    from .subagents.context_prefetch_agent import create_context_prefetch_agent
+    from .subagents.a1_hazard_agent import create_hazard_agent
+    from .subagents.a2_permit_agent import create_permit_agent
+    from .subagents.validation_fanout_agent import create_validation_fanout_agent
+    from .subagents.a4_refiner_agent import create_refiner_agent
+    from .subagents.rules_precheck_agent import create_rules_precheck_agent
+    from .pipeline.result_cache import CachedPipelineAgent
+    from .tools.memo import memoize_agent
+    from .observability.agents import instrument_agent
+    from .observability.setup import configure_observability
+
+    # Create sub-agents
+    initial_hazard_agent = create_hazard_agent(model)
+    permit_generation_agent = create_permit_agent(model)
+    # One A3 validator per permit, run concurrently
+    permit_validation_agent = create_validation_fanout_agent(model)
+    permit_refiner_agent = create_refiner_agent(model)
+
+    permit_refinement_loop = LoopAgent(
+        name="permit_refinement_loop",
+        sub_agents=[permit_validation_agent,permit_refiner_agent],
+        max_iterations=2,
+    )
+
+    # Deterministic rules pre-check; enters the refinement loop only when permits have findings
+    permit_refinement_stage = create_rules_precheck_agent(permit_refinement_loop)
+
+    pipeline_stages = [initial_hazard_agent, permit_generation_agent, permit_refinement_stage]
+    # Work order, weather and RAG evidence fetched concurrently up front instead of via A1 tool-call turns
+    if CONTEXT_PREFETCH:
+        pipeline_stages.insert(0, create_context_prefetch_agent())
+
+    # Create root agent with sub-agents
+    permit_pipeline = SequentialAgent(
+        name='sequential_permit_agent',
+        description="Orchestrates sequential permit generation pipeline: hazard identification → permit generation → permit validation",
+        sub_agents=pipeline_stages,
+    )
+
+    # Unchanged work orders are served from the result cache instead of re-running the chain
+    if PIPELINE_CACHE in ("", "none", "off"):
+        agent = permit_pipeline
+    else:
+        agent = CachedPipelineAgent(name='cached_permit_agent', pipeline=permit_pipeline)
+
+    # Repeated pure tool calls within a run are answered from temp: state
+    if TOOL_MEMO:
+        memoize_agent(agent)
+
+    # Per-agent wall time, LLM latency/tokens and loop iterations (tools are traced where defined)
+    if OBSERVABILITY_ENABLED:
+        configure_observability()
+        instrument_agent(agent)
+    return agent
+
+
+def get_root_agent() -> "BaseAgent":
+    """
+    Get the process-wide root agent, built on first use.
+
+    Concurrent callers (ADK's agent loader, the warm-up thread) wait for the
+    same build.
+
+    Returns:
+        The agent from create_root_agent()
+    """
+    global _root_agent
+    if _root_agent is None:
+        with _root_agent_lock:
+            if _root_agent is None:
+                _root_agent = create_root_agent()
+    return _root_agent
+
+
+def __getattr__(name: str):
+    # STARTUP_MODE=lazy: root_agent is built when ADK (or the warm-up thread) first asks for it
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create root agent with sub-agents
-root_agent = SequentialAgent(
-    name='sequential_permit_agent',
-    description="Orchestrates sequential permit generation pipeline: hazard identification → permit generation → permit validation",
-    sub_agents=[initial_hazard_agent, permit_generation_agent, permit_refinement_loop],
-)
 
+if STARTUP_MODE != "lazy":
+    root_agent = get_root_agent()
+elif STARTUP_WARMUP:
+    start_warmup(get_root_agent)
@@ -0,0 +1 @@
+"""Benchmarks module: offline harness with synthetic data and stand-in LLM, RAG and weather backends."""
@@ -0,0 +1,299 @@
+"""Offline benchmark harness: time the tools and the full pipeline against local stand-ins.
+
+configure_environment() must run before anything imports config.settings
+(settings are read once at import), which is why the package modules are
+imported inside the benchmark functions.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+
+from ..pipeline.metrics import percentile
+from .standins import StandInLlm, permit_types_for, with_latency
+
+
+# Metrics compared against a baseline, and whether lower values are better
+COMPARED_METRICS = {
+    "p50Ms": True,
+    "p95Ms": True,
+    "meanMs": True,
+    "opsPerSecond": False,
+    "throughputPerMinute": False,
+}
+
+
+def configure_environment(assets_dir: str, weather_url: str, caches: bool = False) -> None:
+    """
+    Point the package at the synthetic assets and stand-in backends.
+
+    Args:
+        assets_dir: Synthetic assets directory (ASSETS_PATH)
+        weather_url: Weather stand-in endpoint (WEATHER_API_URL)
+        caches: Keep the RAG/weather/pipeline result caches on (default off, so backend paths are measured)
+    """
+    os.environ.update({
+        "ASSETS_PATH": assets_dir,
+        "WORKORDER_STORE": "json",
+        "VECTOR_STORE_TYPE": "local",
+        "WEATHER_API_URL": weather_url,
+        "WEATHER_API_KEY": "stand-in",
+        "TRACE_EXPORTER": "none",
+    })
+    for name in ("RAG_INDEX_PATH", "RAG_CORPUS", "DB_URL", "METRICS_PORT", "METRICS_FILE"):
+        os.environ.pop(name, None)
+    if not caches:
+        os.environ.update({
+            "RAG_CACHE_ENABLED": "false",
+            "WEATHER_CACHE_TTL_SECONDS": "0",
+            "PIPELINE_CACHE": "none",
+        })
+    else:
+        os.environ.setdefault("PIPELINE_CACHE", "sqlite")
+
+
+def time_calls(func: Callable[..., Any], calls: Sequence[Dict[str, Any]], warmup: int = 5) -> Dict[str, Any]:
+    """
+    Time func over a list of keyword-argument sets.
+
+    Args:
+        func: Function to call
+        calls: Keyword arguments for each timed call
+        warmup: Untimed calls first (first-use loading, JIT-like warmups)
+
+    Returns:
+        Dictionary with calls, totalSeconds, opsPerSecond and meanMs/p50Ms/p95Ms/p99Ms/maxMs
+    """
+    for kwargs in calls[:warmup]:
+        func(**kwargs)
+    durations = []
+    started = time.perf_counter()
+    for kwargs in calls:
+        call_started = time.perf_counter()
+        func(**kwargs)
+        durations.append((time.perf_counter() - call_started) * 1000)
+    total = time.perf_counter() - started
+    return {
+        "calls": len(durations),
+        "totalSeconds": round(total, 4),
+        "opsPerSecond": round(len(durations) / total, 1) if total > 0 else None,
+        "meanMs": round(sum(durations) / len(durations), 4) if durations else None,
+        "p50Ms": round(percentile(durations, 50), 4) if durations else None,
+        "p95Ms": round(percentile(durations, 95), 4) if durations else None,
+        "p99Ms": round(percentile(durations, 99), 4) if durations else None,
+        "maxMs": round(max(durations), 4) if durations else None,
+    }
+
+
+def _sample_permit(rng: random.Random, permit_type: str, rules: Dict[str, Any], defect_rate: float) -> Dict[str, Any]:
+    """Build a permit for rules.evaluate; with probability defect_rate it misses a requirement."""
+    controls = list(rules.get("required_controls", []))
+    signoffs = list(rules.get("required_signoffs", []))
+    if controls and rng.random() < defect_rate:
+        controls.pop(rng.randrange(len(controls)))
+    if signoffs and rng.random() < defect_rate:
+        signoffs.pop(rng.randrange(len(signoffs)))
+    return {
+        "permitId": f"PERM-BENCH-{rng.randint(1, 9999):04d}",
+        "type": permit_type,
+        "controls": controls + ["Toolbox talk held"],
+        "ppe": list(rules.get("required_ppe", [])),
+        "signOffRoles": signoffs,
+        "validityHours": rng.choice((4, 8, 12, 48)),
+    }
+
+
+def bench_tools(iterations: int = 1000, seed: int = 0, rag_latency_seconds: float = 0.0) -> Dict[str, Any]:
+    """
+    Benchmark each agent-facing tool on the synthetic data.
+
+    Args:
+        iterations: Timed calls per tool
+        seed: Random seed for the call arguments
+        rag_latency_seconds: Injected latency per retrieval (stand-in for the Vertex AI round trip)
+
+    Returns:
+        time_calls() results keyed by tool
+    """
+    from ..tools import policy, rag, rules, weather, workorders
+
+    rng = random.Random(seed)
+    ids = workorders.list_workorder_ids()
+    sample_ids = [rng.choice(ids) for _ in range(iterations)]
+    work_orders = [workorders.get_workorder_by_id(wo_id) for wo_id in sample_ids]
+    permit_types = list(itertools.islice(itertools.cycle(("Hot Work", "Confined Space Entry", "Excavation",
+                                                          "Electrical/LOTO", "Working at Height")), iterations))
+    permits = []
+    for wo in work_orders:
+        permit_type = permit_types_for(wo.get("description", ""))[0]
+        permits.append(_sample_permit(rng, permit_type, policy.load(permit_type)["rules"], defect_rate=0.3))
+
+    if rag_latency_seconds:
+        rag._local_search = with_latency(rag._local_search, rag_latency_seconds)
+    index_started = time.perf_counter()
+    rag.rag_search("warm up the local index")
+    index_seconds = time.perf_counter() - index_started
+
+    results = {
+        "get_workorder_by_id": time_calls(workorders.get_workorder_by_id, [{"id": wo_id} for wo_id in sample_ids]),
+        "policy.load": time_calls(policy.load, [{"permitType": t} for t in permit_types]),
+        "rules.evaluate": time_calls(rules.evaluate, [{"permit": p} for p in permits]),
+        "rag_search": time_calls(
+            rag.rag_search, [{"query": " ".join(wo["description"].split()[:12])} for wo in work_orders]
+        ),
+        "get_weather_data": time_calls(
+            weather.get_weather_data, [{"lat": wo["latitude"], "lon": wo["longitude"]} for wo in work_orders]
+        ),
+    }
+    results["rag_search"]["indexBuildSeconds"] = round(index_seconds, 3)
+    return results
+
+
+def bench_pipeline(
+    runs: int = 50,
+    concurrency: int = 8,
+    llm_latency_seconds: float = 0.0,
+    llm_jitter_seconds: float = 0.0,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Benchmark root_agent end to end with the stand-in LLM.
+
+    Args:
+        runs: Work orders to run through the pipeline
+        concurrency: Work orders in flight at once
+        llm_latency_seconds: Injected latency per LLM call
+        llm_jitter_seconds: Extra seeded random latency per LLM call (0..jitter)
+        seed: Random seed for work order selection and jitter
+
+    Returns:
+        Run summary subset: succeeded, failed, throughputPerMinute, latency, per-stage p50/p95
+        and memoized tool call/duplicate counts
+    """
+    from ..agent import create_root_agent
+    from ..pipeline.batch import BatchRunner
+    from ..tools import workorders
+    from ..tools.memo import tool_memo_stats
+
+    rng = random.Random(seed)
+    ids = workorders.list_workorder_ids()
+    sample_ids = rng.sample(ids, min(runs, len(ids)))
+    llm = StandInLlm(model="stand-in", latency_seconds=llm_latency_seconds, jitter_seconds=llm_jitter_seconds, seed=seed)
+    agent = create_root_agent(model=llm)
+    output_path = os.path.join(tempfile.mkdtemp(prefix="permitflow_bench_"), "results.jsonl")
+    runner = BatchRunner(agent, output_path, concurrency=concurrency, app_name="permitflow_bench")
+    summary = asyncio.run(runner.run(sample_ids, resume=False, progress_every=0))
+    latency = summary["latency"]
+    return {
+        "runs": len(sample_ids),
+        "concurrency": concurrency,
+        "succeeded": summary["succeeded"],
+        "failed": summary["failed"],
+        "throughputPerMinute": summary["throughputPerMinute"],
+        "p50Ms": round(latency["p50"] * 1000, 2) if latency["p50"] is not None else None,
+        "p95Ms": round(latency["p95"] * 1000, 2) if latency["p95"] is not None else None,
+        "stages": summary["stages"],
+        "toolCalls": tool_memo_stats(),
+        "errors": sorted(set(_errors(output_path)))[:5],
+    }
+
+
+def _errors(output_path: str) -> Iterable[str]:
+    """Error messages of the failed records in a results file."""
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("status") != "ok":
+                yield record.get("error", "")
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine the benchmark ran on (results are only comparable on like hardware)."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpuCount": os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Find metrics that got worse than the baseline by more than tolerance.
+
+    Latencies regress when they grow, throughput when it drops. Metrics
+    missing on either side are skipped.
+
+    Args:
+        results: Current benchmark results
+        baseline: Baseline results (same format)
+        tolerance: Allowed relative change (0.2 = 20%)
+
+    Returns:
+        List of regressions with benchmark, metric, baseline, current and change
+    """
+    regressions = []
+
+    def walk(current: Any, base: Any, path: str) -> None:
+        if not isinstance(current, dict) or not isinstance(base, dict):
+            return
+        for key, value in current.items():
+            if key in ("meta", "stages", "toolCalls"):
+                continue
+            base_value = base.get(key)
+            if isinstance(value, dict):
+                walk(value, base_value, f"{path}.{key}" if path else key)
+            elif key in COMPARED_METRICS and isinstance(value, (int, float)) and isinstance(base_value, (int, float)) and base_value > 0:
+                change = (value - base_value) / base_value
+                worse = change > tolerance if COMPARED_METRICS[key] else change < -tolerance
+                if worse:
+                    regressions.append({
+                        "benchmark": path,
+                        "metric": key,
+                        "baseline": base_value,
+                        "current": value,
+                        "change": round(change, 4),
+                    })
+
+    walk(results, baseline, "")
+    return regressions
+
+
+def run_benchmarks(
+    iterations: int = 1000,
+    pipeline_runs: int = 50,
+    concurrency: int = 8,
+    llm_latency_seconds: float = 0.0,
+    llm_jitter_seconds: float = 0.0,
+    rag_latency_seconds: float = 0.0,
+    seed: int = 0,
+    only: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Run the tool and pipeline benchmarks (after configure_environment()).
+
+    Args:
+        iterations: Timed calls per tool
+        pipeline_runs: Work orders through the full pipeline (0 = skip)
+        concurrency: Pipeline work orders in flight at once
+        llm_latency_seconds: Injected latency per stand-in LLM call
+        llm_jitter_seconds: Extra seeded latency per stand-in LLM call
+        rag_latency_seconds: Injected latency per retrieval
+        seed: Random seed
+        only: Subset of "tools", "pipeline"
+
+    Returns:
+        Results with tools and pipeline sections
+    """
+    results: Dict[str, Any] = {}
+    if not only or "tools" in only:
+        results["tools"] = bench_tools(iterations, seed, rag_latency_seconds)
+    if pipeline_runs and (not only or "pipeline" in only):
+        results["pipeline"] = bench_pipeline(pipeline_runs, concurrency, llm_latency_seconds, llm_jitter_seconds, seed)
+    return results
@@ -0,0 +1,325 @@
+"""Deterministic local stand-ins for Gemini, the Google Weather API and Vertex AI RAG latency."""
+
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, get_args, get_origin
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import ast
+import asyncio
+import functools
+import json
+import random
+import re
+import threading
+import time
+import typing
+import zlib
+
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import BaseModel
+
+
+# Description keywords -> permit type (first match wins per type)
+PERMIT_KEYWORDS = (
+    ("Hot Work", re.compile(r"\b(weld|cut|grind|torch|hot work)", re.IGNORECASE)),
+    ("Confined Space Entry", re.compile(r"\bconfined space|vessel entry|tank entry", re.IGNORECASE)),
+    ("Excavation", re.compile(r"\b(excavat|trench|dig)", re.IGNORECASE)),
+    ("Electrical/LOTO", re.compile(r"\b(electrical|loto|lockout|breaker|isolation)", re.IGNORECASE)),
+    ("Working at Height", re.compile(r"\b(scaffold|at height|ladder|roof)", re.IGNORECASE)),
+)
+_WORK_ORDER_ID = re.compile(r"\bWO-[A-Za-z0-9-]+\b")
+# Instruction headers of the prefetched context ({work_order?} etc.) -> the tool the value stands in for
+_PREFETCHED_SECTIONS = (
+    ("Work order:", "get_workorder_by_id"),
+    ("Weather snapshot:", "get_weather_data"),
+    ("RAG evidence (query, namespace, results):", "rag_search"),
+)
+
+
+def permit_types_for(description: str) -> List[str]:
+    """Permit types a work order description calls for (Hot Work when nothing matches)."""
+    return [permit_type for permit_type, pattern in PERMIT_KEYWORDS if pattern.search(description or "")] or ["Hot Work"]
+
+
+def sample_value(annotation: Any, name: str, facts: Dict[str, Any]) -> Any:
+    """
+    Build a valid value for a schema field, preferring facts gathered from tool responses.
+
+    Args:
+        annotation: Field type annotation
+        name: Field name (looked up in facts)
+        facts: Known values by field name
+
+    Returns:
+        A JSON-compatible value of the annotated type
+    """
+    if name in facts:
+        return facts[name]
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is typing.Union:
+        non_null = [a for a in args if a is not type(None)]
+        return sample_value(non_null[0], name, facts) if non_null else None
+    if origin is typing.Literal:
+        return args[0]
+    if origin in (list, List):
+        return [sample_value(args[0] if args else str, name, facts)]
+    if origin in (dict, Dict):
+        return {}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return sample_output(annotation, facts)
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return 8
+    if annotation is float:
+        return 0.8
+    return f"{name} (stand-in)"
+
+
+def sample_output(schema: type, facts: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build an instance of a pydantic output schema as a plain dict."""
+    facts = facts or {}
+    return {
+        name: sample_value(field.annotation, name, facts)
+        for name, field in schema.model_fields.items()
+    }
+
+
+def _output_schema(llm_request: LlmRequest) -> Optional[type]:
+    """Find the agent's output schema (response_schema, or the set_model_response workaround tool)."""
+    schema = llm_request.config.response_schema if llm_request.config else None
+    if schema is None and "set_model_response" in llm_request.tools_dict:
+        schema = getattr(llm_request.tools_dict["set_model_response"], "output_schema", None)
+    return schema if isinstance(schema, type) and issubclass(schema, BaseModel) else None
+
+
+def _conversation(llm_request: LlmRequest) -> Tuple[str, Dict[str, List[Any]]]:
+    """Get the first user message text and the responses of tools already called (by tool name)."""
+    user_text = ""
+    responses: Dict[str, List[Any]] = {}
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            if part.text and content.role == "user" and not user_text:
+                user_text = part.text
+            if part.function_response is not None:
+                response = part.function_response.response or {}
+                # ADK wraps non-dict tool results as {"result": value}
+                value = response.get("result", response) if isinstance(response, dict) else response
+                responses.setdefault(part.function_response.name, []).append(value)
+            if part.function_call is not None:
+                responses.setdefault(part.function_call.name, [])
+    return user_text, responses
+
+
+def _prefetched(llm_request: LlmRequest) -> Dict[str, List[Any]]:
+    """Read the context injected into the instruction by the prefetch stage, as tool responses."""
+    instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+    lines = instruction.splitlines()
+    responses: Dict[str, List[Any]] = {}
+    for header, tool in _PREFETCHED_SECTIONS:
+        if header not in lines:
+            continue
+        position = lines.index(header) + 1
+        try:
+            value = ast.literal_eval(lines[position]) if position < len(lines) else None
+        except (ValueError, SyntaxError):
+            continue
+        if tool == "rag_search" and isinstance(value, list):
+            value = {"results": [r for search in value for r in search.get("results", [])]}
+        if value:
+            responses[tool] = [value]
+    return responses
+
+
+class StandInLlm(BaseLlm):
+    """
+    Offline, deterministic replacement for Gemini in benchmarks.
+
+    It plays the tool protocol like the real agents do:
+    1. Fetch the work order (get_workorder_by_id) named in the user message.
+    2. Call the agent's other tools once: RAG search on the description,
+       weather at the work order's coordinates, policy.load and
+       new_permit_id per permit type implied by the description.
+       Context the prefetch stage injected into the instruction (work
+       order, weather, RAG evidence) counts as already fetched.
+    3. Answer with JSON built from the agent's output schema, filled from
+       the tool results. Permits carry the policy's required controls, PPE
+       and sign-offs, so they pass the deterministic rules check.
+    A fixed latency (plus seeded jitter) is injected per call, and token
+    usage is estimated at 4 characters per token.
+    """
+
+    latency_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        return [r"stand-in.*"]
+
+    def _delay(self, llm_request: LlmRequest) -> float:
+        if not self.jitter_seconds:
+            return self.latency_seconds
+        # Seeded by the request content, so a given call always gets the same jitter
+        digest = zlib.crc32(repr([c.model_dump(exclude_none=True) for c in llm_request.contents]).encode())
+        return self.latency_seconds + random.Random(self.seed ^ digest).uniform(0, self.jitter_seconds)
+
+    def _tool_calls(self, llm_request: LlmRequest, user_text: str, responses: Dict[str, List[Any]]) -> List[types.FunctionCall]:
+        """Decide the next tool calls; empty once the agent is ready to answer."""
+        tools = llm_request.tools_dict
+        if "get_workorder_by_id" in tools and "get_workorder_by_id" not in responses:
+            match = _WORK_ORDER_ID.search(user_text)
+            if match:
+                return [types.FunctionCall(name="get_workorder_by_id", args={"id": match.group(0)})]
+
+        wo = (responses.get("get_workorder_by_id") or [{}])[0] or {}
+        description = wo.get("description", user_text)
+        calls = []
+        if "rag_search" in tools and "rag_search" not in responses:
+            calls.append(types.FunctionCall(name="rag_search", args={"query": " ".join(description.split()[:12]), "top_k": 5}))
+        if "get_weather_data" in tools and "get_weather_data" not in responses and wo.get("latitude") is not None:
+            calls.append(types.FunctionCall(name="get_weather_data", args={"lat": wo["latitude"], "lon": wo["longitude"]}))
+        for permit_type in permit_types_for(description):
+            if "load" in tools and "load" not in responses:
+                calls.append(types.FunctionCall(name="load", args={"permitType": permit_type}))
+            if "new_permit_id" in tools and "new_permit_id" not in responses:
+                calls.append(types.FunctionCall(name="new_permit_id", args={"permit_type": permit_type}))
+        if "exit_loop" in tools and "exit_loop" not in responses:
+            calls.append(types.FunctionCall(name="exit_loop", args={}))
+        return calls
+
+    def _facts(self, description: str, responses: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """Output values derived from the tool results."""
+        facts: Dict[str, Any] = {}
+        hazards = [
+            {
+                "name": f"{permit_type} hazard",
+                "confidence": 0.8,
+                "rationale": f"Work scope calls for {permit_type.lower()} controls",
+                "suggestedControls": ["Toolbox talk", "Area barricaded"],
+            }
+            for permit_type in permit_types_for(description)
+        ]
+        facts["hazards"] = hazards
+        facts["evidence"] = [
+            {"sourceId": str(item.get("id")), "snippet": str(item.get("snippet", ""))[:200]}
+            for result in responses.get("rag_search", []) if isinstance(result, dict)
+            for item in result.get("results", [])[:3]
+        ]
+        permit_ids = [pid for pid in responses.get("new_permit_id", []) if isinstance(pid, str)]
+        permits = []
+        for i, policy in enumerate(p for p in responses.get("load", []) if isinstance(p, dict)):
+            rules = policy.get("rules", {})
+            permits.append({
+                "permitId": permit_ids[i] if i < len(permit_ids) else f"PERM-STANDIN-{i + 1:04d}",
+                "type": policy.get("permitType", "Hot Work"),
+                "hazardsLinked": [hazards[0]["name"]] if hazards else [],
+                "controls": list(rules.get("required_controls", [])),
+                "ppe": list(rules.get("required_ppe", [])),
+                "signOffRoles": list(rules.get("required_signoffs", [])),
+                "validityHours": min(8, rules.get("validity_hours_max", 8)),
+                "attachmentsRequired": [],
+            })
+        if permits:
+            facts["permits"] = permits
+        return facts
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self._delay(llm_request))
+        user_text, responses = _conversation(llm_request)
+        responses = {**_prefetched(llm_request), **responses}
+        calls = self._tool_calls(llm_request, user_text, responses)
+        if calls:
+            parts = [types.Part(function_call=call) for call in calls]
+            output_chars = sum(len(json.dumps(call.args)) for call in calls)
+        else:
+            wo = (responses.get("get_workorder_by_id") or [{}])[0] or {}
+            schema = _output_schema(llm_request)
+            facts = self._facts(wo.get("description", user_text), responses)
+            text = json.dumps(sample_output(schema, facts) if schema else {"status": "done"})
+            parts = [types.Part(text=text)]
+            output_chars = len(text)
+        prompt_chars = len(str(llm_request.config.system_instruction or "")) + sum(
+            len(json.dumps(c.model_dump(exclude_none=True), default=str)) for c in llm_request.contents
+        )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_chars // 4,
+                candidates_token_count=max(1, output_chars // 4),
+                total_token_count=prompt_chars // 4 + max(1, output_chars // 4),
+            ),
+        )
+
+
+class _WeatherHandler(BaseHTTPRequestHandler):
+    latency_seconds = 0.0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        lat = float(query.get("location.latitude", ["0"])[0])
+        lon = float(query.get("location.longitude", ["0"])[0])
+        time.sleep(self.latency_seconds)
+        # Deterministic conditions per location
+        rng = random.Random(f"{round(lat, 2)}:{round(lon, 2)}")
+        body = json.dumps({
+            "currentConditions": {
+                "temperature": {"value": round(rng.uniform(5, 40), 1), "unit": "CELSIUS"},
+                "windSpeed": {"value": round(rng.uniform(0, 50), 1), "unit": "KILOMETERS_PER_HOUR"},
+                "precipitation": {"probability": {"value": rng.randint(0, 100)}},
+                "condition": {"text": rng.choice(("Clear", "Partly cloudy", "Rain", "Thunderstorm"))},
+                "humidity": {"value": rng.randint(20, 95)},
+                "pressure": {"value": round(rng.uniform(995, 1030), 1)},
+                "visibility": {"value": rng.randint(2, 16), "unit": "KILOMETERS"},
+            }
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WeatherStandIn:
+    """Local HTTP server answering currentConditions:lookup with deterministic weather."""
+
+    def __init__(self, latency_seconds: float = 0.0):
+        handler = type("WeatherHandler", (_WeatherHandler,), {"latency_seconds": latency_seconds})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="weather-stand-in", daemon=True)
+
+    @property
+    def url(self) -> str:
+        """Endpoint to use as WEATHER_API_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/currentConditions:lookup"
+
+    def start(self) -> "WeatherStandIn":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def with_latency(func, seconds: float):
+    """Wrap a function so every call first sleeps for the given time (a remote round trip)."""
+    if not seconds:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        time.sleep(seconds)
+        return func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,212 @@
+"""Deterministic synthetic work orders and RAG corpus that scale to 100k+ records.
+
+Standard library only: records are generated lazily and written streaming, so
+memory stays flat regardless of the requested size.
+"""
+
+from typing import Any, Dict, Iterator, Optional
+from pathlib import Path
+import json
+import random
+import shutil
+
+
+SITES = (
+    ("Plant-A", 28.61, 77.21),
+    ("Plant-B", 29.76, -95.37),
+    ("Terminal-C", 51.95, 4.14),
+    ("Refinery-D", 1.26, 103.82),
+)
+AREAS = ("Tank Farm", "Process Unit", "Compressor House", "Pipe Rack", "Substation", "Jetty", "Utilities")
+EQUIPMENT = (
+    "Crude Transfer Pump P-{n}", "Storage Tank T-{n}", "Heat Exchanger E-{n}", "Pipeline Section {n}A",
+    "Control Valve V-{n}", "Motor Control Center MCC-{n}", "Pressure Vessel V-{n}", "Cooling Tower CT-{n}",
+)
+# (task phrase, hazard keywords) - phrases carry the words the permit/hazard logic keys on
+TASKS = (
+    ("Weld repair of a cracked nozzle and grind the weld cap flush", ("hot work", "fire", "sparks")),
+    ("Cut and replace a corroded flange section with a gas cutting torch", ("hot work", "fire", "hydrocarbon vapors")),
+    ("Confined space entry to inspect internal coating and remove sludge", ("confined space", "toxic atmosphere", "oxygen deficiency")),
+    ("Excavate a 2 m trench to expose a buried line for inspection", ("excavation", "cave-in", "buried services")),
+    ("Electrical isolation (LOTO) of the motor feeder and replace the breaker", ("electrical", "arc flash", "stored energy")),
+    ("Erect scaffolding and replace insulation at height on the pipe rack", ("working at height", "falls", "dropped objects")),
+    ("Replace a leaking gasket after draining and purging the line", ("hydrocarbon release", "pressure", "spill")),
+)
+CONDITIONS = (
+    "Adjacent operations ongoing within 50 m.", "Hydrocarbon vapors possible, continuous gas monitoring required.",
+    "Ambient temperature expected 35-40°C.", "Wind conditions must be monitored.", "Work during daylight hours only.",
+    "Ground water table at 2.5 m depth.", "Area classified Class I Division 2.",
+)
+STATUSES = ("New", "New", "New", "Scheduled", "In Progress")
+PRIORITIES = (None, None, None, None, "Low", "Medium", "High", "Emergency")
+PERMIT_TYPES = ("Hot Work", "Confined Space Entry", "Excavation", "Electrical/LOTO", "Working at Height")
+SEVERITIES = ("Low", "Medium", "High", "Critical")
+
+
+def _rng(seed: int, stream: str) -> random.Random:
+    """Independent reproducible random stream per record type."""
+    return random.Random(f"{seed}:{stream}")
+
+
+def generate_work_orders(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic work orders in the workOrders.json record format.
+
+    Args:
+        count: Number of work orders
+        seed: Random seed (same seed -> same records)
+
+    Yields:
+        Work order dictionaries (IDs WO-S000001, WO-S000002, ...)
+    """
+    rng = _rng(seed, "work_orders")
+    for n in range(1, count + 1):
+        site, lat, lon = rng.choice(SITES)
+        area = rng.choice(AREAS)
+        task, _ = rng.choice(TASKS)
+        equipment = rng.choice(EQUIPMENT).format(n=rng.randint(100, 999))
+        priority = rng.choice(PRIORITIES)
+        description = f"{task} on {equipment} in {area}. " + " ".join(rng.sample(CONDITIONS, 3))
+        if priority == "Emergency":
+            description = "Emergency: active leak reported. " + description
+        wo = {
+            "workOrderId": f"WO-S{n:06d}",
+            "description": description,
+            "equipment": equipment,
+            "location": f"{area} - Zone {rng.randint(1, 9)}",
+            "site": site,
+            # Spread over ~20 km around the site so weather tiles vary
+            "latitude": round(lat + rng.uniform(-0.1, 0.1), 4),
+            "longitude": round(lon + rng.uniform(-0.1, 0.1), 4),
+            "status": rng.choice(STATUSES),
+            "assignedTo": f"Technician {rng.randint(1, 200)}",
+            "crew": [f"Crew {rng.randint(1, 500)}" for _ in range(rng.randint(1, 4))],
+            "environmentType": "offshore" if area == "Jetty" else "onshore",
+            "createdAt": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T08:00:00Z",
+        }
+        if priority:
+            wo["priority"] = priority
+        yield wo
+
+
+def generate_incidents(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic incidents in the rag_data/incidents.json record format.
+
+    Args:
+        count: Number of incidents
+        seed: Random seed
+
+    Yields:
+        Incident dictionaries
+    """
+    rng = _rng(seed, "incidents")
+    for n in range(1, count + 1):
+        site, _, _ = rng.choice(SITES)
+        area = rng.choice(AREAS)
+        task, hazards = rng.choice(TASKS)
+        equipment = rng.choice(EQUIPMENT).format(n=rng.randint(100, 999))
+        yield {
+            "id": f"INC-S{n:06d}",
+            "site": site,
+            "area": area,
+            "title": f"{hazards[0].title()} incident at {area} ({equipment})",
+            "date": f"{rng.randint(2015, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "severity": rng.choice(SEVERITIES),
+            "summary": f"Incident during: {task.lower()}. Hazards realised: {', '.join(hazards)}.",
+            "description": f"{task} on {equipment}. " + " ".join(rng.sample(CONDITIONS, 2)),
+            "hazards": list(hazards),
+            "rootCause": rng.choice(("Missing gas test", "Inadequate isolation", "No fire watch", "Poor supervision")),
+            "lessonsLearned": "Verify controls before work starts and keep the permit at the worksite.",
+            "tags": sorted({hazards[0], area.lower(), site.lower()}),
+        }
+
+
+def generate_historical_permits(count: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Generate synthetic historical permits in the rag_data/historical_permits.json record format.
+
+    Args:
+        count: Number of permits
+        seed: Random seed
+
+    Yields:
+        Historical permit dictionaries
+    """
+    rng = _rng(seed, "permits")
+    for n in range(1, count + 1):
+        site, _, _ = rng.choice(SITES)
+        area = rng.choice(AREAS)
+        permit_type = rng.choice(PERMIT_TYPES)
+        task, hazards = rng.choice(TASKS)
+        yield {
+            "id": f"PERM-S{n:06d}",
+            "site": site,
+            "area": area,
+            "permitType": permit_type,
+            "date": f"{rng.randint(2018, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "status": rng.choice(("Approved", "Approved", "Closed", "Rejected")),
+            "workOrderId": f"WO-H{n:06d}",
+            "title": f"{permit_type} Permit - {area}",
+            "summary": f"{permit_type} permit for: {task.lower()}.",
+            "description": f"{task}. " + " ".join(rng.sample(CONDITIONS, 2)),
+            "hazards": list(hazards),
+            "controls": ["Gas test performed", "Area barricaded", "Isolation verified"][: rng.randint(1, 3)],
+            "ppe": ["Hard hat", "Safety glasses", "FR clothing"][: rng.randint(1, 3)],
+            "signOffRoles": ["Supervisor", "HSE"],
+            "validityHours": rng.choice((4, 8, 12)),
+            "outcome": "Completed without incident",
+        }
+
+
+def _write_array(path: Path, key: str, records: Iterator[Dict[str, Any]]) -> int:
+    """Stream records into a {"<key>": [...]} JSON file."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{"{key}": [\n')
+        for record in records:
+            if count:
+                f.write(",\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]}\n")
+    return count
+
+
+def write_assets(
+    directory: str,
+    work_orders: int,
+    incidents: int,
+    permits: int,
+    seed: int = 0,
+    source_assets: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Write a complete assets directory with synthetic work orders and RAG corpus.
+
+    Compliance rules and permit templates are copied from the packaged assets,
+    so policy.load and rules.evaluate behave exactly as in production.
+
+    Args:
+        directory: Target directory (used as ASSETS_PATH)
+        work_orders: Number of work orders
+        incidents: Number of incidents
+        permits: Number of historical permits
+        seed: Random seed
+        source_assets: Assets to copy rules/templates from (default: the packaged assets/)
+
+    Returns:
+        Record counts written
+    """
+    target = Path(directory)
+    source = Path(source_assets) if source_assets else Path(__file__).parent.parent / "assets"
+    (target / "rag_data").mkdir(parents=True, exist_ok=True)
+    shutil.copy(source / "compliance_rules.json", target / "compliance_rules.json")
+    shutil.copytree(source / "permit_templates", target / "permit_templates", dirs_exist_ok=True)
+    return {
+        "workOrders": _write_array(target / "workOrders.json", "workOrders", generate_work_orders(work_orders, seed)),
+        "incidents": _write_array(target / "rag_data" / "incidents.json", "incidents", generate_incidents(incidents, seed)),
+        "historicalPermits": _write_array(
+            target / "rag_data" / "historical_permits.json", "historicalPermits", generate_historical_permits(permits, seed)
+        ),
+    }
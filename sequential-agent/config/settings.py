@@ -2,9 +2,13 @@
 
 import os
 from typing import Optional
-from dotenv import load_dotenv
 
-load_dotenv()
+# .env files are for local development; on Cloud Run (K_SERVICE is set) configuration comes from the service
+LOAD_DOTENV: bool = os.getenv("LOAD_DOTENV", "false" if os.getenv("K_SERVICE") else "true").lower() in ("1", "true", "yes")
+if LOAD_DOTENV:
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 # GCP Configuration
 GCP_PROJECT_ID: Optional[str] = os.getenv("GCP_PROJECT_ID")
@@ -12,27 +16,106 @@ GCP_REGION: str = os.getenv("GCP_REGION", "us-central1")
 
 # Vector Store Configuration
 VECTOR_STORE_DSN: Optional[str] = os.getenv("VECTOR_STORE_DSN")
-VECTOR_STORE_TYPE: str = os.getenv("VECTOR_STORE_TYPE", "chroma")  # chroma, pgvector, vertex
+VECTOR_STORE_TYPE: str = os.getenv("VECTOR_STORE_TYPE", "chroma")  # chroma, pgvector, vertex, local
+
+# Local RAG index (VECTOR_STORE_TYPE=local, and fallback when Vertex AI RAG is unavailable)
+RAG_INDEX_PATH: Optional[str] = os.getenv("RAG_INDEX_PATH")  # Prefix of <path>.vectors/<path>.json; unset = build in memory
+RAG_INDEX_TYPE: str = os.getenv("RAG_INDEX_TYPE", "auto")  # flat, hnsw, auto
+RAG_EMBEDDING_DIM: int = int(os.getenv("RAG_EMBEDDING_DIM", "256"))
+RAG_RETRIEVAL_MODE: str = os.getenv("RAG_RETRIEVAL_MODE", "hybrid")  # vector, lexical, hybrid (BM25 + vector, rank-fused)
+RAG_LOCAL_FALLBACK: bool = os.getenv("RAG_LOCAL_FALLBACK", "true").lower() in ("1", "true", "yes")
+
+# RAG result cache (keyed by query, namespace, top_k, filters; cleared when RAG_SNAPSHOT changes)
+RAG_CACHE_ENABLED: bool = os.getenv("RAG_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RAG_CACHE_MAX_ENTRIES: int = int(os.getenv("RAG_CACHE_MAX_ENTRIES", "1024"))
+RAG_CACHE_MAX_BYTES: int = int(os.getenv("RAG_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+RAG_CACHE_TTL_SECONDS: float = float(os.getenv("RAG_CACHE_TTL_SECONDS", "3600"))
+RAG_CACHE_NORMALIZE: bool = os.getenv("RAG_CACHE_NORMALIZE", "true").lower() in ("1", "true", "yes")
 
 # GCS Configuration
 GCS_BUCKET: Optional[str] = os.getenv("GCS_BUCKET", "permitflowai")
 GCS_PDF_PREFIX: str = os.getenv("GCS_PDF_PREFIX", "permits")
+# Rendered permit PDFs: "local" (PDF_OUTPUT_DIR, default under the temp dir) or "gcs" (GCS_BUCKET/GCS_PDF_PREFIX)
+PDF_STORAGE: str = os.getenv("PDF_STORAGE", "local").lower()
+PDF_OUTPUT_DIR: Optional[str] = os.getenv("PDF_OUTPUT_DIR")
+# Worker processes for batch rendering (0 renders in this process)
+PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", "0"))
 
 # Policy Configuration
 POLICY_VERSION: str = os.getenv("POLICY_VERSION", "v1.0")
 ASSETS_PATH: str = os.getenv("ASSETS_PATH", "/app/assets")
+# Minimum seconds between mtime checks of an asset file (0 = check on every lookup)
+ASSET_RELOAD_INTERVAL: float = float(os.getenv("ASSET_RELOAD_INTERVAL", "1.0"))
+
+# Load the work order, weather and templated RAG evidence into state before A1 (no LLM tool-call turns)
+CONTEXT_PREFETCH: bool = os.getenv("CONTEXT_PREFETCH", "true").lower() in ("1", "true", "yes")
+CONTEXT_PREFETCH_TOP_K: int = int(os.getenv("CONTEXT_PREFETCH_TOP_K", "5"))
+# Answer repeated calls to pure tools (same arguments, same pipeline run) from per-run temp: state
+TOOL_MEMO: bool = os.getenv("TOOL_MEMO", "true").lower() in ("1", "true", "yes")
+TOOL_MEMO_TOOLS: tuple = tuple(
+    name.strip() for name in os.getenv("TOOL_MEMO_TOOLS", "get_workorder_by_id,load,evaluate,rag_search").split(",") if name.strip()
+)
+
+# Startup: "eager" builds root_agent at import; "lazy" builds it on first access and keeps the import cheap
+STARTUP_MODE: str = os.getenv("STARTUP_MODE", "eager").lower()
+# In lazy mode, import deferred SDKs and build root_agent in a background thread once the server is up
+STARTUP_WARMUP: bool = os.getenv("STARTUP_WARMUP", "true").lower() in ("1", "true", "yes")
+STARTUP_WARMUP_DELAY_SECONDS: float = float(os.getenv("STARTUP_WARMUP_DELAY_SECONDS", "1.0"))
+
+# Skip the A3/A4 LLM refinement loop when every permit passes rules.evaluate cleanly
+RULES_FAST_PATH: bool = os.getenv("RULES_FAST_PATH", "true").lower() in ("1", "true", "yes")
+# Apply deterministic fixes (validity clamp) before the LLM refiner; fixed permits always go through A3
+AUTO_REMEDIATION: bool = os.getenv("AUTO_REMEDIATION", "true").lower() in ("1", "true", "yes")
+# Permits validated concurrently by the A3 fan-out (one validator per permit; more permits run in waves)
+VALIDATION_MAX_PARALLEL: int = int(os.getenv("VALIDATION_MAX_PARALLEL", "8"))
+
+# Pipeline result cache: replays stored hazards/permits/validation for unchanged work orders.
+# Keyed by work-order content, POLICY_VERSION, compliance rules/templates hashes, RAG_SNAPSHOT
+# and the work order's weather tile and time bucket. Runs that used fallback data are never stored.
+PIPELINE_CACHE: str = os.getenv("PIPELINE_CACHE", "none").lower()  # sqlite, disk, none
+PIPELINE_CACHE_PATH: Optional[str] = os.getenv("PIPELINE_CACHE_PATH")  # DB file (sqlite) or directory (disk); defaults under the temp dir
+PIPELINE_CACHE_MAX_BYTES: int = int(os.getenv("PIPELINE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))  # LRU eviction bound; 0 = unbounded
+PIPELINE_CACHE_TTL_SECONDS: float = float(os.getenv("PIPELINE_CACHE_TTL_SECONDS", "43200"))  # 0 = never expire
+# Width of the weather time bucket in the key: a stored result is reused for at most this long
+PIPELINE_CACHE_WEATHER_BUCKET_SECONDS: float = float(os.getenv("PIPELINE_CACHE_WEATHER_BUCKET_SECONDS", "600"))
+
+# Observability: wall time, LLM tokens, loop iterations and fallback usage per agent/tool
+OBSERVABILITY_ENABLED: bool = os.getenv("OBSERVABILITY_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "none").lower()  # none, console, file (OpenTelemetry; plain JSON Lines without the SDK)
+TRACE_FILE: str = os.getenv("TRACE_FILE", "permitflow_spans.jsonl")
+METRICS_PORT: int = int(os.getenv("METRICS_PORT", "0"))  # Serve Prometheus text at :<port>/metrics; 0 = off
+METRICS_FILE: Optional[str] = os.getenv("METRICS_FILE")  # Periodically rewritten Prometheus text file
+METRICS_FILE_INTERVAL_SECONDS: float = float(os.getenv("METRICS_FILE_INTERVAL_SECONDS", "15"))
+
+# Work Order Store Configuration
+WORKORDER_STORE: str = os.getenv("WORKORDER_STORE", "json")  # json, sqlite
+WORKORDER_DB_PATH: Optional[str] = os.getenv("WORKORDER_DB_PATH")  # Defaults to <ASSETS_PATH>/workOrders.db
 
 # RAG Configuration
 RAG_SNAPSHOT: Optional[str] = os.getenv("RAG_SNAPSHOT")  # Set by RAG job
 RAG_CORPUS: Optional[str] = os.getenv("RAG_CORPUS")  # Vertex AI RAG Corpus resource name (projects/{project}/locations/{location}/ragCorpora/{corpus})
+RAG_MANIFEST_PATH: Optional[str] = os.getenv("RAG_MANIFEST_PATH")  # Ingestion manifest; defaults to <RAG_INDEX_PATH>.manifest.json (local) or rag_manifest.json (Vertex)
 
 # Gemini API
 GEMINI_API_KEY: Optional[str] = os.getenv("GEMINI_API_KEY")
 GOOGLE_APPLICATION_CREDENTIALS: Optional[str] = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
 # Database Configuration (optional for now)
-DB_URL: Optional[str] = os.getenv("DB_URL")
+DB_URL: Optional[str] = os.getenv("DB_URL")  # sqlite:///path/to.db or postgresql://...; unset = in-memory permit IDs
+# Permit IDs leased from the DB_URL sequence per process and type at a time
+PERMIT_ID_BLOCK_SIZE: int = int(os.getenv("PERMIT_ID_BLOCK_SIZE", "50"))
 
 # Weather API Configuration (Google Maps Platform Weather API)
 WEATHER_API_KEY: Optional[str] = os.getenv("WEATHER_API_KEY") or os.getenv("GOOGLE_MAPS_API_KEY")
+# Current-conditions endpoint; overridden to point at a local stand-in for offline benchmarks
+WEATHER_API_URL: str = os.getenv("WEATHER_API_URL", "https://weather.googleapis.com/v1/currentConditions:lookup")
+# Weather cache: snapshots are shared per lat/lon tile (0.01 deg ~ 1 km); 0 TTL disables caching
+WEATHER_TILE_DEGREES: float = float(os.getenv("WEATHER_TILE_DEGREES", "0.01"))
+WEATHER_CACHE_TTL_SECONDS: float = float(os.getenv("WEATHER_CACHE_TTL_SECONDS", "600"))
+# Past the TTL, stale snapshots are still served for this long while a background refresh runs
+WEATHER_STALE_SECONDS: float = float(os.getenv("WEATHER_STALE_SECONDS", "1800"))
+WEATHER_POOL_SIZE: int = int(os.getenv("WEATHER_POOL_SIZE", "10"))
+# Shift work orders whose weather the server (main.py) keeps warm: comma-separated IDs, @file (one ID
+# per line, re-read every prefetch), or "all"; unset = no prefetch
+WEATHER_PREFETCH_WORK_ORDERS: Optional[str] = os.getenv("WEATHER_PREFETCH_WORK_ORDERS")
 
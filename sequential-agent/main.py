@@ -0,0 +1,81 @@
+"""Serving entrypoint: ADK's FastAPI app for this agent, warmed up once the server is up.
+
+ADK's own servers (adk api_server, adk deploy cloud_run) import the agent
+module on the first request, so that request pays for ADK, the tools and
+building root_agent. Here root_agent is built in a background thread once the
+app has started (STARTUP_WARMUP, after STARTUP_WARMUP_DELAY_SECONDS), and
+requests are served the same, already built, agent.
+
+With WEATHER_PREFETCH_WORK_ORDERS set, the shift's weather is also kept
+warm in this process (weather.start_weather_prefetch).
+
+    python main.py    # PORT (default 8080), ALLOW_ORIGINS, SESSION_SERVICE_URI, SERVE_WEB_INTERFACE
+"""
+
+import contextlib
+import importlib
+import os
+import sys
+from pathlib import Path
+from typing import List
+
+import uvicorn
+from google.adk.cli.fast_api import get_fast_api_app
+from google.adk.cli.utils.base_agent_loader import BaseAgentLoader
+
+
+AGENT_DIR = Path(__file__).resolve().parent
+AGENTS_DIR = AGENT_DIR.parent
+# The directory name is the ADK app name the frontend calls (VITE_APP_NAME, default "sequential-agent")
+APP_NAME = AGENT_DIR.name
+
+if str(AGENTS_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENTS_DIR))
+settings = importlib.import_module(f"{APP_NAME}.config.settings")
+startup = importlib.import_module(f"{APP_NAME}.startup")
+
+
+class PackageAgentLoader(BaseAgentLoader):
+    """
+    Serves this package's root agent under APP_NAME.
+
+    ADK's directory loader rejects app names that are not Python identifiers,
+    such as "sequential-agent".
+    """
+
+    def load_agent(self, agent_name: str):
+        if agent_name != APP_NAME:
+            raise ValueError(f"Unknown app: {agent_name}")
+        return importlib.import_module(f"{APP_NAME}.agent").get_root_agent()
+
+    def list_agents(self) -> List[str]:
+        return [APP_NAME]
+
+
+agent_loader = PackageAgentLoader()
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Requests arriving during the warm-up wait for the same build (agent.get_root_agent)
+    if settings.STARTUP_WARMUP:
+        startup.start_warmup(lambda: agent_loader.load_agent(APP_NAME))
+    # The weather cache is per process: keep the shift's tiles warm here, where the agents run
+    if settings.WEATHER_PREFETCH_WORK_ORDERS:
+        weather = importlib.import_module(f"{APP_NAME}.tools.weather")
+        weather.start_weather_prefetch(shift=settings.WEATHER_PREFETCH_WORK_ORDERS)
+    yield
+
+
+app = get_fast_api_app(
+    agents_dir=str(AGENTS_DIR),
+    agent_loader=agent_loader,
+    session_service_uri=os.getenv("SESSION_SERVICE_URI"),
+    allow_origins=[origin.strip() for origin in os.getenv("ALLOW_ORIGINS", "").split(",") if origin.strip()] or None,
+    web=os.getenv("SERVE_WEB_INTERFACE", "false").lower() in ("1", "true", "yes"),
+    lifespan=lifespan,
+)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8080")))
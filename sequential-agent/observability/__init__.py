@@ -0,0 +1 @@
+"""Observability module: spans and Prometheus metrics for agents, LLM calls and tools."""
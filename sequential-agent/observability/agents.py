@@ -0,0 +1,191 @@
+"""ADK callbacks recording agent wall time, LLM latency/tokens and loop iterations."""
+
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+from google.adk.agents import BaseAgent, LlmAgent, LoopAgent
+
+from .metrics import AGENT_DURATION, LLM_DURATION, LLM_TOKENS, LOOP_ITERATIONS
+from .tracing import OpenSpan, end_span, start_span
+
+
+# Runs that raise or are cancelled never reach their after-callback; their entries are
+# dropped once this many are tracked or once they are this old
+MAX_TRACKED = 10000
+MAX_AGE_SECONDS = 6 * 3600
+
+# (kind, invocation_id, branch, agent) -> (open span, model); oldest first
+_open: "OrderedDict[Tuple[str, str, Optional[str], str], Tuple[OpenSpan, str]]" = OrderedDict()
+# (invocation_id, loop agent name) -> iterations so far; oldest first
+_loop_iterations: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+_lock = threading.Lock()
+
+_TOKEN_FIELDS = (
+    ("prompt", "prompt_token_count"),
+    ("completion", "candidates_token_count"),
+    ("thoughts", "thoughts_token_count"),
+    ("cached", "cached_content_token_count"),
+)
+
+
+def _key(kind: str, callback_context) -> Tuple[str, str, Optional[str], str]:
+    return (kind, callback_context.invocation_id, getattr(callback_context, "branch", None), callback_context.agent_name)
+
+
+def _expire() -> None:
+    """Drop (and end, as errors) entries of runs that never finished. Caller holds _lock."""
+    cutoff_ns = time.time_ns() - int(MAX_AGE_SECONDS * 1e9)
+    while _open:
+        key, (opened, _) = next(iter(_open.items()))
+        if len(_open) <= MAX_TRACKED and opened.start_ns >= cutoff_ns:
+            break
+        del _open[key]
+        end_span(opened, error="abandoned: the run ended without its after-callback", restore_current=False)
+    while len(_loop_iterations) > MAX_TRACKED:
+        _loop_iterations.popitem(last=False)
+
+
+def tracked_runs() -> Dict[str, int]:
+    """
+    Get the number of agent/LLM runs and loops currently tracked (bounded by MAX_TRACKED).
+
+    Returns:
+        Dictionary with openSpans and loops
+    """
+    with _lock:
+        return {"openSpans": len(_open), "loops": len(_loop_iterations)}
+
+
+def before_agent(callback_context) -> None:
+    """Start an agent span; it is the current span (tools nest under it) until after_agent."""
+    opened = start_span(
+        f"agent {callback_context.agent_name}",
+        {"agent": callback_context.agent_name, "invocation_id": callback_context.invocation_id},
+        current=True,
+    )
+    with _lock:
+        _open[_key("agent", callback_context)] = (opened, "")
+        _expire()
+    return None
+
+
+def after_agent(callback_context) -> None:
+    """Record an agent run's wall time (and iterations, for a loop agent)."""
+    agent_name = callback_context.agent_name
+    with _lock:
+        started = _open.pop(_key("agent", callback_context), None)
+        failed_model = _open.pop(_key("model", callback_context), None)  # A failed LLM call never reached after_model
+        iterations = _loop_iterations.pop((callback_context.invocation_id, agent_name), None)
+    if failed_model is not None:
+        end_span(failed_model[0], error="no response")
+    if started is None:
+        return None
+    opened = started[0]
+    attributes: Dict[str, Any] = {}
+    if iterations is not None:
+        attributes["loop_iterations"] = iterations
+        LOOP_ITERATIONS.observe(iterations, loop=agent_name)
+    AGENT_DURATION.observe((time.time_ns() - opened.start_ns) / 1e9, agent=agent_name)
+    end_span(opened, attributes)
+    return None
+
+
+def before_model(callback_context, llm_request) -> None:
+    """Start an LLM call span under the agent's span."""
+    model = getattr(llm_request, "model", None) or ""
+    opened = start_span(
+        f"llm {model}",
+        {"agent": callback_context.agent_name, "model": model, "invocation_id": callback_context.invocation_id},
+    )
+    with _lock:
+        previous = _open.pop(_key("model", callback_context), None)
+        _open[_key("model", callback_context)] = (opened, model)
+        _expire()
+    if previous is not None:
+        end_span(previous[0], error="no response")
+    return None
+
+
+def after_model(callback_context, llm_response) -> None:
+    """Record an LLM call's wall time and token usage."""
+    if getattr(llm_response, "partial", False):
+        return None  # Streaming chunk; usage arrives with the final response
+    with _lock:
+        started = _open.pop(_key("model", callback_context), None)
+    if started is None:
+        return None
+    opened, model = started
+    agent_name = callback_context.agent_name
+    attributes: Dict[str, Any] = {}
+    usage = getattr(llm_response, "usage_metadata", None)
+    for kind, field in _TOKEN_FIELDS:
+        count = getattr(usage, field, None) if usage is not None else None
+        if count:
+            LLM_TOKENS.inc(count, agent=agent_name, model=model, kind=kind)
+            attributes[f"tokens.{kind}"] = count
+    error = getattr(llm_response, "error_message", None)
+    LLM_DURATION.observe((time.time_ns() - opened.start_ns) / 1e9, agent=agent_name, model=model)
+    end_span(opened, attributes, error)
+    return None
+
+
+def _iteration_counter(loop_name: str):
+    """Build a before_agent callback counting runs of a loop's first sub-agent."""
+    def count_iteration(callback_context) -> None:
+        key = (callback_context.invocation_id, loop_name)
+        with _lock:
+            _loop_iterations[key] = _loop_iterations.pop(key, 0) + 1
+            _expire()
+        return None
+    return count_iteration
+
+
+def add_callback(agent: BaseAgent, field: str, callback, first: bool = False) -> None:
+    """
+    Add a callback to an agent, keeping any callbacks it already has.
+
+    Args:
+        agent: Agent to add the callback to
+        field: Callback field (e.g., "before_tool_callback")
+        callback: Callback function
+        first: Run before the existing callbacks instead of after them
+    """
+    existing = getattr(agent, field)
+    if existing is None:
+        callbacks = [callback]
+    elif isinstance(existing, list):
+        callbacks = [callback, *existing] if first else [*existing, callback]
+    else:
+        callbacks = [callback, existing] if first else [existing, callback]
+    setattr(agent, field, callbacks)
+
+
+def instrument_agent(agent: BaseAgent) -> BaseAgent:
+    """
+    Attach the tracing callbacks to an agent and all of its sub-agents.
+
+    Timing callbacks run first on the way in and last on the way out, so time
+    spent in other callbacks is included. Safe to call more than once.
+
+    Args:
+        agent: Root of the agent tree
+
+    Returns:
+        The same agent
+    """
+    def already(callbacks) -> bool:
+        return callbacks is before_agent or (isinstance(callbacks, list) and before_agent in callbacks)
+
+    if not already(agent.before_agent_callback):
+        add_callback(agent, "before_agent_callback", before_agent, first=True)
+        add_callback(agent, "after_agent_callback", after_agent)
+        if isinstance(agent, LlmAgent):
+            add_callback(agent, "before_model_callback", before_model, first=True)
+            add_callback(agent, "after_model_callback", after_model)
+        if isinstance(agent, LoopAgent) and agent.sub_agents:
+            add_callback(agent.sub_agents[0], "before_agent_callback", _iteration_counter(agent.name), first=True)
+    for sub_agent in agent.sub_agents:
+        instrument_agent(sub_agent)
+    return agent
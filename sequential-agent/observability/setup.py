@@ -0,0 +1,42 @@
+"""Process-wide observability setup from settings."""
+
+import threading
+
+from .metrics import start_metrics_file_writer, start_metrics_server
+from .tracing import configure_tracing
+from ..config.settings import (
+    OBSERVABILITY_ENABLED,
+    TRACE_EXPORTER,
+    TRACE_FILE,
+    METRICS_PORT,
+    METRICS_FILE,
+    METRICS_FILE_INTERVAL_SECONDS,
+)
+
+
+_configured = False
+_lock = threading.Lock()
+
+
+def configure_observability() -> None:
+    """
+    Start span export and the metrics endpoint/file once per process.
+
+    TRACE_EXPORTER selects console or file span export, METRICS_PORT serves
+    /metrics and METRICS_FILE is rewritten every METRICS_FILE_INTERVAL_SECONDS.
+    """
+    global _configured
+    if not OBSERVABILITY_ENABLED or _configured:
+        return
+    with _lock:
+        if _configured:
+            return
+        configure_tracing(TRACE_EXPORTER, TRACE_FILE)
+        if METRICS_PORT:
+            try:
+                start_metrics_server(METRICS_PORT)
+            except OSError as e:
+                print(f"Metrics endpoint not started on port {METRICS_PORT}: {e}")
+        if METRICS_FILE:
+            start_metrics_file_writer(METRICS_FILE, METRICS_FILE_INTERVAL_SECONDS)
+        _configured = True
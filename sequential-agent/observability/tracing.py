@@ -0,0 +1,266 @@
+"""Spans for agents, LLM calls and tools, exported via OpenTelemetry or a JSON Lines file."""
+
+from typing import Any, Callable, Dict, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import functools
+import json
+import threading
+import time
+import uuid
+
+from .metrics import TOOL_DURATION, TOOL_FALLBACKS
+from ..config.settings import OBSERVABILITY_ENABLED
+
+
+_tracer = None  # OpenTelemetry tracer once configure_tracing() set one up
+_fallback_file: Optional["_JsonLinesFile"] = None  # Used when the OpenTelemetry SDK is not installed
+# Current span ID for the JSON Lines fallback (OpenTelemetry keeps its own current span)
+_fallback_parent: ContextVar[Optional[str]] = ContextVar("permitflow_fallback_span", default=None)
+
+
+class _JsonLinesFile:
+    """Thread-safe append-only JSON Lines writer."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, records) -> None:
+        lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+def _file_span_exporter(path: str):
+    """Create an OpenTelemetry span exporter writing one JSON object per span to path."""
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+    class JsonFileSpanExporter(SpanExporter):
+        def __init__(self):
+            self._file = _JsonLinesFile(path)
+
+        def export(self, spans):
+            self._file.write(json.loads(span.to_json()) for span in spans)
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self):
+            pass
+
+    return JsonFileSpanExporter()
+
+
+def configure_tracing(exporter: str, path: str) -> None:
+    """
+    Set up span export.
+
+    With the OpenTelemetry SDK, spans (ours and ADK's own agent/LLM/tool
+    spans) go to the console or a JSON Lines file through the global tracer
+    provider. Without it, "file" still writes our spans as plain JSON Lines.
+
+    Args:
+        exporter: "none", "console" or "file"
+        path: Span file for the "file" exporter
+    """
+    global _tracer, _fallback_file
+    if exporter in ("", "none"):
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        if exporter == "file":
+            _fallback_file = _JsonLinesFile(path)
+        else:
+            print("TRACE_EXPORTER=console requires opentelemetry-sdk; spans are not exported")
+        return
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({"service.name": "permitflow"}))
+        trace.set_tracer_provider(provider)
+    span_exporter = ConsoleSpanExporter() if exporter == "console" else _file_span_exporter(path)
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = trace.get_tracer("permitflow")
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep attribute values OpenTelemetry accepts (str, bool, int, float); stringify the rest."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else json.dumps(value, default=str)
+        for key, value in attributes.items() if value is not None
+    }
+
+
+@dataclass
+class OpenSpan:
+    """A started span; finish it with end_span()."""
+    name: str
+    start_ns: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    otel_span: Any = None
+    span_id: Optional[str] = None
+    parent_id: Optional[str] = None
+    # Restores the previous current span (start_span(current=True))
+    token: Any = None
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None, current: bool = False) -> OpenSpan:
+    """
+    Start a span under the current span.
+
+    Args:
+        name: Span name (e.g., "agent hazard_identification_agent")
+        attributes: Span attributes (more can be added until end_span)
+        current: Make it the current span, so spans started in this context
+            until end_span() (e.g., tool spans under an agent) nest under it
+
+    Returns:
+        OpenSpan to pass to end_span
+    """
+    opened = OpenSpan(name=name, start_ns=time.time_ns(), attributes=dict(attributes or {}))
+    if _tracer is not None:
+        from opentelemetry import context, trace
+
+        opened.otel_span = _tracer.start_span(name, start_time=opened.start_ns)
+        if current:
+            opened.token = context.attach(trace.set_span_in_context(opened.otel_span))
+    elif _fallback_file is not None:
+        opened.span_id = uuid.uuid4().hex[:16]
+        opened.parent_id = _fallback_parent.get()
+        if current:
+            opened.token = _fallback_parent.set(opened.span_id)
+    return opened
+
+
+def end_span(
+    opened: OpenSpan,
+    attributes: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+    restore_current: bool = True
+) -> None:
+    """
+    Finish and export a span from start_span().
+
+    Args:
+        opened: The started span
+        attributes: Attributes to add
+        error: Error description if the operation failed
+        restore_current: Make the previous span current again; only valid in
+            the context that started the span (False when ending it elsewhere)
+    """
+    end_ns = time.time_ns()
+    opened.attributes.update(attributes or {})
+    if opened.token is not None and restore_current:
+        try:
+            if opened.otel_span is not None:
+                from opentelemetry import context
+
+                context.detach(opened.token)
+            else:
+                _fallback_parent.reset(opened.token)
+        except ValueError:
+            pass  # Ended from another context; that context keeps its own current span
+    opened.token = None
+
+    if opened.otel_span is not None:
+        from opentelemetry.trace import Status, StatusCode
+
+        opened.otel_span.set_attributes(_otel_attributes(opened.attributes))
+        if error:
+            opened.otel_span.set_status(Status(StatusCode.ERROR, error))
+        opened.otel_span.end(end_time=end_ns)
+    elif _fallback_file is not None and opened.span_id is not None:
+        _fallback_file.write([{
+            "name": opened.name,
+            "spanId": opened.span_id,
+            "parentId": opened.parent_id,
+            "startTime": opened.start_ns,
+            "endTime": end_ns,
+            "durationMs": round((end_ns - opened.start_ns) / 1e6, 3),
+            "status": "error" if error else "ok",
+            "error": error,
+            "attributes": opened.attributes,
+        }])
+
+
+@contextmanager
+def span(name: str, **attributes: Any):
+    """
+    Trace a block as the current span. Yields a dict the block may add attributes to.
+
+    Nested under the current span (e.g., the agent that called a tool).
+    """
+    opened = start_span(name, attributes, current=True)
+    error = None
+    try:
+        yield opened.attributes
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end_span(opened, error=error)
+
+
+def fallback_kind(result: Any) -> Optional[str]:
+    """
+    Detect a tool result served from a fallback instead of the real backend.
+
+    Tools mark these with a "note" (weather defaults, RAG mock data) or a
+    per-result meta note (RAG answered from the local index).
+
+    Returns:
+        "mock", "defaults", "local_index", "fallback", or None for a normal result
+    """
+    if not isinstance(result, dict):
+        return None
+    notes = [result.get("note")]
+    for item in result.get("results") or []:
+        if isinstance(item, dict) and isinstance(item.get("meta"), dict):
+            notes.append(item["meta"].get("note"))
+    text = " ".join(note for note in notes if isinstance(note, str)).lower()
+    if not text:
+        return None
+    if "mock" in text:
+        return "mock"
+    if "default values" in text:
+        return "defaults"
+    if "local index" in text:
+        return "local_index"
+    return "fallback"
+
+
+def traced_tool(func: Callable) -> Callable:
+    """
+    Record wall time, status and fallback usage of every call to a tool.
+
+    The wrapper keeps the tool's name, docstring and signature, so ADK builds
+    the same function declaration (and still injects tool_context).
+    """
+    if not OBSERVABILITY_ENABLED:
+        return func
+    tool_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            with span(f"tool {tool_name}", tool=tool_name) as attrs:
+                result = func(*args, **kwargs)
+                kind = fallback_kind(result)
+                if kind:
+                    attrs["fallback"] = kind
+                    TOOL_FALLBACKS.inc(tool=tool_name, kind=kind)
+            return result
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - started, tool=tool_name, status=status)
+
+    return wrapper
@@ -0,0 +1 @@
+"""Pipeline module for running the root agent over batches of work orders."""
@@ -0,0 +1,216 @@
+"""Batch runner: drive the root agent over many work orders concurrently, with checkpoint/resume."""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import asyncio
+import json
+import os
+import time
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .metrics import percentile
+from .scheduler import PriorityScheduler, classify_work_order_id
+
+
+# Session state written by the pipeline stages that is kept in each result record
+RESULT_STATE_KEYS = (
+    "hazard_identification_output",
+    "permit_generator_output",
+    "permit_validations",
+    "permit_remediations",
+    "tool_call_stats",
+    "rules_fast_path",
+    "result_cache_hit",
+)
+
+
+def read_checkpoint(output_path: str) -> Set[str]:
+    """
+    Get the work orders already completed in an output file.
+
+    The JSON Lines output doubles as the checkpoint: a work order is done once
+    a record with status "ok" has been written for it, so failed ones are
+    retried on resume.
+
+    Args:
+        output_path: Results file (.jsonl)
+
+    Returns:
+        Set of completed work order IDs
+    """
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(record.get("workOrderId"))
+    return done
+
+
+class BatchRunner:
+    """
+    Runs an agent once per work order with bounded concurrency.
+
+    Each work order gets its own session and the user message
+    {"workOrderId": ...}, the same input the frontend sends. Results are
+    appended to a JSON Lines file as they finish, with per-stage timings
+    (stage = event author, i.e. the sub-agent that produced the events).
+
+    Runs are admitted by a PriorityScheduler, so emergency work orders jump
+    ahead of the routine backlog.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        output_path: str,
+        concurrency: int = 8,
+        timeout_seconds: Optional[float] = None,
+        app_name: str = "permitflow_batch",
+        scheduler: Optional[PriorityScheduler] = None,
+        classify: Callable[[str], str] = classify_work_order_id
+    ):
+        self.agent = agent
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.app_name = app_name
+        self.scheduler = scheduler or PriorityScheduler(self.concurrency)
+        self.classify = classify
+        self.runner = InMemoryRunner(agent=agent, app_name=app_name)
+
+    async def _run_one(self, work_order_id: str) -> Dict[str, Any]:
+        """Run the pipeline for one work order and return its result record."""
+        started = time.perf_counter()
+        stage_seconds: Dict[str, float] = {}
+        user_id = "batch"
+        session = await self.runner.session_service.create_session(app_name=self.app_name, user_id=user_id)
+        message = types.Content(role="user", parts=[types.Part(text=json.dumps({"workOrderId": work_order_id}))])
+
+        async def consume() -> None:
+            last = started
+            async for event in self.runner.run_async(user_id=user_id, session_id=session.id, new_message=message):
+                now = time.perf_counter()
+                # Time since the previous event is attributed to the stage that produced this one
+                stage_seconds[event.author] = stage_seconds.get(event.author, 0.0) + (now - last)
+                last = now
+
+        record: Dict[str, Any] = {"workOrderId": work_order_id}
+        try:
+            if self.timeout_seconds:
+                await asyncio.wait_for(consume(), self.timeout_seconds)
+            else:
+                await consume()
+            final = await self.runner.session_service.get_session(
+                app_name=self.app_name, user_id=user_id, session_id=session.id
+            )
+            record["status"] = "ok"
+            record["state"] = {key: final.state[key] for key in RESULT_STATE_KEYS if key in final.state}
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            # Sessions are only needed for the result; drop them to keep memory flat
+            await self.runner.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session.id
+            )
+        record["stageSeconds"] = {stage: round(seconds, 3) for stage, seconds in stage_seconds.items()}
+        record["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+        return record
+
+    async def run(self, work_order_ids: Iterable[str], resume: bool = True, progress_every: int = 50) -> Dict[str, Any]:
+        """
+        Process work orders, skipping those already completed in the output file.
+
+        Args:
+            work_order_ids: Work order IDs to process
+            resume: Skip work orders with an "ok" record in the output file
+            progress_every: Print progress every N completed work orders (0 = never)
+
+        Returns:
+            Summary with total, skipped, succeeded, failed, elapsedSeconds,
+            throughputPerMinute, latency (p50/p95 of whole runs), stages
+            (p50/p95 per stage) and scheduler (per priority class metrics)
+        """
+        done = read_checkpoint(self.output_path) if resume else set()
+        pending = [wo_id for wo_id in dict.fromkeys(work_order_ids) if wo_id not in done]
+        summary: Dict[str, Any] = {"total": len(pending) + len(done), "skipped": len(done), "succeeded": 0, "failed": 0}
+        latencies: List[float] = []
+        stage_latencies: Dict[str, List[float]] = {}
+
+        started = time.perf_counter()
+        with open(self.output_path, "a" if resume else "w", encoding="utf-8") as out:
+
+            async def process(wo_id: str) -> None:
+                priority_class = self.classify(wo_id)
+                async with self.scheduler.slot(priority_class):
+                    record = await self._run_one(wo_id)
+                record["priorityClass"] = priority_class
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                if record["status"] == "ok":
+                    summary["succeeded"] += 1
+                    latencies.append(record["elapsedSeconds"])
+                    for stage, seconds in record["stageSeconds"].items():
+                        stage_latencies.setdefault(stage, []).append(seconds)
+                else:
+                    summary["failed"] += 1
+                completed = summary["succeeded"] + summary["failed"]
+                if progress_every and completed % progress_every == 0:
+                    rate = completed / (time.perf_counter() - started) * 60
+                    print(f"{completed}/{len(pending)} work orders ({summary['failed']} failed, {rate:.1f}/min)")
+
+            # One task per work order; the scheduler decides which run next (submission order within a class)
+            await asyncio.gather(*(process(wo_id) for wo_id in pending))
+
+        elapsed = time.perf_counter() - started
+        summary["elapsedSeconds"] = round(elapsed, 3)
+        completed = summary["succeeded"] + summary["failed"]
+        summary["throughputPerMinute"] = round(completed / elapsed * 60, 2) if elapsed > 0 else 0.0
+        summary["latency"] = {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95)}
+        summary["stages"] = {
+            stage: {"count": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for stage, values in stage_latencies.items()
+        }
+        summary["scheduler"] = self.scheduler.stats()
+        return summary
+
+
+def run_backlog(
+    agent: BaseAgent,
+    work_order_ids: Iterable[str],
+    output_path: str,
+    concurrency: int = 8,
+    timeout_seconds: Optional[float] = None,
+    resume: bool = True,
+    reservations: Optional[Dict[str, int]] = None,
+    aging_seconds: Optional[float] = 300.0
+) -> Dict[str, Any]:
+    """
+    Run an agent over a backlog of work orders (blocking entry point).
+
+    Args:
+        agent: Agent to run (normally the root agent)
+        work_order_ids: Work order IDs to process
+        output_path: JSON Lines results file (also the resume checkpoint)
+        concurrency: Work orders in flight at once
+        timeout_seconds: Per work order timeout (None = no limit)
+        resume: Skip work orders already completed in output_path
+        reservations: Slots kept free per priority class (e.g. {"emergency": 2})
+        aging_seconds: Waiting time that promotes a run by one priority class
+
+    Returns:
+        Run summary (see BatchRunner.run)
+    """
+    scheduler = PriorityScheduler(concurrency, reservations=reservations, aging_seconds=aging_seconds)
+    runner = BatchRunner(
+        agent, output_path, concurrency=concurrency, timeout_seconds=timeout_seconds, scheduler=scheduler
+    )
+    return asyncio.run(runner.run(work_order_ids, resume=resume))
@@ -0,0 +1,577 @@
+"""Pipeline result cache: replay stored hazards, permits and validation for unchanged work orders."""
+
+from typing import Any, AsyncGenerator, Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .batch import RESULT_STATE_KEYS
+from ..observability.tracing import fallback_kind
+from ..subagents.rules_precheck_agent import permits_from_state
+from ..tools import assets
+from ..tools.weather import weather_tile
+from ..tools.workorders import get_workorder_by_id
+from ..config.settings import (
+    POLICY_VERSION,
+    PIPELINE_CACHE,
+    PIPELINE_CACHE_PATH,
+    PIPELINE_CACHE_MAX_BYTES,
+    PIPELINE_CACHE_TTL_SECONDS,
+    PIPELINE_CACHE_WEATHER_BUCKET_SECONDS,
+)
+
+
+# A run is only cached once it produced these outputs
+REQUIRED_STATE_KEYS = ("hazard_identification_output", "permit_generator_output")
+
+_WORK_ORDER_ID = re.compile(r"\bWO-[A-Za-z0-9-]+\b")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def work_order_fingerprint(wo: Dict[str, Any]) -> str:
+    """Hash the canonical JSON of a work order (key order and whitespace do not matter)."""
+    return _sha256(json.dumps(wo, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def weather_bucket(wo: Dict[str, Any], now: Optional[float] = None) -> str:
+    """
+    Identify the weather a run for this work order sees: its tile and time bucket.
+
+    Args:
+        wo: Work order dictionary (latitude/longitude)
+        now: Unix time (default: current time)
+
+    Returns:
+        "<tile>@<bucket>", where the bucket changes every PIPELINE_CACHE_WEATHER_BUCKET_SECONDS
+    """
+    lat, lon = wo.get("latitude"), wo.get("longitude")
+    tile = weather_tile(lat, lon) if isinstance(lat, (int, float)) and isinstance(lon, (int, float)) else None
+    now = time.time() if now is None else now
+    bucket = int(now // PIPELINE_CACHE_WEATHER_BUCKET_SECONDS) if PIPELINE_CACHE_WEATHER_BUCKET_SECONDS > 0 else 0
+    return f"{tile}@{bucket}"
+
+
+def policy_inputs() -> Dict[str, Any]:
+    """
+    Identify the policy and corpus versions a pipeline result depends on.
+
+    Returns:
+        Dictionary with policyVersion, rulesSha256 (compliance_rules.json),
+        templatesSha256 (permit templates) and ragSnapshot (read live, like the
+        RAG result cache, so a redeploy-free corpus update takes effect)
+    """
+    rules = assets.get_snapshot("compliance_rules.json")
+    templates = []
+    templates_dir = assets.assets_path() / "permit_templates"
+    if templates_dir.is_dir():
+        for path in sorted(templates_dir.glob("*.yaml")):
+            snapshot = assets.get_snapshot(f"permit_templates/{path.name}", "yaml")
+            if snapshot is not None:
+                templates.append(f"{path.name}:{snapshot.sha256}")
+    return {
+        "policyVersion": POLICY_VERSION,
+        "rulesSha256": rules.sha256 if rules is not None else None,
+        "templatesSha256": _sha256("\n".join(templates)),
+        "ragSnapshot": os.getenv("RAG_SNAPSHOT"),
+    }
+
+
+class DiskResultStore:
+    """One JSON file per cache key in a directory, evicting least recently used files past max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes: Optional[int] = None  # Scanned lazily, then kept as a running total
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _files(self):
+        return list(self.directory.glob("*.json"))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a record, marking it recently used."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Write a record atomically, then evict to stay within max_bytes."""
+        body = json.dumps(record, default=str)
+        path = self._path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(body)
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            if self._bytes is None:
+                self._bytes = sum(p.stat().st_size for p in self._files())
+            else:
+                self._bytes += len(body.encode("utf-8")) - old_size
+            if self.max_bytes is not None and self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under max_bytes (caller holds the lock)."""
+        entries = []
+        for p in self._files():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        self._bytes = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if self._bytes <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            self._bytes -= size
+
+    def delete(self, key: str) -> None:
+        """Delete one record."""
+        with self._lock:
+            self._path(key).unlink(missing_ok=True)
+            self._bytes = None
+
+    def delete_where(self, work_order_id: Optional[str] = None, inputs_hash_not: Optional[str] = None) -> int:
+        """
+        Delete records for a work order and/or computed against other inputs.
+
+        Args:
+            work_order_id: Only delete records of this work order
+            inputs_hash_not: Only delete records whose inputsHash differs from this
+
+        Returns:
+            Number of records deleted
+        """
+        deleted = 0
+        with self._lock:
+            for p in self._files():
+                try:
+                    with open(p, "r", encoding="utf-8") as f:
+                        record = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if work_order_id is not None and record.get("workOrderId") != work_order_id:
+                    continue
+                if inputs_hash_not is not None and record.get("inputsHash") == inputs_hash_not:
+                    continue
+                p.unlink(missing_ok=True)
+                deleted += 1
+            self._bytes = None
+        return deleted
+
+    def clear(self) -> int:
+        """Delete every record."""
+        return self.delete_where()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of records and bytes on disk."""
+        sizes = [p.stat().st_size for p in self._files()]
+        return {"backend": "disk", "path": str(self.directory), "entries": len(sizes), "bytes": sum(sizes)}
+
+
+class SQLiteResultStore:
+    """Records in a SQLite table, evicting least recently used rows past max_bytes."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS pipeline_results (
+        key TEXT PRIMARY KEY,
+        work_order_id TEXT,
+        inputs_hash TEXT NOT NULL,
+        last_used REAL NOT NULL,
+        size INTEGER NOT NULL,
+        body TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_pipeline_results_work_order ON pipeline_results(work_order_id);
+    CREATE INDEX IF NOT EXISTS idx_pipeline_results_last_used ON pipeline_results(last_used);
+    """
+
+    def __init__(self, db_path: str, max_bytes: Optional[int] = None):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._connect().executescript(self._SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a record, marking it recently used."""
+        conn = self._connect()
+        row = conn.execute("SELECT body FROM pipeline_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE pipeline_results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """Upsert a record, then evict to stay within max_bytes."""
+        body = json.dumps(record, default=str)
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO pipeline_results (key, work_order_id, inputs_hash, last_used, size, body) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, record.get("workOrderId"), record.get("inputsHash"), time.time(), len(body), body),
+        )
+        if self.max_bytes is None:
+            return
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pipeline_results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evict = []
+        for old_key, size in conn.execute("SELECT key, size FROM pipeline_results ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evict.append((old_key,))
+            total -= size
+        conn.executemany("DELETE FROM pipeline_results WHERE key = ?", evict)
+
+    def delete(self, key: str) -> None:
+        """Delete one record."""
+        self._connect().execute("DELETE FROM pipeline_results WHERE key = ?", (key,))
+
+    def delete_where(self, work_order_id: Optional[str] = None, inputs_hash_not: Optional[str] = None) -> int:
+        """
+        Delete records for a work order and/or computed against other inputs.
+
+        Args:
+            work_order_id: Only delete records of this work order
+            inputs_hash_not: Only delete records whose inputs hash differs from this
+
+        Returns:
+            Number of records deleted
+        """
+        clauses, params = [], []
+        if work_order_id is not None:
+            clauses.append("work_order_id = ?")
+            params.append(work_order_id)
+        if inputs_hash_not is not None:
+            clauses.append("inputs_hash != ?")
+            params.append(inputs_hash_not)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._connect().execute(f"DELETE FROM pipeline_results{where}", params).rowcount
+
+    def clear(self) -> int:
+        """Delete every record."""
+        return self.delete_where()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of records and bytes stored."""
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pipeline_results"
+        ).fetchone()
+        return {"backend": "sqlite", "path": self.db_path, "entries": entries, "bytes": size}
+
+
+class ResultCache:
+    """
+    Pipeline results keyed by work-order content and the policy/corpus versions.
+
+    The key is sha256(work order fingerprint + inputs hash + weather bucket),
+    where the inputs are POLICY_VERSION, the compliance rules and permit
+    templates hashes and RAG_SNAPSHOT. A changed work order or input therefore
+    misses; records computed against old inputs are purged the first time a
+    change is seen. The weather bucket (weather_bucket) makes results older
+    than PIPELINE_CACHE_WEATHER_BUCKET_SECONDS miss.
+    """
+
+    def __init__(self, store, ttl_seconds: Optional[float] = None):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self._inputs_hash: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "purged": 0}
+
+    def _current_inputs_hash(self) -> str:
+        """Hash the current inputs, purging stale records when they changed."""
+        inputs_hash = _sha256(json.dumps(policy_inputs(), sort_keys=True))
+        if inputs_hash != self._inputs_hash:
+            with self._lock:
+                if inputs_hash != self._inputs_hash:
+                    self._stats["purged"] += self.store.delete_where(inputs_hash_not=inputs_hash)
+                    self._inputs_hash = inputs_hash
+        return inputs_hash
+
+    def key_for(self, wo: Dict[str, Any], now: Optional[float] = None) -> str:
+        """Get the cache key for a work order under the current inputs and weather bucket."""
+        return _sha256(
+            work_order_fingerprint(wo) + ":" + self._current_inputs_hash() + ":" + weather_bucket(wo, now)
+        )
+
+    def lookup(self, wo: Dict[str, Any], key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored pipeline state for a work order.
+
+        Args:
+            wo: Work order dictionary
+            key: Cache key from key_for (default: the current key)
+
+        Returns:
+            State dictionary (RESULT_STATE_KEYS), or None on a miss or expired record
+        """
+        key = key or self.key_for(wo)
+        record = self.store.get(key)
+        if record is not None and self.ttl_seconds and time.time() - record.get("storedAt", 0) > self.ttl_seconds:
+            self.store.delete(key)
+            self._stats["expired"] += 1
+            record = None
+        self._stats["hits" if record is not None else "misses"] += 1
+        return record["state"] if record is not None else None
+
+    def put(self, wo: Dict[str, Any], state: Dict[str, Any], key: Optional[str] = None) -> None:
+        """
+        Store the pipeline state for a work order.
+
+        Args:
+            wo: Work order dictionary
+            state: State dictionary (RESULT_STATE_KEYS)
+            key: Cache key from key_for; pass the one looked up before the run,
+                so a run spanning a weather bucket boundary is stored under the
+                bucket whose weather it used
+        """
+        key = key or self.key_for(wo)
+        self.store.put(key, {
+            "workOrderId": wo.get("workOrderId"),
+            "inputsHash": self._inputs_hash,
+            "storedAt": time.time(),
+            "state": state,
+        })
+        self._stats["stores"] += 1
+
+    def invalidate(self, work_order_id: Optional[str] = None) -> int:
+        """
+        Drop stored results for one work order, or all of them.
+
+        Args:
+            work_order_id: Work order ID, or None for every record
+
+        Returns:
+            Number of records deleted
+        """
+        if work_order_id is None:
+            return self.store.clear()
+        return self.store.delete_where(work_order_id=work_order_id)
+
+    def purge_stale(self) -> int:
+        """Drop records computed against other policy/rules/template/RAG versions."""
+        self._inputs_hash = None
+        before = self._stats["purged"]
+        self._current_inputs_hash()
+        return self._stats["purged"] - before
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dictionary with hits, misses, stores, expired, purged, hitRate and
+            the store's backend, path, entries and bytes
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hitRate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            **self.store.stats(),
+        }
+
+
+def create_store(backend: str, path: Optional[str] = None, max_bytes: Optional[int] = None):
+    """
+    Create a result store.
+
+    Args:
+        backend: "disk" or "sqlite"
+        path: Directory (disk) or database file (sqlite); defaults under the temp directory
+        max_bytes: Size bound for LRU eviction (None = unbounded)
+
+    Returns:
+        DiskResultStore or SQLiteResultStore
+    """
+    if backend == "disk":
+        return DiskResultStore(path or os.path.join(tempfile.gettempdir(), "permitflow_results"), max_bytes)
+    if backend == "sqlite":
+        return SQLiteResultStore(path or os.path.join(tempfile.gettempdir(), "permitflow_results.db"), max_bytes)
+    raise ValueError(f"Unknown pipeline cache backend: {backend}")
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Get the process-wide result cache configured by PIPELINE_CACHE (None when disabled)."""
+    global _cache
+    if PIPELINE_CACHE in ("", "none", "off"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                store = create_store(PIPELINE_CACHE, PIPELINE_CACHE_PATH, PIPELINE_CACHE_MAX_BYTES or None)
+                _cache = ResultCache(store, PIPELINE_CACHE_TTL_SECONDS or None)
+    return _cache
+
+
+def work_order_id_from_content(content: Optional[types.Content]) -> Optional[str]:
+    """
+    Extract the work order ID from the user message.
+
+    Accepts the frontend's {"workOrderId": ...} JSON, or free text mentioning a WO-... ID.
+    """
+    if content is None or not content.parts:
+        return None
+    text = "".join(part.text or "" for part in content.parts)
+    try:
+        payload = json.loads(text)
+        if isinstance(payload, dict) and payload.get("workOrderId"):
+            return str(payload["workOrderId"])
+    except ValueError:
+        pass
+    match = _WORK_ORDER_ID.search(text)
+    return match.group(0) if match else None
+
+
+def _plain(value: Any) -> Any:
+    """Convert pydantic outputs to plain data for storage."""
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+def response_payload(work_order_id: str, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Build the agent response the frontend parses from a stored result.
+
+    The frontend (frontend/src/utils/api.ts) reads the first event text that
+    is a JSON object with "hazards" or "permits"; a cache hit has no LLM
+    events, so this payload is its only content.
+
+    Args:
+        work_order_id: Work order ID
+        state: Stored result state (RESULT_STATE_KEYS)
+
+    Returns:
+        Dictionary with workOrderId, hazards, permits, validations, pdfLinks and
+        runMeta, or None if the stored result has neither hazards nor permits
+    """
+    hazards_output = state.get("hazard_identification_output")
+    if isinstance(hazards_output, str):
+        try:
+            hazards_output = json.loads(hazards_output)
+        except ValueError:
+            hazards_output = None
+    hazards = hazards_output.get("hazards") if isinstance(hazards_output, dict) else None
+    hazards = [h for h in hazards if isinstance(h, dict)] if isinstance(hazards, list) else []
+    permits = permits_from_state(state.get("permit_generator_output"))
+    if not hazards and not permits:
+        return None
+    validations = state.get("permit_validations") or {}
+    return {
+        "workOrderId": work_order_id,
+        "hazards": hazards,
+        "permits": permits,
+        "validations": [v for v in validations.values() if isinstance(v, dict)] if isinstance(validations, dict) else [],
+        "pdfLinks": [],
+        "runMeta": {
+            "policyVersion": POLICY_VERSION,
+            "ragSnapshot": os.getenv("RAG_SNAPSHOT") or "",
+            "resultCacheHit": True,
+        },
+    }
+
+
+class CachedPipelineAgent(BaseAgent):
+    """
+    Serves a stored result for an unchanged work order instead of re-running the pipeline.
+
+    On a hit the stored state (hazards, permits, validation) is written to the
+    session in a single event with "result_cache_hit" set, whose text is the
+    JSON response_payload() the frontend parses. A stored result that cannot
+    produce that payload is treated as a miss. On a miss the
+    pipeline runs as usual and its outputs are stored once it completes.
+    Only this run's state deltas are stored (the session may hold keys from an
+    earlier run), and nothing is stored when a tool answered from a fallback.
+    Messages without a work order ID, and unknown work orders, bypass the cache.
+    """
+
+    pipeline: BaseAgent
+    cache: Any = None
+
+    def __init__(self, name: str, pipeline: BaseAgent, cache: Optional[ResultCache] = None):
+        super().__init__(
+            name=name,
+            description=pipeline.description,
+            pipeline=pipeline,
+            cache=cache,
+            sub_agents=[pipeline],
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        cache = self.cache or get_result_cache()
+        work_order_id = work_order_id_from_content(ctx.user_content) if cache is not None else None
+        wo = get_workorder_by_id(work_order_id) if work_order_id else None
+        if wo is not None and wo.get("description") == "Work order not found":
+            wo = None
+
+        key = cache.key_for(wo) if wo is not None else None
+        if wo is not None:
+            state = cache.lookup(wo, key)
+            payload = response_payload(work_order_id, state) if state is not None else None
+            if payload is not None:
+                yield Event(
+                    author=self.name,
+                    invocation_id=ctx.invocation_id,
+                    branch=ctx.branch,
+                    content=types.Content(role="model", parts=[types.Part(text=json.dumps(payload))]),
+                    actions=EventActions(state_delta={**state, "result_cache_hit": True}),
+                )
+                return
+
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={"result_cache_hit": False}),
+            )
+
+        run_state: Dict[str, Any] = {}
+        fallback = None
+        async for event in self.pipeline.run_async(ctx):
+            if wo is not None:
+                if event.actions and event.actions.state_delta:
+                    run_state.update(event.actions.state_delta)
+                for response in event.get_function_responses():
+                    fallback = fallback or fallback_kind(response.response)
+            yield event
+
+        if wo is not None and fallback is None and all(name in run_state for name in REQUIRED_STATE_KEYS):
+            cache.put(wo, {name: _plain(run_state[name]) for name in RESULT_STATE_KEYS if name in run_state}, key)
@@ -0,0 +1,226 @@
+"""Priority scheduling of pipeline runs: work-order priority classes, reservations, aging and queue metrics."""
+
+from typing import Any, Dict, List, Optional
+from collections import deque
+from contextlib import asynccontextmanager
+import asyncio
+import itertools
+import re
+import time
+
+from .metrics import percentile
+from ..tools.workorders import get_workorder_by_id
+
+
+# Highest priority first
+PRIORITY_CLASSES = ("emergency", "urgent", "routine")
+
+# Phrases describing an ongoing incident; bare "spill", "rupture" or "leak" also appear
+# in routine work ("spill kit", "rupture disc replacement", "leak rate test")
+EMERGENCY_KEYWORDS = (
+    "emergency", "active leak", "active hydrocarbon leak", "active gas leak", "ongoing leak",
+    "active spill", "ongoing spill", "uncontrolled release", "immediate action",
+    "line rupture", "pipe rupture", "pipeline rupture", "tank rupture", "vessel rupture",
+)
+# "Emergency ..." equipment and procedures named in routine work; not an emergency by themselves
+EMERGENCY_EQUIPMENT = (
+    "emergency shutdown", "emergency stop", "emergency eyewash", "emergency shower", "emergency light",
+    "emergency lighting", "emergency generator", "emergency exit", "emergency drill", "emergency response plan",
+)
+URGENT_KEYWORDS = ("urgent", "asap", "as soon as possible", "safety critical", "before restart")
+
+# Explicit priority/status field values, lowercased
+_FIELD_CLASSES = {
+    "emergency": "emergency", "critical": "emergency", "p1": "emergency", "1": "emergency",
+    "urgent": "urgent", "high": "urgent", "p2": "urgent", "2": "urgent",
+    "routine": "routine", "normal": "routine", "medium": "routine", "low": "routine",
+    "p3": "routine", "p4": "routine", "3": "routine", "4": "routine",
+}
+
+
+def _keyword_pattern(keywords) -> "re.Pattern":
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+
+
+_EMERGENCY = _keyword_pattern(EMERGENCY_KEYWORDS)
+_EMERGENCY_EQUIPMENT = _keyword_pattern(EMERGENCY_EQUIPMENT)
+_URGENT = _keyword_pattern(URGENT_KEYWORDS)
+
+
+def classify_work_order(wo: Dict[str, Any]) -> str:
+    """
+    Derive a work order's priority class.
+
+    An explicit priority field wins, then an emergency/urgent status, then
+    keywords in the description. Only phrases describing an ongoing incident
+    ("active spill", "line rupture") make a description an emergency;
+    emergency equipment ("emergency shutdown valve") does not.
+
+    Args:
+        wo: Work order dictionary
+
+    Returns:
+        "emergency", "urgent" or "routine"
+    """
+    priority = str(wo.get("priority") or "").strip().lower()
+    if priority in _FIELD_CLASSES:
+        return _FIELD_CLASSES[priority]
+    status = str(wo.get("status") or "").strip().lower()
+    if _FIELD_CLASSES.get(status) in ("emergency", "urgent"):
+        return _FIELD_CLASSES[status]
+    description = wo.get("description") or ""
+    if _EMERGENCY.search(_EMERGENCY_EQUIPMENT.sub(" ", description)):
+        return "emergency"
+    if _URGENT.search(description):
+        return "urgent"
+    return "routine"
+
+
+def classify_work_order_id(work_order_id: str) -> str:
+    """Load a work order and classify it (unknown work orders are routine)."""
+    return classify_work_order(get_workorder_by_id(work_order_id))
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
+
+
+class _Waiter:
+    __slots__ = ("priority_class", "rank", "enqueued_at", "seq", "future")
+
+    def __init__(self, priority_class: str, rank: int, seq: int, future: asyncio.Future):
+        self.priority_class = priority_class
+        self.rank = rank
+        self.enqueued_at = time.monotonic()
+        self.seq = seq
+        self.future = future
+
+
+class PriorityScheduler:
+    """
+    Admits pipeline runs into a fixed number of slots by priority class.
+
+    - Waiters are served highest class first, FIFO within a class.
+    - reservations keeps slots free for a class: other classes cannot take
+      the last N slots while that class runs fewer than N (e.g. two slots
+      always open for emergencies).
+    - Aging: every aging_seconds of waiting promotes a waiter by one class,
+      so routine work cannot starve.
+
+    Use from asyncio code: `async with scheduler.slot("emergency"): ...`.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        reservations: Optional[Dict[str, int]] = None,
+        aging_seconds: Optional[float] = 300.0,
+        classes=PRIORITY_CLASSES,
+        wait_samples: int = 1000
+    ):
+        self.capacity = max(1, capacity)
+        self.classes = tuple(classes)
+        self.reservations = {c: n for c, n in (reservations or {}).items() if c in self.classes and n > 0}
+        if sum(self.reservations.values()) > self.capacity:
+            raise ValueError("Reservations exceed scheduler capacity")
+        self.aging_seconds = aging_seconds
+        self._rank = {c: i for i, c in enumerate(self.classes)}
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._running = {c: 0 for c in self.classes}
+        self._metrics = {
+            c: {"admitted": 0, "completed": 0, "maxQueueDepth": 0, "waits": deque(maxlen=wait_samples)}
+            for c in self.classes
+        }
+
+    def _effective_rank(self, waiter: _Waiter, now: float) -> int:
+        if not self.aging_seconds:
+            return waiter.rank
+        return max(0, waiter.rank - int((now - waiter.enqueued_at) // self.aging_seconds))
+
+    def _admissible(self, priority_class: str) -> bool:
+        """Check whether a run of this class may start without eating another class's reservation."""
+        free = self.capacity - sum(self._running.values())
+        if free <= 0:
+            return False
+        held_back = sum(
+            max(0, reserved - self._running[c])
+            for c, reserved in self.reservations.items() if c != priority_class
+        )
+        return free > held_back
+
+    def _dispatch(self) -> None:
+        """Start as many waiters as the free slots allow, best effective priority first."""
+        while self._waiters:
+            now = time.monotonic()
+            self._waiters = [w for w in self._waiters if not w.future.done()]
+            ordered = sorted(self._waiters, key=lambda w: (self._effective_rank(w, now), w.seq))
+            chosen = next((w for w in ordered if self._admissible(w.priority_class)), None)
+            if chosen is None:
+                return
+            self._waiters.remove(chosen)
+            self._running[chosen.priority_class] += 1
+            metrics = self._metrics[chosen.priority_class]
+            metrics["admitted"] += 1
+            metrics["waits"].append(now - chosen.enqueued_at)
+            chosen.future.set_result(None)
+
+    async def acquire(self, priority_class: str) -> None:
+        """Wait for a slot for a run of the given class."""
+        if priority_class not in self._rank:
+            raise ValueError(f"Unknown priority class: {priority_class}")
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(_Waiter(priority_class, self._rank[priority_class], next(self._seq), future))
+        depth = sum(1 for w in self._waiters if w.priority_class == priority_class)
+        metrics = self._metrics[priority_class]
+        metrics["maxQueueDepth"] = max(metrics["maxQueueDepth"], depth)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self.release(priority_class)
+            raise
+
+    def release(self, priority_class: str) -> None:
+        """Free a slot taken with acquire()."""
+        self._running[priority_class] -= 1
+        self._metrics[priority_class]["completed"] += 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority_class: str):
+        """Hold a slot for the duration of the block."""
+        await self.acquire(priority_class)
+        try:
+            yield
+        finally:
+            self.release(priority_class)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-class scheduling metrics.
+
+        Returns:
+            Dictionary per class with queueDepth, running, reserved, admitted,
+            completed, maxQueueDepth and waitSeconds (p50/p95/max over recent runs)
+        """
+        result = {}
+        for c in self.classes:
+            metrics = self._metrics[c]
+            waits = list(metrics["waits"])
+            result[c] = {
+                "queueDepth": sum(1 for w in self._waiters if w.priority_class == c and not w.future.done()),
+                "running": self._running[c],
+                "reserved": self.reservations.get(c, 0),
+                "admitted": metrics["admitted"],
+                "completed": metrics["completed"],
+                "maxQueueDepth": metrics["maxQueueDepth"],
+                "waitSeconds": {
+                    "p50": _rounded(percentile(waits, 50)),
+                    "p95": _rounded(percentile(waits, 95)),
+                    "max": _rounded(max(waits, default=None)),
+                },
+            }
+        return result
@@ -0,0 +1,27 @@
+"""Helper for scripts that need modules from the agent package."""
+
+import importlib
+import sys
+from pathlib import Path
+
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+def import_package_module(name: str):
+    """
+    Import a module of the agent package from a standalone script.
+
+    The package directory name ("sequential-agent") is not a valid identifier,
+    so it is imported through importlib with its parent directory on sys.path.
+
+    Args:
+        name: Module path inside the package (e.g., "tools.workorder_store")
+
+    Returns:
+        The imported module
+    """
+    parent = str(PACKAGE_DIR.parent)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return importlib.import_module(f"{PACKAGE_DIR.name}.{name}")
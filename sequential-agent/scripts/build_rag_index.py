@@ -0,0 +1,53 @@
+"""Script to build the local RAG index (memory-mapped vectors) from assets/rag_data."""
+
+import argparse
+import time
+
+from _package import import_package_module
+
+
+def build_rag_index(output_path: str, index_type: str = "auto", dim: int = 256, incidents_path: str = None, permits_path: str = None):
+    """
+    Build and persist the local RAG index.
+
+    Args:
+        output_path: Path prefix; writes <output_path>.vectors, .lexical and .json
+        index_type: "flat", "hnsw" or "auto"
+        dim: Embedding dimension
+        incidents_path: Incidents export (.json or .jsonl; default: assets/rag_data)
+        permits_path: Historical permits export (.json or .jsonl; default: assets/rag_data)
+
+    Returns:
+        The built LocalRagIndex
+    """
+    rag_corpus = import_package_module("tools.rag_corpus")
+    rag_index = import_package_module("tools.rag_index")
+
+    # Records are parsed and embedded one at a time as the index consumes them
+    print("Streaming RAG data...")
+    incidents, permits = rag_corpus.load_rag_data(incidents_path, permits_path)
+    documents = rag_corpus.create_rag_documents(incidents, permits)
+
+    started = time.perf_counter()
+    index = rag_index.LocalRagIndex.build(documents, index_type=index_type, dim=dim)
+    index.save(output_path)
+    elapsed = time.perf_counter() - started
+
+    print(f"Built {index.index_type} index with {len(index.documents)} documents in {elapsed:.2f}s")
+    print(f"Set RAG_INDEX_PATH={output_path} and VECTOR_STORE_TYPE=local to use it")
+    return index
+
+
+if __name__ == "__main__":
+    settings = import_package_module("config.settings")
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=settings.RAG_INDEX_PATH or "rag_index/permitflowai", help="Index path prefix")
+    parser.add_argument("--index-type", default=settings.RAG_INDEX_TYPE, choices=["flat", "hnsw", "auto"])
+    parser.add_argument("--dim", type=int, default=settings.RAG_EMBEDDING_DIM, help="Embedding dimension")
+    parser.add_argument("--incidents", default=None, help="Incidents export (.json or .jsonl)")
+    parser.add_argument("--permits", default=None, help="Historical permits export (.json or .jsonl)")
+    args = parser.parse_args()
+
+    build_rag_index(args.output, index_type=args.index_type, dim=args.dim,
+                    incidents_path=args.incidents, permits_path=args.permits)
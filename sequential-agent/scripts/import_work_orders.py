@@ -0,0 +1,54 @@
+"""Script to build or incrementally update the SQLite work order store from a JSON export."""
+
+import argparse
+import os
+import time
+
+from _package import import_package_module
+
+
+def import_work_orders(json_path: str, db_path: str, batch_size: int = 1000, prune: bool = False):
+    """
+    Import a workOrders.json export into the SQLite work order store.
+
+    Args:
+        json_path: Path to the JSON export (top-level "workOrders" array)
+        db_path: Path to the SQLite database file
+        batch_size: Work orders written per transaction
+        prune: Delete stored work orders that are absent from the export
+
+    Returns:
+        Counts of inserted, updated, unchanged and deleted work orders
+    """
+    workorder_store = import_package_module("tools.workorder_store")
+    store = workorder_store.get_store(db_path)
+
+    print(f"Importing work orders from {json_path} into {db_path}...")
+    started = time.perf_counter()
+    totals = store.import_json(json_path, batch_size=batch_size, prune=prune)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"Inserted {totals['inserted']}, updated {totals['updated']}, "
+        f"unchanged {totals['unchanged']}, deleted {totals['deleted']} "
+        f"in {elapsed:.2f}s ({store.count()} work orders in store)"
+    )
+    return totals
+
+
+if __name__ == "__main__":
+    assets = import_package_module("tools.assets")
+    settings = import_package_module("config.settings")
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--json", default=str(assets.assets_path() / "workOrders.json"), help="Work order JSON export")
+    parser.add_argument(
+        "--db",
+        default=settings.WORKORDER_DB_PATH or str(assets.assets_path() / "workOrders.db"),
+        help="SQLite database path (default: WORKORDER_DB_PATH or <assets>/workOrders.db)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Work orders per transaction")
+    parser.add_argument("--prune", action="store_true", help="Delete work orders missing from the export")
+    args = parser.parse_args()
+
+    import_work_orders(args.json, args.db, batch_size=args.batch_size, prune=args.prune)
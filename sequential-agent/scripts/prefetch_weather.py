@@ -0,0 +1,60 @@
+"""Script to check weather coverage for a shift's work orders.
+
+The weather cache lives in the process that runs the agents, so the cache
+this script fills is gone when it exits. It checks a shift's coordinates and
+Weather API access before the shift. To keep the serving cache warm, set
+WEATHER_PREFETCH_WORK_ORDERS for the server (main.py); batch runs prefetch
+with scripts/run_backlog.py --prefetch-weather.
+"""
+
+import argparse
+import json
+
+from _package import import_package_module
+
+
+def prefetch(work_order_ids=None, max_workers: int = 8, force: bool = False):
+    """
+    Prefetch weather for the given work orders (default: all) and print the report.
+
+    Args:
+        work_order_ids: Work order IDs scheduled for the shift
+        max_workers: Maximum concurrent Weather API calls
+        force: Re-fetch tiles that are already cached
+
+    Returns:
+        Prefetch report
+    """
+    weather = import_package_module("tools.weather")
+    report = weather.prefetch_weather(work_order_ids, max_workers=max_workers, force=force)
+
+    print(
+        f"Covered {report['covered']}/{report['workOrders']} work orders ({report['coverage']:.0%}) "
+        f"across {report['tiles']} weather tiles in {report['elapsedSeconds']}s: "
+        f"{report['fetched']} fetched, {report['alreadyCached']} already cached, {report['failed']} failed"
+    )
+    if report["withoutCoordinates"]:
+        print(f"{report['withoutCoordinates']} work order(s) have no latitude/longitude")
+    for error in report["errors"]:
+        print(f"Failed for {', '.join(error['workOrderIds'])}: {error['error']}")
+    if report.get("note"):
+        print(report["note"])
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--work-orders", default=None,
+                        help="Comma-separated work order IDs, @file with one per line, or all "
+                             "(default: WEATHER_PREFETCH_WORK_ORDERS, else all)")
+    parser.add_argument("--max-workers", type=int, default=8, help="Maximum concurrent Weather API calls")
+    parser.add_argument("--force", action="store_true", help="Re-fetch tiles that are already cached")
+    parser.add_argument("--json", action="store_true", help="Also print the full report as JSON")
+    args = parser.parse_args()
+
+    weather = import_package_module("tools.weather")
+    shift = args.work_orders or import_package_module("config.settings").WEATHER_PREFETCH_WORK_ORDERS or "all"
+    ids = weather.shift_work_order_ids(shift)
+    result = prefetch(ids, max_workers=args.max_workers, force=args.force)
+    if args.json:
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,61 @@
+"""Script to render printable permit packs from a backlog results file (scripts/run_backlog.py).
+
+One PDF per permit (with its validation) of every successful work order.
+PDFs are content-addressed, so re-running after a partial failure or on an
+overlapping results file only renders permits that changed.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from _package import import_package_module
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", required=True, help="JSON Lines results file from run_backlog.py")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Render processes (0 = in process)")
+    parser.add_argument("--storage", choices=("local", "gcs"), default=None, help="Storage target (default: PDF_STORAGE)")
+    parser.add_argument("--output-dir", default=None, help="Directory for local storage (default: PDF_OUTPUT_DIR)")
+    parser.add_argument("--manifest", default=None, help="Write permitId -> pdfUrl results as JSON Lines")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    if args.storage:
+        os.environ["PDF_STORAGE"] = args.storage
+    if args.output_dir:
+        os.environ["PDF_OUTPUT_DIR"] = args.output_dir
+
+    pdf = import_package_module("tools.pdf")
+    workorders = import_package_module("tools.workorders")
+    precheck = import_package_module("subagents.rules_precheck_agent")
+
+    items = []
+    with open(args.results, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("status") != "ok":
+                continue
+            state = record.get("state", {})
+            validations = state.get("permit_validations") or {}
+            work_order = workorders.get_workorder_by_id(record["workOrderId"])
+            permits = precheck.permits_from_state(state.get("permit_generator_output"))
+            for permit, key in zip(permits, precheck.validation_keys(permits)):
+                items.append({
+                    "permit": permit,
+                    "validation": validations.get(key),
+                    "workOrder": work_order,
+                })
+
+    started = time.perf_counter()
+    results = pdf.render_many(items, workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.manifest:
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    rendered = len({r["pdfUrl"] for r in results if not r["cached"]})
+    print(f"{len(results)} permit(s): {rendered} rendered, {len(results) - rendered} already stored ({elapsed:.1f}s)")
@@ -0,0 +1,34 @@
+"""Script to inspect and invalidate the pipeline result cache (PIPELINE_CACHE).
+
+Results are keyed by work-order content, POLICY_VERSION, the compliance
+rules/template hashes and RAG_SNAPSHOT, so changed inputs miss automatically;
+use this to drop results explicitly (e.g. after a model or prompt change).
+"""
+
+import argparse
+import json
+
+from _package import import_package_module
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--invalidate", metavar="WORK_ORDER_ID", action="append", default=[],
+                       help="Drop stored results for a work order (repeatable)")
+    group.add_argument("--purge-stale", action="store_true",
+                       help="Drop results computed against other policy, rules, template or RAG versions")
+    group.add_argument("--clear", action="store_true", help="Drop every stored result")
+    args = parser.parse_args()
+
+    cache = import_package_module("pipeline.result_cache").get_result_cache()
+    if cache is None:
+        raise SystemExit("Pipeline result cache is disabled (PIPELINE_CACHE=none)")
+
+    if args.clear:
+        print(f"Deleted {cache.invalidate()} result(s)")
+    elif args.purge_stale:
+        print(f"Deleted {cache.purge_stale()} stale result(s)")
+    for work_order_id in args.invalidate:
+        print(f"{work_order_id}: deleted {cache.invalidate(work_order_id)} result(s)")
+    print(json.dumps(cache.stats(), indent=2))
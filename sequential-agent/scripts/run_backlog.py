@@ -0,0 +1,69 @@
+"""Script to run the permit pipeline over a backlog of work orders (e.g. overnight pre-permitting).
+
+Results are appended to a JSON Lines file, one record per work order; re-running
+with the same output resumes where the previous run stopped.
+"""
+
+import argparse
+import json
+
+from _package import import_package_module
+
+
+def read_work_order_ids(value: str):
+    """Parse --work-orders: a comma-separated list, or @path to a file with one ID per line."""
+    if value.startswith("@"):
+        with open(value[1:]) as f:
+            return [line.strip() for line in f if line.strip()]
+    return [wo_id.strip() for wo_id in value.split(",") if wo_id.strip()]
+
+
+def parse_reservation(value: str):
+    """Parse --reserve CLASS=N."""
+    priority_class, _, count = value.partition("=")
+    if not count.isdigit():
+        raise argparse.ArgumentTypeError(f"Expected CLASS=N, got {value!r}")
+    return priority_class.strip().lower(), int(count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--work-orders", default=None,
+                        help="Comma-separated work order IDs, or @file with one per line (default: all)")
+    parser.add_argument("--output", default="backlog_results.jsonl", help="JSON Lines results file / checkpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Work orders in flight at once")
+    parser.add_argument("--timeout", type=float, default=None, help="Per work order timeout in seconds")
+    parser.add_argument("--no-resume", action="store_true", help="Start over instead of skipping completed work orders")
+    parser.add_argument("--reserve", type=parse_reservation, action="append", default=[], metavar="CLASS=N",
+                        help="Keep N slots free for a priority class, e.g. emergency=2 (repeatable)")
+    parser.add_argument("--aging-seconds", type=float, default=300.0,
+                        help="Waiting time that promotes a work order by one priority class (0 = no aging)")
+    parser.add_argument("--metrics-file", default=None,
+                        help="Write Prometheus metrics (agent/LLM/tool latency, tokens, fallbacks) here when done")
+    parser.add_argument("--prefetch-weather", action="store_true", help="Warm the weather cache for the backlog first")
+    args = parser.parse_args()
+
+    workorders = import_package_module("tools.workorders")
+    ids = read_work_order_ids(args.work_orders) if args.work_orders else workorders.list_workorder_ids()
+
+    if args.prefetch_weather:
+        report = import_package_module("tools.weather").prefetch_weather(ids)
+        print(f"Weather prefetch: {report['covered']}/{report['workOrders']} work orders covered in {report['elapsedSeconds']}s")
+
+    batch = import_package_module("pipeline.batch")
+    root_agent = import_package_module("agent").root_agent
+
+    print(f"Running {len(ids)} work orders with concurrency {args.concurrency} -> {args.output}")
+    summary = batch.run_backlog(
+        root_agent,
+        ids,
+        args.output,
+        concurrency=args.concurrency,
+        timeout_seconds=args.timeout,
+        resume=not args.no_resume,
+        reservations=dict(args.reserve),
+        aging_seconds=args.aging_seconds,
+    )
+    print(json.dumps(summary, indent=2))
+    if args.metrics_file:
+        import_package_module("observability.metrics").write_prometheus(args.metrics_file)
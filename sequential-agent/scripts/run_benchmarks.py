@@ -0,0 +1,97 @@
+"""Script to benchmark the tools and the full pipeline offline.
+
+Gemini, the Weather API and Vertex AI RAG are replaced by deterministic local
+stand-ins with configurable latency; work orders and the RAG corpus are
+synthetic. Results are written as JSON; with --baseline, the run fails (exit
+code 1) when a latency grows, or a throughput drops, by more than --tolerance.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+
+from _package import import_package_module
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--work-orders", type=int, default=1000, help="Synthetic work orders to generate")
+    parser.add_argument("--incidents", type=int, default=2000, help="Synthetic incidents in the RAG corpus")
+    parser.add_argument("--permits", type=int, default=2000, help="Synthetic historical permits in the RAG corpus")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data, arguments and jitter")
+    parser.add_argument("--iterations", type=int, default=1000, help="Timed calls per tool")
+    parser.add_argument("--pipeline-runs", type=int, default=50, help="Work orders through root_agent (0 = skip)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Pipeline work orders in flight at once")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Injected latency per LLM call")
+    parser.add_argument("--llm-jitter-ms", type=float, default=0.0, help="Extra seeded random latency per LLM call")
+    parser.add_argument("--weather-latency-ms", type=float, default=0.0, help="Injected latency per Weather API call")
+    parser.add_argument("--rag-latency-ms", type=float, default=0.0, help="Injected latency per RAG retrieval")
+    parser.add_argument("--with-caches", action="store_true", help="Keep RAG/weather/pipeline result caches on")
+    parser.add_argument("--only", choices=("tools", "pipeline"), action="append", help="Run only these benchmarks")
+    parser.add_argument("--assets-dir", default=None, help="Where to write the synthetic assets (default: temp dir)")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    synthetic = import_package_module("benchmarks.synthetic")
+    standins = import_package_module("benchmarks.standins")
+    harness = import_package_module("benchmarks.harness")
+
+    assets_dir = args.assets_dir or tempfile.mkdtemp(prefix="permitflow_assets_")
+    started = time.perf_counter()
+    counts = synthetic.write_assets(assets_dir, args.work_orders, args.incidents, args.permits, seed=args.seed)
+    generate_seconds = time.perf_counter() - started
+    print(f"Generated {counts} in {generate_seconds:.1f}s -> {assets_dir}")
+
+    weather_stand_in = standins.WeatherStandIn(args.weather_latency_ms / 1000).start()
+    harness.configure_environment(assets_dir, weather_stand_in.url, caches=args.with_caches)
+    try:
+        results = harness.run_benchmarks(
+            iterations=args.iterations,
+            pipeline_runs=args.pipeline_runs,
+            concurrency=args.concurrency,
+            llm_latency_seconds=args.llm_latency_ms / 1000,
+            llm_jitter_seconds=args.llm_jitter_ms / 1000,
+            rag_latency_seconds=args.rag_latency_ms / 1000,
+            seed=args.seed,
+            only=args.only,
+        )
+    finally:
+        weather_stand_in.stop()
+
+    results["meta"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": harness.environment_info(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "records": counts,
+        "generateSeconds": round(generate_seconds, 2),
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = harness.compare(results, json.load(f), args.tolerance)
+        results["regressions"] = regressions
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, stats in results.get("tools", {}).items():
+        print(f"{name:22s} p50 {stats['p50Ms']:9.3f} ms  p95 {stats['p95Ms']:9.3f} ms  {stats['opsPerSecond']} ops/s")
+    if "pipeline" in results:
+        pipeline = results["pipeline"]
+        print(
+            f"{'pipeline':22s} p50 {pipeline['p50Ms']} ms  p95 {pipeline['p95Ms']} ms  "
+            f"{pipeline['throughputPerMinute']}/min ({pipeline['succeeded']} ok, {pipeline['failed']} failed)"
+        )
+    print(f"Results written to {args.output}")
+
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['benchmark']}.{regression['metric']}: "
+            f"{regression['baseline']} -> {regression['current']} ({regression['change']:+.0%})"
+        )
+    sys.exit(1 if regressions else 0)
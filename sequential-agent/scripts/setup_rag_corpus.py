@@ -1,171 +1,172 @@
-"""Script to set up Vertex AI RAG Corpus with incidents and historical permits data."""
+"""Script to ingest incidents and historical permits into the RAG corpus (Vertex AI RAG or the local index).
 
-import json
+Ingestion is incremental: documents are content-hashed and diffed against a
+persisted manifest, so only new, changed and removed documents are sent.
+"""
+
+import argparse
 import os
-from pathlib import Path
-from google.cloud import aiplatform
-from google.cloud.aiplatform import RagCorpus, RagEngine
-
-
-def load_rag_data():
-    """Load incidents and historical permits data from JSON files."""
-    assets_path = os.getenv("ASSETS_PATH", "/app/assets")
-    if not os.path.exists(assets_path):
-        current_dir = Path(__file__).parent.parent
-        assets_path = current_dir / "assets"
-    
-    # Load incidents
-    incidents_file = Path(assets_path) / "rag_data" / "incidents.json"
-    with open(incidents_file, 'r') as f:
-        incidents_data = json.load(f)
-    
-    # Load historical permits
-    permits_file = Path(assets_path) / "rag_data" / "historical_permits.json"
-    with open(permits_file, 'r') as f:
-        permits_data = json.load(f)
-    
-    return incidents_data["incidents"], permits_data["historicalPermits"]
-
-
-def create_rag_documents(incidents, permits):
+import sys
+
+from _package import import_package_module
+
+# Document building lives in the package so the local index can share it
+_rag_corpus = import_package_module("tools.rag_corpus")
+load_rag_data = _rag_corpus.load_rag_data
+create_rag_documents = _rag_corpus.create_rag_documents
+rag_ingest = import_package_module("tools.rag_ingest")
+settings = import_package_module("config.settings")
+
+
+def iter_chunked_documents(chunk_chars: int = rag_ingest.DEFAULT_CHUNK_CHARS, incidents_path: str = None, permits_path: str = None):
+    """Yield RAG documents one at a time, streamed from the exports, with long descriptions split into chunks."""
+    incidents, permits = load_rag_data(incidents_path, permits_path)
+    for document in create_rag_documents(incidents, permits):
+        yield from rag_ingest.chunk_document(document, max_chars=chunk_chars)
+
+
+def get_or_create_corpus(project_id: str, location: str = "us-central1") -> str:
     """
-    Convert incidents and permits into RAG document format.
-    
+    Resolve the Vertex AI RAG corpus, creating it only when RAG_CORPUS is not set.
+
+    Args:
+        project_id: GCP Project ID
+        location: GCP Region
+
     Returns:
-        List of documents formatted for RAG ingestion
+        Corpus resource name
     """
-    documents = []
-    
-    # Process incidents
-    for incident in incidents:
-        # Create document text with metadata
-        doc_text = f"""
-Title: {incident.get('title', '')}
-Site: {incident.get('site', '')}
-Area: {incident.get('area', '')}
-Date: {incident.get('date', '')}
-Severity: {incident.get('severity', '')}
-
-Summary: {incident.get('summary', '')}
-
-Description: {incident.get('description', '')}
-
-Hazards: {', '.join(incident.get('hazards', []))}
-Root Cause: {incident.get('rootCause', '')}
-Lessons Learned: {incident.get('lessonsLearned', '')}
-"""
-        documents.append({
-            "text": doc_text.strip(),
-            "metadata": {
-                "namespace": "incidents",
-                "id": incident.get("id"),
-                "site": incident.get("site"),
-                "area": incident.get("area"),
-                "date": incident.get("date"),
-                "severity": incident.get("severity"),
-                "tags": ",".join(incident.get("tags", []))
-            }
-        })
-    
-    # Process historical permits
-    for permit in permits:
-        doc_text = f"""
-Title: {permit.get('title', '')}
-Site: {permit.get('site', '')}
-Area: {permit.get('area', '')}
-Permit Type: {permit.get('permitType', '')}
-Date: {permit.get('date', '')}
-Status: {permit.get('status', '')}
-
-Summary: {permit.get('summary', '')}
-
-Description: {permit.get('description', '')}
-
-Hazards: {', '.join(permit.get('hazards', []))}
-Controls: {', '.join(permit.get('controls', []))}
-PPE: {', '.join(permit.get('ppe', []))}
-Sign-off Roles: {', '.join(permit.get('signOffRoles', []))}
-Validity Hours: {permit.get('validityHours', '')}
-Outcome: {permit.get('outcome', '')}
-"""
-        documents.append({
-            "text": doc_text.strip(),
-            "metadata": {
-                "namespace": "historical_permits",
-                "id": permit.get("id"),
-                "site": permit.get("site"),
-                "area": permit.get("area"),
-                "permitType": permit.get("permitType"),
-                "date": permit.get("date"),
-                "status": permit.get("status")
-            }
-        })
-    
-    return documents
-
-
-def setup_rag_corpus(project_id: str, location: str = "us-central1"):
+    import vertexai
+    from vertexai.preview import rag
+
+    vertexai.init(project=project_id, location=location)
+
+    corpus = settings.RAG_CORPUS
+    if corpus:
+        if not corpus.startswith("projects/"):
+            corpus = f"projects/{project_id}/locations/{location}/ragCorpora/{corpus}"
+        return corpus
+
+    corpus_display_name = "permitflowai-corpus"
+    print(f"RAG_CORPUS not set; creating RAG Corpus: {corpus_display_name}...")
+    rag_corpus = rag.create_corpus(
+        display_name=corpus_display_name,
+        description="RAG corpus for PermitFlowAI with incidents and historical permits organized by site"
+    )
+    print(f"Created RAG Corpus: {rag_corpus.name} (set RAG_CORPUS to reuse it)")
+    return rag_corpus.name
+
+
+def setup_rag_corpus(
+    project_id: str = None,
+    location: str = "us-central1",
+    sink: str = "vertex",
+    index_path: str = None,
+    manifest_path: str = None,
+    batch_size: int = 100,
+    workers: int = 4,
+    retries: int = 3,
+    chunk_chars: int = rag_ingest.DEFAULT_CHUNK_CHARS,
+    prune: bool = True,
+    dry_run: bool = False,
+    incidents_path: str = None,
+    permits_path: str = None
+):
     """
-    Set up Vertex AI RAG Corpus and ingest documents.
-    
+    Ingest documents into the RAG corpus, sending only what changed since the last run.
+
     Args:
-        project_id: GCP Project ID
+        project_id: GCP Project ID (Vertex sink)
         location: GCP Region (default: us-central1)
+        sink: "vertex" (Vertex AI RAG corpus) or "local" (local RAG index)
+        index_path: Local index path prefix (local sink)
+        manifest_path: Manifest path (defaults per sink, see RAG_MANIFEST_PATH)
+        batch_size: Documents per batch
+        workers: Parallel batches (Vertex sink)
+        retries: Retries per batch
+        chunk_chars: Maximum document chunk length
+        prune: Delete documents no longer in the data
+        dry_run: Only report what would change
+        incidents_path: Incidents export (.json or .jsonl; default: assets/rag_data)
+        permits_path: Historical permits export (.json or .jsonl; default: assets/rag_data)
+
+    Returns:
+        Ingestion stats
     """
-    # Initialize Vertex AI
-    aiplatform.init(project=project_id, location=location)
-    
-    # Load data
-    print("Loading RAG data...")
-    incidents, permits = load_rag_data()
-    print(f"Loaded {len(incidents)} incidents and {len(permits)} historical permits")
-    
-    # Create documents
-    print("Creating RAG documents...")
-    documents = create_rag_documents(incidents, permits)
-    print(f"Created {len(documents)} documents")
-    
-    # Create RAG Corpus
-    corpus_display_name = "permitflowai-corpus"
-    print(f"Creating RAG Corpus: {corpus_display_name}...")
-    
-    try:
-        # Create corpus
-        rag_corpus = RagCorpus.create(
-            display_name=corpus_display_name,
-            description="RAG corpus for PermitFlowAI with incidents and historical permits organized by site"
+    if sink == "local":
+        index_path = index_path or settings.RAG_INDEX_PATH or "rag_index/permitflowai"
+        target = os.path.abspath(index_path)
+        manifest_path = manifest_path or settings.RAG_MANIFEST_PATH or f"{index_path}.manifest.json"
+        make_sink = lambda: rag_ingest.LocalIndexSink(
+            index_path, index_type=settings.RAG_INDEX_TYPE, dim=settings.RAG_EMBEDDING_DIM
         )
-        print(f"Created RAG Corpus: {rag_corpus.resource_name}")
-        
-        # Import documents
-        print("Importing documents into RAG Corpus...")
-        # Note: In production, you would use the import_files or import_documents method
-        # This is a simplified example - actual implementation depends on Vertex AI RAG API
-        
-        print("RAG Corpus setup complete!")
-        print(f"Corpus Resource Name: {rag_corpus.resource_name}")
-        
-        return rag_corpus
-        
-    except Exception as e:
-        print(f"Error setting up RAG Corpus: {str(e)}")
-        print("\nFor manual setup:")
-        print("1. Go to Vertex AI RAG in Google Cloud Console")
-        print("2. Create a new RAG Corpus")
-        print("3. Import the documents from assets/rag_data/")
-        print("4. Set up namespaces: 'incidents' and 'historical_permits'")
-        raise
+        workers = 1  # Single in-process index; parallelism would only contend on its lock
+    else:
+        target = get_or_create_corpus(project_id, location)
+        manifest_path = manifest_path or settings.RAG_MANIFEST_PATH or "rag_manifest.json"
+        make_sink = lambda: rag_ingest.VertexRagSink(target)
+
+    manifest = rag_ingest.Manifest(manifest_path, target)
+    print(f"Ingesting into {target} (manifest: {manifest_path}, {len(manifest.entries)} known documents)")
+
+    stats = rag_ingest.ingest(
+        iter_chunked_documents(chunk_chars, incidents_path, permits_path),
+        None if dry_run else make_sink(),
+        manifest,
+        batch_size=batch_size,
+        workers=workers,
+        retries=retries,
+        prune=prune,
+        dry_run=dry_run,
+    )
+
+    print(
+        f"Upserted {stats['upserted']}/{stats['pendingUpserts']}, deleted {stats['deleted']}/{stats['pendingDeletes']}, "
+        f"unchanged {stats['unchanged']} in {stats['elapsedSeconds']}s"
+    )
+    for error in stats["errors"]:
+        print(f"Batch failed: {error}")
+    if sink == "local" and not dry_run:
+        print(f"Set RAG_INDEX_PATH={index_path} and VECTOR_STORE_TYPE=local to use it")
+    return stats
 
 
 if __name__ == "__main__":
-    import sys
-    
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sink", choices=["vertex", "local"],
+                        default="local" if settings.VECTOR_STORE_TYPE == "local" else "vertex")
+    parser.add_argument("--index-path", default=None, help="Local index path prefix (default: RAG_INDEX_PATH)")
+    parser.add_argument("--manifest", default=None, help="Manifest path (default: RAG_MANIFEST_PATH)")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--chunk-chars", type=int, default=rag_ingest.DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--no-prune", action="store_true", help="Keep documents no longer in the data")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    parser.add_argument("--incidents", default=None, help="Incidents export (.json or .jsonl)")
+    parser.add_argument("--permits", default=None, help="Historical permits export (.json or .jsonl)")
+    args = parser.parse_args()
+
     project_id = os.getenv("GCP_PROJECT_ID")
-    if not project_id:
+    if args.sink == "vertex" and not project_id:
         print("Error: GCP_PROJECT_ID environment variable not set")
         sys.exit(1)
-    
+
     location = os.getenv("GCP_REGION", "us-central1")
-    
-    setup_rag_corpus(project_id, location)
 
+    stats = setup_rag_corpus(
+        project_id,
+        location,
+        sink=args.sink,
+        index_path=args.index_path,
+        manifest_path=args.manifest,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        retries=args.retries,
+        chunk_chars=args.chunk_chars,
+        prune=not args.no_prune,
+        dry_run=args.dry_run,
+        incidents_path=args.incidents,
+        permits_path=args.permits,
+    )
+    sys.exit(1 if stats["failedBatches"] else 0)
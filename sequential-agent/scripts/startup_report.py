@@ -0,0 +1,147 @@
+"""Script to report agent startup cost: import time per module (python -X importtime) and root agent build time.
+
+Each measurement runs in a fresh interpreter, so nothing is already imported.
+Warm-up is disabled in the measured process; with STARTUP_MODE=lazy the
+"import" time is what a server pays before it can bind its port.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from _package import PACKAGE_DIR
+
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {scripts_dir!r})
+from _package import import_package_module
+started = time.perf_counter()
+agent = import_package_module("agent")
+imported = time.perf_counter()
+agent.root_agent
+built = time.perf_counter()
+print(json.dumps({{"importSeconds": imported - started, "buildSeconds": built - imported}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse python -X importtime output.
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        One dictionary per imported module: module, selfMs, cumulativeMs, depth
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "selfMs": int(self_us) / 1000,
+                "cumulativeMs": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2,
+            })
+    return modules
+
+
+def _group(module: str) -> str:
+    """Top-level distribution of a module (google.* split one level further)."""
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "google" and len(parts) > 1 else parts[0]
+
+
+def measure(mode: str, top: int) -> Dict[str, Any]:
+    """
+    Import the agent package in a fresh interpreter and summarize import cost.
+
+    Args:
+        mode: STARTUP_MODE for the measured process ("eager" or "lazy")
+        top: Number of modules/groups to keep per ranking
+
+    Returns:
+        Dictionary with wall times, totals and the top modules by self and cumulative time
+    """
+    env = dict(os.environ, STARTUP_MODE=mode, STARTUP_WARMUP="false")
+    probe = _PROBE.format(scripts_dir=str(Path(__file__).resolve().parent))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True, text=True, env=env, cwd=str(PACKAGE_DIR),
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"Startup probe failed ({mode}):\n{tail[-2000:]}")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(proc.stderr)
+
+    groups: Dict[str, float] = {}
+    for m in modules:
+        groups[_group(m["module"])] = groups.get(_group(m["module"]), 0.0) + m["selfMs"]
+    prefix = f"{PACKAGE_DIR.name}."
+    package_modules = [m for m in modules if m["module"].startswith(prefix)]
+
+    return {
+        "mode": mode,
+        "importSeconds": round(timings["importSeconds"], 4),
+        "buildSeconds": round(timings["buildSeconds"], 4),
+        "modules": len(modules),
+        "importMs": round(sum(m["selfMs"] for m in modules), 1),
+        "packageImportMs": round(sum(m["selfMs"] for m in package_modules), 1),
+        "topSelf": sorted(modules, key=lambda m: m["selfMs"], reverse=True)[:top],
+        "topCumulative": sorted(package_modules, key=lambda m: m["cumulativeMs"], reverse=True)[:top],
+        "groups": [
+            {"group": name, "selfMs": round(ms, 1)}
+            for name, ms in sorted(groups.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print one measure() result as text tables."""
+    print(f"== STARTUP_MODE={report['mode']} ==")
+    print(f"import agent: {report['importSeconds'] * 1000:.0f} ms, root_agent build: {report['buildSeconds'] * 1000:.0f} ms")
+    print(f"{report['modules']} modules, {report['importMs']:.0f} ms import time ({report['packageImportMs']:.0f} ms in this package)")
+    print("\nBy distribution (self ms):")
+    for g in report["groups"]:
+        print(f"  {g['selfMs']:9.1f}  {g['group']}")
+    print("\nSlowest modules (self ms):")
+    for m in report["topSelf"]:
+        print(f"  {m['selfMs']:9.1f}  {m['module']}")
+    print("\nPackage modules (cumulative ms, including what they import):")
+    for m in report["topCumulative"]:
+        print(f"  {m['cumulativeMs']:9.1f}  {m['module']}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("eager", "lazy", "both"), default="both", help="STARTUP_MODE to measure")
+    parser.add_argument("--top", type=int, default=15, help="Modules per ranking")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    modes = ("eager", "lazy") if args.mode == "both" else (args.mode,)
+    reports = [measure(mode, args.top) for mode in modes]
+    for report in reports:
+        print_report(report)
+    if len(reports) == 2:
+        eager, lazy = reports
+        print(
+            f"lazy vs eager: import {lazy['importSeconds'] * 1000:.0f} ms vs {eager['importSeconds'] * 1000:.0f} ms; "
+            f"first root_agent access pays {lazy['buildSeconds'] * 1000:.0f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"reports": reports}, f, indent=2)
@@ -0,0 +1,122 @@
+"""Startup helpers: background warm-up of deferred imports and the lazily built root agent."""
+
+from typing import Any, Callable, Dict, List, Optional
+import importlib
+import logging
+import threading
+import time
+
+from .config.settings import (
+    VECTOR_STORE_TYPE, RAG_LOCAL_FALLBACK, PDF_STORAGE, STARTUP_WARMUP_DELAY_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+_warmup_report: Dict[str, Any] = {}
+
+
+def deferred_imports() -> List[str]:
+    """
+    Modules imported on first use rather than at startup, for the configured backends.
+
+    Returns:
+        Module names, in warm-up order
+    """
+    modules = []
+    if VECTOR_STORE_TYPE != "local":
+        modules.append("vertexai.preview.rag")
+    if VECTOR_STORE_TYPE == "local" or RAG_LOCAL_FALLBACK:
+        modules.append(f"{__package__}.tools.rag_index")
+    if PDF_STORAGE == "gcs":
+        modules.append("google.cloud.storage")
+    return modules
+
+
+def warm_up(build: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """
+    Pay the deferred startup costs ahead of the first request.
+
+    Imports deferred_imports() (missing optional SDKs are skipped), builds the
+    root agent and loads the local RAG index. Failures are logged, never
+    raised: the first request then pays the cost as it would without warm-up.
+
+    Args:
+        build: Builds the root agent (e.g., agent.get_root_agent)
+
+    Returns:
+        Dictionary with per-step seconds ("imports", "rootAgent", "localIndex"),
+        unavailable modules and total seconds
+    """
+    started = time.perf_counter()
+    report: Dict[str, Any] = {"imports": {}, "unavailable": []}
+    for name in deferred_imports():
+        step = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            report["unavailable"].append(name)
+            continue
+        report["imports"][name] = round(time.perf_counter() - step, 4)
+
+    steps = []
+    if build is not None:
+        steps.append(("rootAgent", build))
+    if VECTOR_STORE_TYPE == "local" or RAG_LOCAL_FALLBACK:
+        steps.append(("localIndex", lambda: importlib.import_module(f"{__package__}.tools.rag_index").get_local_index()))
+    for key, step_fn in steps:
+        step = time.perf_counter()
+        try:
+            step_fn()
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", key, e)
+            continue
+        report[key] = round(time.perf_counter() - step, 4)
+
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    return report
+
+
+def start_warmup(
+    build: Optional[Callable[[], Any]] = None,
+    delay: float = STARTUP_WARMUP_DELAY_SECONDS
+) -> threading.Thread:
+    """
+    Run warm_up() once per process in a daemon thread.
+
+    The delay lets the server finish binding its port first, so warm-up
+    competes with neither the import that started it nor readiness checks.
+
+    Args:
+        build: Builds the root agent (passed to warm_up)
+        delay: Seconds to wait before warming up
+
+    Returns:
+        The warm-up thread (the running one if already started)
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None:
+            return _warmup_thread
+
+        def run():
+            if delay > 0:
+                time.sleep(delay)
+            report = warm_up(build)
+            _warmup_report.update(report)
+            logger.info("Startup warm-up finished in %.2fs: %s", report["seconds"], report)
+
+        _warmup_thread = threading.Thread(target=run, name="permitflow-warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
+
+
+def warmup_report() -> Dict[str, Any]:
+    """
+    Get the result of the background warm-up.
+
+    Returns:
+        warm_up() report, or an empty dictionary while it has not finished
+    """
+    return dict(_warmup_report)
@@ -1,30 +1,37 @@
 """A1 Hazard Identification Agent using Gemini 2.5 Pro."""
 
+from typing import Optional, Union
+
 from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm
 from ..schemas.hazard_schema import HazardIdentificationOutput
 from ..tools.workorders import get_workorder_by_id
 from ..tools.rag import search_rag
 from ..tools.weather import get_weather_data
 
 
-def create_hazard_agent() -> LlmAgent:
+def create_hazard_agent(model: Optional[Union[str, BaseLlm]] = None) -> LlmAgent:
     """
     Create A1 Hazard Identification Agent.
     
     Goal: Derive hazards for the work order using RAG + conditions.
     LLM: Gemini 2.5 Pro, temperature=0
     Tools: workorders.getById, rag.search, weather.snapshot
+    
+    Args:
+        model: Model name or BaseLlm instance (default: the Gemini model above)
     """
     # Create Vertex AI RAG Engine tool
     rag_tool = search_rag()
     
     agent = LlmAgent(
         name="hazard_identification_agent",
-        model='gemini-2.5-pro',
-        instruction=f"""You are a hazard identification agent. Your task is to:
-1. Retrieve the work order details using workorders.getById
+        model=model or 'gemini-2.5-pro',
+        instruction="""You are a hazard identification agent. Your task is to:
+1. Retrieve the work order details using workorders.getById (skip if provided below)
 2. Search the Vertex AI RAG knowledge base for relevant safety information from incidents and historical permits
-3. Optionally check weather conditions if relevant
+   (evidence for the work order is provided below; search again only for anything it does not cover)
+3. Optionally check weather conditions if relevant (skip if a snapshot is provided below)
 4. Identify all potential hazards associated with the work order
 5. For each hazard, provide:
    - name: Clear hazard name/type
@@ -33,7 +40,16 @@ def create_hazard_agent() -> LlmAgent:
    - suggestedControls: Recommended control measures
 6. Include evidence from RAG searches that support your hazard identification
 
-Return your findings in the structured format with hazards array and evidence array.""",
+Return your findings in the structured format with hazards array and evidence array.
+
+Work order:
+{work_order?}
+
+Weather snapshot:
+{weather_snapshot?}
+
+RAG evidence (query, namespace, results):
+{rag_context?}""",
         description="""Identifies hazards for work orders using RAG knowledge base, historical incidents, and work order details.""",
         tools=[get_workorder_by_id, rag_tool, get_weather_data],
         output_schema=HazardIdentificationOutput,
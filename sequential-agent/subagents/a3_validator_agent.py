@@ -1,32 +1,55 @@
 """A3 Permit Validator Agent using Gemini 2.5 Pro."""
 
+from typing import Optional, Union
+
 from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm
 from ..schemas.validation_schema import PermitValidationOutput
 from ..tools.rules import evaluate
 from ..tools.rag import search_rag
 from ..tools.workorders import get_workorder_by_id
 
 
-def create_validator_agent() -> LlmAgent:
+def create_validator_agent(model: Optional[Union[str, BaseLlm]] = None, index: Optional[int] = None) -> LlmAgent:
     """
     Create A3 Permit Validator Agent.
     
     Goal: Ensure each permit meets policy + standards; produce pass/fail & findings.
     LLM: Gemini 2.5 Pro, temperature=0
     Tools: rules.evaluate, rag.search, workorders.getById
+    
+    Args:
+        model: Model name or BaseLlm instance (default: the Gemini model above)
+        index: Fan-out slot; the validator then reads its permit from state
+            "permit_under_validation_<index>" and writes "permit_validation_output_<index>"
     """
     # Create Vertex AI RAG Engine tool
     rag_tool = search_rag()
+    suffix = "" if index is None else f"_{index}"
+    if index is None:
+        scope = "1. For each permit that was generated by the permit generator agent:"
+        feedback = "4. Provide clear, actionable feedback for each permit"
+        permit_note = ""
+    else:
+        # Fan-out slot: only the injected permit is in scope, not the rest of permit_generator_output
+        scope = ("1. For the one permit given under \"The permit to validate\" below "
+                 "(do not validate or report on any other permit):")
+        feedback = "4. Provide clear, actionable feedback for this permit"
+        permit_note = f"""
+
+The permit to validate:
+{{permit_under_validation{suffix}}}"""
     
     agent = LlmAgent(
-        model='gemini-2.5-pro',
-        name='permit_validator_agent',
+        model=model or 'gemini-2.5-pro',
+        name=f'permit_validator_agent{suffix}',
         description="Validates permits against compliance rules and standards, producing detailed validation reports.",
-        instruction="""You are a permit validator agent. Your task is to:
-1. For each permit that was generated by the permit generator agent:
+        instruction=f"""You are a permit validator agent. Your task is to:
+{scope}
    - Use rules.evaluate to run deterministic compliance checks
-   - Retrieve work order details using workorders.getById for context
+   - Retrieve work order details using workorders.getById for context (skip if provided below)
    - Search Vertex AI RAG knowledge base for relevant validation evidence from incidents and historical permits
+     (evidence for the work order is provided below; search again only for anything it does not cover)
    - Review the permit against policy requirements
 2. Determine validation status:
    - Pass: All required controls, signoffs, and validity limits are met
@@ -37,12 +60,18 @@ def create_validator_agent() -> LlmAgent:
    - warnings: List of warnings (missing recommended items, best practice gaps)
    - recommendations: Suggestions for improvement
    - checks: Detailed check results from rules.evaluate plus your analysis
-4. Provide clear, actionable feedback for each permit
+{feedback}
+
+Return validation results in the structured format. Note: You validate ONE permit at a time.
+
+Work order:
+{{work_order?}}
 
-Return validation results in the structured format. Note: You validate ONE permit at a time.""",
+RAG evidence (query, namespace, results):
+{{rag_context?}}""" + permit_note,
         tools=[evaluate, rag_tool, get_workorder_by_id],
         output_schema=PermitValidationOutput,
-        output_key="permit_validation_output"
+        output_key=f"permit_validation_output{suffix}"
     )
     
     return agent
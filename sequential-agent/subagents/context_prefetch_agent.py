@@ -0,0 +1,143 @@
+"""Deterministic context prefetch ahead of A1: work order, weather and RAG evidence in one concurrent step."""
+
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from ..pipeline.result_cache import work_order_id_from_content
+from ..tools.workorders import get_workorder_by_id
+from ..tools.weather import get_weather_data
+from ..tools.rag import rag_search
+from ..tools.memo import memo_key
+from ..config.settings import CONTEXT_PREFETCH_TOP_K
+
+logger = logging.getLogger(__name__)
+
+
+# (namespace, query template) pairs filled from the work order; mirrors the searches A1 makes itself
+RAG_QUERY_TEMPLATES: Tuple[Tuple[Optional[str], str], ...] = (
+    ("incidents", "{description}"),
+    ("incidents", "{equipment} {location}"),
+    ("historical_permits", "{description}"),
+)
+# Words of the description used in a query (long descriptions dilute retrieval)
+_MAX_QUERY_WORDS = 40
+
+
+def rag_queries(wo: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the templated RAG queries for a work order.
+
+    Args:
+        wo: Work order data
+
+    Returns:
+        List of {"query", "namespace"} dictionaries (empty or duplicate queries dropped)
+    """
+    fields = {
+        "description": " ".join(str(wo.get("description") or "").split()[:_MAX_QUERY_WORDS]),
+        "equipment": wo.get("equipment") or "",
+        "location": wo.get("location") or "",
+    }
+    queries, seen = [], set()
+    for namespace, template in RAG_QUERY_TEMPLATES:
+        query = " ".join(template.format(**fields).split())
+        if query and (namespace, query) not in seen:
+            seen.add((namespace, query))
+            queries.append({"query": query, "namespace": namespace})
+    return queries
+
+
+async def prefetch_context(work_order_id: str, top_k: int = CONTEXT_PREFETCH_TOP_K) -> Dict[str, Any]:
+    """
+    Load the work order, then fetch weather and run the RAG queries concurrently.
+
+    The tools are blocking, so each runs in a worker thread. A failed fetch is
+    left out of the result (and logged) so the agents fall back to calling
+    the tool themselves.
+
+    Args:
+        work_order_id: Work order ID
+        top_k: Results per RAG query
+
+    Returns:
+        State delta with work_order, weather_snapshot, rag_context and the work order's tool memo entry
+    """
+    wo = await asyncio.to_thread(get_workorder_by_id, work_order_id)
+    # Also seeds the tool memo, so an agent that still calls get_workorder_by_id gets it for free
+    state: Dict[str, Any] = {"work_order": wo, memo_key("get_workorder_by_id", {"id": work_order_id}): wo}
+
+    async def weather() -> Optional[Dict[str, Any]]:
+        if wo.get("latitude") is None or wo.get("longitude") is None:
+            return None
+        return await asyncio.to_thread(get_weather_data, wo["latitude"], wo["longitude"])
+
+    queries = rag_queries(wo)
+    results = await asyncio.gather(
+        weather(),
+        *[asyncio.to_thread(rag_search, q["query"], q["namespace"], top_k) for q in queries],
+        return_exceptions=True,
+    )
+
+    snapshot, searches = results[0], results[1:]
+    if isinstance(snapshot, Exception):
+        logger.warning("Weather prefetch failed for %s: %s", work_order_id, snapshot)
+    elif snapshot is not None:
+        state["weather_snapshot"] = snapshot
+
+    context = []
+    for q, result in zip(queries, searches):
+        if isinstance(result, Exception):
+            logger.warning("RAG prefetch failed for %r: %s", q["query"], result)
+            continue
+        context.append({**q, "results": result.get("results", [])})
+    if context:
+        state["rag_context"] = context
+    return state
+
+
+class ContextPrefetchAgent(BaseAgent):
+    """
+    Writes the context every LLM stage needs to state before A1 runs.
+
+    The work order named in the user message is loaded, then its weather
+    snapshot and the templated RAG searches run concurrently. The results
+    go to state as "work_order", "weather_snapshot" and "rag_context", and
+    the agent instructions inject them with {key?} placeholders. Without
+    this stage, A1 spends one model round trip per tool call. If no work
+    order ID is found, nothing is written and the agents use their tools
+    as before.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(
+            name=name,
+            description="Loads the work order, weather and RAG evidence concurrently and writes them to state for the LLM stages.",
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        work_order_id = work_order_id_from_content(ctx.user_content)
+        if not work_order_id:
+            return
+        state_delta = await prefetch_context(work_order_id)
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+
+
+def create_context_prefetch_agent() -> ContextPrefetchAgent:
+    """
+    Create the context prefetch stage at the head of the pipeline.
+
+    Goal: Replace A1's serial tool-call turns with one concurrent, LLM-free fetch.
+    LLM: None
+    Tools: workorders.getById, weather.snapshot, rag.search
+    """
+    return ContextPrefetchAgent(name="context_prefetch_agent")
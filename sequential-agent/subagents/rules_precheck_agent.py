@@ -0,0 +1,164 @@
+"""Deterministic rules pre-check and auto-remediation ahead of the A3/A4 refinement loop."""
+
+from typing import Any, AsyncGenerator, Dict, List
+import json
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from ..schemas.validation_schema import CheckResult, PermitValidationOutput
+from ..tools.rules import evaluate, iter_unique_ids
+from ..tools.remediation import remediate
+from ..config.settings import RULES_FAST_PATH, AUTO_REMEDIATION
+
+
+def permits_from_state(value: Any) -> List[Dict[str, Any]]:
+    """
+    Extract the permits list from a permit_generator_output state value.
+
+    Args:
+        value: State value (dict from output_schema, or its JSON text)
+
+    Returns:
+        List of permit dictionaries (empty if missing or unparseable)
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    if not isinstance(value, dict):
+        return []
+    return [p for p in value.get("permits", []) if isinstance(p, dict)]
+
+
+def validation_keys(permits: List[Dict[str, Any]]) -> List[str]:
+    """
+    Key of each permit's entry in "permit_validations": its permit ID, made unique.
+
+    Permits without an ID, or repeating an earlier permit's ID, get
+    "<id>#<position>" (e.g., "UNKNOWN#2") so no validation overwrites another.
+
+    Args:
+        permits: Permits in permit_generator_output order
+
+    Returns:
+        One key per permit, in the same order
+    """
+    return [key for key, _ in iter_unique_ids(permits, missing="UNKNOWN")]
+
+
+def validation_from_evaluation(permit: Dict[str, Any], evaluation: Dict[str, Any]) -> PermitValidationOutput:
+    """
+    Build an A3-style validation result from a rules.evaluate result.
+
+    Args:
+        permit: Permit that was evaluated
+        evaluation: rules.evaluate output (errors, warnings, checks)
+
+    Returns:
+        PermitValidationOutput for the permit
+    """
+    if evaluation["errors"]:
+        status = "Fail"
+    elif evaluation["warnings"]:
+        status = "PassWithWarnings"
+    else:
+        status = "Pass"
+    return PermitValidationOutput(
+        permitId=permit.get("permitId", "UNKNOWN"),
+        validationStatus=status,
+        errors=evaluation["errors"],
+        warnings=evaluation["warnings"],
+        checks=[CheckResult(**check) for check in evaluation["checks"]],
+    )
+
+
+def _evaluate_all(permits: List[Dict[str, Any]]) -> Dict[str, PermitValidationOutput]:
+    """Run rules.evaluate on every permit, keyed by validation_keys()."""
+    return {
+        key: validation_from_evaluation(permit, evaluate(permit))
+        for key, permit in zip(validation_keys(permits), permits)
+    }
+
+
+class RulesPrecheckAgent(BaseAgent):
+    """
+    Runs rules.evaluate on every generated permit before the refinement loop.
+
+    Mechanical defects (validity over the maximum) are fixed deterministically
+    first; the updated permits and a diff of the fixes ("permit_remediations")
+    are written to state. If every permit passes as generated, with no errors
+    or warnings, the validation results are written to state
+    ("permit_validations", keyed by validation_keys()) and the LLM
+    validator/refiner loop is skipped. Otherwise, including whenever a fix was
+    applied, the loop runs on the remediated permits.
+    """
+
+    refinement_loop: BaseAgent
+
+    def __init__(self, name: str, refinement_loop: BaseAgent):
+        super().__init__(
+            name=name,
+            description="Runs deterministic compliance checks and fixes, and only enters the LLM refinement loop when permits still have findings.",
+            refinement_loop=refinement_loop,
+            sub_agents=[refinement_loop],
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        permit_output = ctx.session.state.get("permit_generator_output")
+        permits = permits_from_state(permit_output)
+        validations = _evaluate_all(permits)
+        state_delta: Dict[str, Any] = {}
+
+        if AUTO_REMEDIATION and any(v.validationStatus != "Pass" for v in validations.values()):
+            remediation = remediate({"permits": permits})
+            if remediation["changes"]:
+                permits = remediation["permitGeneratorOutput"]["permits"]
+                validations = _evaluate_all(permits)
+                state_delta["permit_generator_output"] = remediation["permitGeneratorOutput"]
+                state_delta["permit_remediations"] = remediation["changes"]
+
+        # A permit that only passes after automatic fixes is still validated by A3
+        remediated = bool(state_delta.get("permit_remediations"))
+        if RULES_FAST_PATH and permits and not remediated and all(v.validationStatus == "Pass" for v in validations.values()):
+            state_delta["permit_validations"] = {pid: v.model_dump() for pid, v in validations.items()}
+            state_delta["rules_fast_path"] = True
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                branch=ctx.branch,
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part(text=(
+                        f"All {len(permits)} permit(s) passed deterministic compliance checks; refinement loop skipped."
+                    ))],
+                ),
+                actions=EventActions(state_delta=state_delta),
+            )
+            return
+
+        state_delta["rules_fast_path"] = False
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta),
+        )
+        async for event in self.refinement_loop.run_async(ctx):
+            yield event
+
+
+def create_rules_precheck_agent(refinement_loop: BaseAgent) -> RulesPrecheckAgent:
+    """
+    Create the deterministic pre-check stage wrapping the A3/A4 refinement loop.
+
+    Goal: Fix mechanical defects and skip LLM validation/refinement when permits pass the rules as generated.
+    LLM: None
+    Tools: rules.evaluate, remediation.remediate
+    """
+    return RulesPrecheckAgent(name="rules_precheck_agent", refinement_loop=refinement_loop)
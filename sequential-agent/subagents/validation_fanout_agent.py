@@ -0,0 +1,194 @@
+"""A3 validation fan-out: one validator per generated permit, run concurrently."""
+
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+import asyncio
+import json
+import logging
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.models import BaseLlm
+from google.genai import types
+
+from ..schemas.validation_schema import PermitValidationOutput
+from ..tools.rules import evaluate
+from .a3_validator_agent import create_validator_agent
+from .rules_precheck_agent import permits_from_state, validation_from_evaluation, validation_keys
+from ..config.settings import VALIDATION_MAX_PARALLEL
+
+logger = logging.getLogger(__name__)
+
+
+def parse_validation(value: Any) -> Optional[PermitValidationOutput]:
+    """
+    Parse a validator's output_key state value.
+
+    Args:
+        value: State value (dict from output_schema, model, or its JSON text)
+
+    Returns:
+        PermitValidationOutput, or None if missing or unparseable
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if isinstance(value, PermitValidationOutput):
+        return value
+    if not isinstance(value, dict):
+        return None
+    try:
+        return PermitValidationOutput(**value)
+    except ValueError:
+        return None
+
+
+async def merge_runs(runs: List[AsyncGenerator[Event, None]]) -> AsyncGenerator[Event, None]:
+    """
+    Interleave the events of concurrently running agents.
+
+    Like ParallelAgent, each run waits until its event has been consumed (and
+    its state delta applied by the runner) before producing the next one.
+    The first failure cancels the other runs (and waits for them to finish)
+    and is re-raised.
+
+    Args:
+        runs: Event generators, one per agent run
+
+    Yields:
+        Events in the order they are produced
+    """
+    done = object()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def drive(run: AsyncGenerator[Event, None]) -> None:
+        error = None
+        try:
+            async for event in run:
+                consumed = asyncio.Event()
+                await queue.put((event, consumed))
+                await consumed.wait()
+        except Exception as e:
+            error = e
+        finally:
+            await run.aclose()
+            await queue.put((done, error))
+
+    tasks = [asyncio.create_task(drive(run)) for run in runs]
+    try:
+        finished = 0
+        while finished < len(tasks):
+            item, payload = await queue.get()
+            if item is done:
+                finished += 1
+                if payload is not None:
+                    raise payload
+                continue
+            yield item
+            payload.set()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        # Let cancelled runs unwind (close their generators) before returning
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ValidationFanOutAgent(BaseAgent):
+    """
+    Validates every permit in permit_generator_output with its own A3 validator, concurrently.
+
+    Validator i reads its permit from state "permit_under_validation_<i>" and
+    writes "permit_validation_output_<i>"; each permit position gets its own
+    branch, so conversations stay isolated between permits. Up to len(validators) permits run at once
+    (more run in waves), so wall-clock time follows the slowest permit rather
+    than the sum. The results are merged into "permit_validations", keyed by
+    permit ID (made unique by validation_keys()). A validator whose output cannot be parsed falls back to the
+    deterministic rules.evaluate result for its permit.
+    """
+
+    validators: List[BaseAgent]
+
+    def __init__(self, name: str, validators: List[BaseAgent]):
+        super().__init__(
+            name=name,
+            description="Validates each generated permit with its own validator, concurrently, and merges the results by permit ID.",
+            validators=validators,
+            sub_agents=validators,
+        )
+
+    def _branch_ctx(self, ctx: InvocationContext, validator: BaseAgent, position: int) -> InvocationContext:
+        """Invocation context on an isolated branch for one validator and permit position."""
+        branch_ctx = ctx.model_copy()
+        suffix = f"{self.name}.{validator.name}.permit_{position}"
+        branch_ctx.branch = f"{ctx.branch}.{suffix}" if ctx.branch else suffix
+        return branch_ctx
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        permits = permits_from_state(ctx.session.state.get("permit_generator_output"))
+        keys = validation_keys(permits)
+        validations: Dict[str, Dict[str, Any]] = {}
+        width = len(self.validators)
+
+        for start in range(0, len(permits), width):
+            wave = permits[start:start + width]
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                branch=ctx.branch,
+                actions=EventActions(state_delta={
+                    **{f"permit_under_validation_{i}": json.dumps(permit, indent=2) for i, permit in enumerate(wave)},
+                    **{f"permit_validation_output_{i}": None for i in range(len(wave))},
+                }),
+            )
+            runs = [
+                self.validators[i].run_async(self._branch_ctx(ctx, self.validators[i], start + i))
+                for i in range(len(wave))
+            ]
+            async for event in merge_runs(runs):
+                yield event
+
+            for i, permit in enumerate(wave):
+                permit_id = permit.get("permitId", "UNKNOWN")
+                validation = parse_validation(ctx.session.state.get(f"permit_validation_output_{i}"))
+                if validation is None:
+                    logger.warning("Validator %d returned no usable result for %s; using rules.evaluate", i, permit_id)
+                    validation = validation_from_evaluation(permit, evaluate(permit))
+                # The permit's own ID is authoritative over the one echoed back by the validator
+                validations[keys[start + i]] = validation.model_copy(update={"permitId": permit_id}).model_dump()
+
+        summary = ", ".join(f"{pid}: {v['validationStatus']}" for pid, v in validations.items()) or "no permits"
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model",
+                parts=[types.Part(text=f"Validated {len(validations)} permit(s) in parallel - {summary}.")],
+            ),
+            actions=EventActions(state_delta={"permit_validations": validations}),
+        )
+
+
+def create_validation_fanout_agent(
+    model: Optional[Union[str, BaseLlm]] = None,
+    max_parallel: int = VALIDATION_MAX_PARALLEL
+) -> ValidationFanOutAgent:
+    """
+    Create the A3 validation stage: one validator per permit, run concurrently.
+
+    Goal: Validate all permits in the time of the slowest one.
+    LLM: Gemini 2.5 Pro per permit (see create_validator_agent)
+    Tools: rules.evaluate, rag.search, workorders.getById
+
+    Args:
+        model: Model name or BaseLlm instance for the validators (default: the A3 model)
+        max_parallel: Validators (and so permits validated) at once
+
+    Returns:
+        ValidationFanOutAgent with max_parallel validators
+    """
+    validators: List[BaseAgent] = [create_validator_agent(model, index=i) for i in range(max(1, max_parallel))]
+    return ValidationFanOutAgent(name="permit_validation_fanout_agent", validators=validators)
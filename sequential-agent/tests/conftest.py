@@ -0,0 +1,18 @@
+"""Pytest setup: make the agent package importable (its directory name is not an identifier)."""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+if str(PACKAGE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(PACKAGE_DIR.parent))
+
+
+@pytest.fixture
+def package_module():
+    """Import a module of the agent package by its path inside the package (e.g., "tools.rules")."""
+    return lambda name: importlib.import_module(f"{PACKAGE_DIR.name}.{name}")
@@ -0,0 +1,79 @@
+"""Asset registry: derived objects are built once, outside the registry lock, one per name."""
+
+import threading
+import time
+
+
+def test_derive_builds_outside_the_registry_lock(package_module, tmp_path, monkeypatch):
+    assets = package_module("tools.assets")
+    monkeypatch.setenv("ASSETS_PATH", str(tmp_path))
+    (tmp_path / "slow.json").write_text('{"n": 1}')
+    (tmp_path / "other.json").write_text('{"n": 2}')
+    assets.clear()
+    snapshot = assets.get_snapshot("slow.json")
+    started, release, builds = threading.Event(), threading.Event(), []
+
+    def slow_build(data):
+        builds.append(data)
+        started.set()
+        release.wait(5)
+        return data["n"]
+
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(assets.derive(snapshot, "slow", slow_build))) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    assert started.wait(5)
+
+    # Other assets load while the build is running
+    begin = time.perf_counter()
+    assert assets.load_json("other.json") == {"n": 2}
+    assert time.perf_counter() - begin < 1
+
+    release.set()
+    for worker in workers:
+        worker.join(5)
+    assert results == [1, 1, 1] and len(builds) == 1
+    assets.clear()
+
+
+def test_derive_replaces_object_when_version_changes(package_module, tmp_path, monkeypatch):
+    assets = package_module("tools.assets")
+    monkeypatch.setenv("ASSETS_PATH", str(tmp_path))
+    (tmp_path / "data.json").write_text('{"n": 1}')
+    assets.clear()
+    snapshot = assets.get_snapshot("data.json")
+
+    assert assets.derive(snapshot, "index", lambda data: ("v1", data["n"]), version="v1") == ("v1", 1)
+    assert assets.derive(snapshot, "index", lambda data: ("v2", data["n"]), version="v2") == ("v2", 1)
+    assert list(snapshot.derived) == ["index"]
+    assets.clear()
+
+
+def test_assets_path_picks_up_a_directory_created_later(package_module, tmp_path, monkeypatch):
+    assets = package_module("tools.assets")
+    mounted = tmp_path / "mounted"
+    monkeypatch.setenv("ASSETS_PATH", str(mounted))
+    monkeypatch.setattr(assets, "ASSET_RELOAD_INTERVAL", 0.0)
+    assets.clear()
+
+    assert assets.assets_path() != mounted
+    mounted.mkdir()
+    assert assets.assets_path() == mounted
+    assets.clear()
+
+
+def test_missing_file_lookup_does_not_take_the_registry_lock(package_module, tmp_path, monkeypatch):
+    assets = package_module("tools.assets")
+    monkeypatch.setenv("ASSETS_PATH", str(tmp_path))
+    assets.clear()
+    held = threading.Lock()
+    monkeypatch.setattr(assets, "_lock", held)
+
+    with held:
+        result = []
+        worker = threading.Thread(target=lambda: result.append(assets.get_snapshot("missing.json")))
+        worker.start()
+        worker.join(2)
+        assert result == [None]
+    assets.clear()
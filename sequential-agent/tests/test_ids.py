@@ -0,0 +1,56 @@
+"""Permit ID sequences: Postgres leases release their connection."""
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+
+    def fetchone(self):
+        return (51,)
+
+
+class FakeConnection:
+    """psycopg2 semantics: leaving "with conn" commits but keeps the connection open."""
+
+    def __init__(self):
+        self.executed, self.committed, self.closed = [], False, False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.committed = True
+        return False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+def test_postgres_lease_closes_connection(package_module):
+    ids = package_module("tools.ids")
+    connections = []
+
+    class FakeDriver:
+        @staticmethod
+        def connect(dsn):
+            connections.append(FakeConnection())
+            return connections[-1]
+
+    sequence = ids.PostgresSequence.__new__(ids.PostgresSequence)
+    sequence._driver, sequence.dsn = FakeDriver, "postgresql://test"
+
+    assert sequence.lease("HW", 50) == 1
+    assert len(connections) == 1
+    assert connections[0].committed and connections[0].closed
@@ -0,0 +1,45 @@
+"""Streaming JSON reader: items split at any chunk boundary decode like json.load."""
+
+import json
+
+import pytest
+
+
+ITEMS = [
+    2.5, 1e3, -0.25e-2, 123456, 0, -7, 3.14159E+10,
+    "text", 'with "escapes" and , ] inside \\ too', "",
+    True, False, None,
+    {"workOrderId": "WO-1", "latitude": 29.7604, "tags": ["a", "b"]},
+    [1, [2.75, {"x": None}]],
+]
+
+
+@pytest.fixture
+def export_files(tmp_path):
+    array_path = tmp_path / "items.json"
+    array_path.write_text(json.dumps(ITEMS, indent=1))
+    keyed_path = tmp_path / "keyed.json"
+    keyed_path.write_text(json.dumps({"meta": {"count": len(ITEMS)}, "workOrders": ITEMS}))
+    compact_path = tmp_path / "compact.json"
+    compact_path.write_text(json.dumps(ITEMS, separators=(",", ":")))
+    return array_path, keyed_path, compact_path
+
+
+def test_every_chunk_size_decodes_like_json_load(package_module, export_files):
+    jsonstream = package_module("tools.jsonstream")
+    array_path, keyed_path, compact_path = export_files
+    expected = json.loads(array_path.read_text())
+
+    for chunk_size in range(1, len(compact_path.read_text()) + 2):
+        assert list(jsonstream.iter_json_array(str(array_path), chunk_size=chunk_size)) == expected, chunk_size
+        assert list(jsonstream.iter_json_array(str(compact_path), chunk_size=chunk_size)) == expected, chunk_size
+        assert list(jsonstream.iter_json_array(str(keyed_path), key="workOrders", chunk_size=chunk_size)) == expected, chunk_size
+
+
+def test_malformed_item_still_raises(package_module, tmp_path):
+    jsonstream = package_module("tools.jsonstream")
+    path = tmp_path / "bad.json"
+    path.write_text("[1, 2.5.3, 4]")
+
+    with pytest.raises(json.JSONDecodeError):
+        list(jsonstream.iter_json_array(str(path), chunk_size=2))
@@ -0,0 +1,45 @@
+"""Agent callbacks: spans nest (agent -> tool) and runs that never finish do not accumulate."""
+
+import json
+from types import SimpleNamespace
+
+
+def _context(agent_name, invocation_id="inv-1"):
+    return SimpleNamespace(agent_name=agent_name, invocation_id=invocation_id, branch=None)
+
+
+def test_tool_span_nests_under_agent_span(package_module, tmp_path, monkeypatch):
+    tracing = package_module("observability.tracing")
+    agents = package_module("observability.agents")
+    monkeypatch.setattr(tracing, "_tracer", None)
+    monkeypatch.setattr(tracing, "_fallback_file", tracing._JsonLinesFile(str(tmp_path / "spans.jsonl")))
+
+    agents.before_agent(_context("hazard_identification_agent"))
+    with tracing.span("tool rag_search", tool="rag_search"):
+        pass
+    agents.after_agent(_context("hazard_identification_agent"))
+    with tracing.span("tool outside"):
+        pass
+
+    spans = {s["name"]: s for s in map(json.loads, (tmp_path / "spans.jsonl").read_text().splitlines())}
+    assert spans["tool rag_search"]["parentId"] == spans["agent hazard_identification_agent"]["spanId"]
+    assert spans["tool outside"]["parentId"] is None
+
+
+def test_unfinished_runs_are_bounded(package_module, monkeypatch):
+    tracing = package_module("observability.tracing")
+    agents = package_module("observability.agents")
+    monkeypatch.setattr(tracing, "_tracer", None)
+    monkeypatch.setattr(tracing, "_fallback_file", None)
+    monkeypatch.setattr(agents, "MAX_TRACKED", 5)
+
+    # Runs that raised or were cancelled: after_agent never runs
+    for i in range(20):
+        agents.before_agent(_context("permit_generator_agent", f"inv-{i}"))
+        agents._iteration_counter("permit_refinement_loop")(_context("permit_validation_agent", f"inv-{i}"))
+
+    tracked = agents.tracked_runs()
+    assert tracked["openSpans"] <= 5 and tracked["loops"] <= 5
+    for i in range(15, 20):
+        agents.after_agent(_context("permit_generator_agent", f"inv-{i}"))
+    assert agents.tracked_runs()["openSpans"] == 0
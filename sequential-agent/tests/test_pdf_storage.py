@@ -0,0 +1,26 @@
+"""Local PDF storage under concurrent writes of the same name."""
+
+import threading
+
+
+def test_concurrent_puts_of_one_name(package_module, tmp_path):
+    pdf_storage = package_module("tools.pdf_storage")
+    storage = pdf_storage.LocalStorage(str(tmp_path))
+    payloads = [bytes([i]) * 200_000 for i in range(8)]
+    errors = []
+
+    def put(data):
+        try:
+            storage.put("permits/HW-1.pdf", data)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(data,)) for data in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert (tmp_path / "permits" / "HW-1.pdf").read_bytes() in payloads
+    assert [p.name for p in (tmp_path / "permits").iterdir()] == ["HW-1.pdf"]
@@ -0,0 +1,25 @@
+"""RAG result cache: the local snapshot follows the index data, not the index object."""
+
+import json
+
+
+def test_local_snapshot_changes_with_rag_data(package_module, tmp_path, monkeypatch):
+    assets = package_module("tools.assets")
+    rag = package_module("tools.rag")
+    rag_index = package_module("tools.rag_index")
+    monkeypatch.setenv("ASSETS_PATH", str(tmp_path))
+    monkeypatch.setattr(rag, "VECTOR_STORE_TYPE", "local")
+    monkeypatch.setattr(rag_index, "RAG_INDEX_PATH", None)
+    (tmp_path / "rag_data").mkdir()
+    incidents = tmp_path / "rag_data" / "incidents.json"
+    (tmp_path / "rag_data" / "historical_permits.json").write_text(json.dumps({"historicalPermits": []}))
+    incidents.write_text(json.dumps({"incidents": [{"id": "INC-1", "summary": "valve leak"}]}))
+    assets.clear()
+
+    first = rag._current_snapshot()
+    assert rag._current_snapshot() == first
+
+    incidents.write_text(json.dumps({"incidents": [{"id": "INC-2", "summary": "line rupture"}]}))
+    assets.clear()
+    assert rag._current_snapshot() != first
+    assets.clear()
@@ -0,0 +1,72 @@
+"""Incremental ingestion: a failure part way through a batch loses neither documents nor progress."""
+
+import json
+from types import SimpleNamespace
+
+
+class FakeRag:
+    """Stand-in for vertexai.preview.rag that fails one upload."""
+
+    def __init__(self, fail_on=None):
+        self.files = {}
+        self.fail_on = fail_on
+        self.uploads = 0
+
+    def upload_file(self, corpus_name, path, display_name, description):
+        if display_name == self.fail_on:
+            self.fail_on = None
+            raise RuntimeError("upload failed")
+        self.uploads += 1
+        name = f"files/{self.uploads}"
+        with open(path) as f:
+            self.files[name] = (display_name, f.read())
+        return SimpleNamespace(name=name)
+
+    def delete_file(self, name):
+        del self.files[name]
+
+
+def _documents(version):
+    return [{"text": f"{doc_id} v{version}", "metadata": {"namespace": "incidents", "id": doc_id}} for doc_id in "abc"]
+
+
+def _vertex_sink(rag_ingest, rag, tmp_path):
+    sink = rag_ingest.VertexRagSink.__new__(rag_ingest.VertexRagSink)
+    sink.rag, sink.corpus_name, sink.tmp_dir = rag, "corpus", str(tmp_path)
+    return sink
+
+
+def test_failed_upload_keeps_old_files_and_records_progress(package_module, tmp_path):
+    rag_ingest = package_module("tools.rag_ingest")
+    manifest_path = str(tmp_path / "manifest.json")
+    rag = FakeRag()
+    sink = _vertex_sink(rag_ingest, rag, tmp_path)
+    rag_ingest.ingest(_documents(1), sink, rag_ingest.Manifest(manifest_path, "corpus"), batch_size=3, workers=1)
+
+    rag.fail_on = "incidents/b"
+    stats = rag_ingest.ingest(_documents(2), sink, rag_ingest.Manifest(manifest_path, "corpus"),
+                              batch_size=3, workers=1, retries=0)
+
+    assert stats["failedBatches"] == 1 and stats["upserted"] == 1
+    # Every document is still in the corpus exactly once (b in its old version)
+    assert sorted(rag.files.values()) == [("incidents/a", "a v2"), ("incidents/b", "b v1"), ("incidents/c", "c v1")]
+    # The stored upload was saved to the manifest
+    with open(manifest_path) as f:
+        saved = json.load(f)["documents"]
+    assert rag.files[saved["incidents/a"]["ref"]] == ("incidents/a", "a v2")
+
+    # The resumed run uploads only what is left, without duplicates
+    stats = rag_ingest.ingest(_documents(2), sink, rag_ingest.Manifest(manifest_path, "corpus"), batch_size=3, workers=1)
+    assert stats["upserted"] == 2 and stats["unchanged"] == 1
+    assert sorted(rag.files.values()) == [("incidents/a", "a v2"), ("incidents/b", "b v2"), ("incidents/c", "c v2")]
+
+
+def test_retry_skips_documents_already_stored(package_module, tmp_path):
+    rag_ingest = package_module("tools.rag_ingest")
+    rag = FakeRag(fail_on="incidents/b")
+    stats = rag_ingest.ingest(_documents(1), _vertex_sink(rag_ingest, rag, tmp_path),
+                              rag_ingest.Manifest(str(tmp_path / "manifest.json"), "corpus"),
+                              batch_size=3, workers=1, retries=1, backoff=0)
+
+    assert stats["failedBatches"] == 0 and stats["upserted"] == 3
+    assert sorted(display for display, _ in rag.files.values()) == ["incidents/a", "incidents/b", "incidents/c"]
@@ -0,0 +1,55 @@
+"""Auto-remediation only applies fixes that claim nothing about the field."""
+
+
+def test_remediation_does_not_add_safety_controls(package_module):
+    remediation = package_module("tools.remediation")
+    rules = package_module("tools.rules")
+    permit = {"permitId": "HW-1", "type": "Hot Work", "controls": [], "ppe": [], "signOffRoles": [], "validityHours": 48}
+
+    fixed, changes = remediation.remediate_permit(permit)
+
+    assert [(c["field"], c["action"]) for c in changes] == [("validityHours", "clamp")]
+    assert fixed["controls"] == [] and fixed["ppe"] == [] and fixed["signOffRoles"] == []
+    assert rules.evaluate(fixed)["errors"]
+
+
+def test_remediated_permit_is_not_fast_pathed(package_module):
+    import asyncio
+    from google.adk.agents import BaseAgent
+    from google.adk.events import Event
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    precheck = package_module("subagents.rules_precheck_agent")
+    rules = package_module("tools.rules")
+    loop_runs = []
+
+    class Loop(BaseAgent):
+        async def _run_async_impl(self, ctx):
+            loop_runs.append(ctx.session.state["permit_generator_output"])
+            yield Event(author=self.name, invocation_id=ctx.invocation_id)
+
+    # A permit that passes every rule except validity
+    ruleset = rules.compiled_ruleset().permit_types["Hot Work"]
+    permit = {
+        "permitId": "HW-1", "type": "Hot Work",
+        "controls": list(ruleset.required_controls), "ppe": list(ruleset.required_ppe),
+        "signOffRoles": list(ruleset.required_signoffs), "validityHours": ruleset.validity_hours_max + 4,
+    }
+    agent = precheck.create_rules_precheck_agent(Loop(name="loop"))
+
+    async def main():
+        runner = InMemoryRunner(agent=agent, app_name="test")
+        session = await runner.session_service.create_session(
+            app_name="test", user_id="u", state={"permit_generator_output": {"permits": [permit]}},
+        )
+        message = types.Content(role="user", parts=[types.Part(text="validate")])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+        return await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+
+    session = asyncio.run(main())
+
+    assert session.state["rules_fast_path"] is False
+    assert len(loop_runs) == 1
+    assert loop_runs[0]["permits"][0]["validityHours"] == ruleset.validity_hours_max
@@ -0,0 +1,135 @@
+"""Result cache hits must answer with content the frontend can parse."""
+
+import json
+
+
+def frontend_parse(texts):
+    """Mirror of frontend/src/utils/api.ts: the first JSON object text with hazards or permits."""
+    for text in texts:
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict) and (parsed.get("hazards") or parsed.get("permits")):
+            return parsed
+    return None
+
+
+def test_response_payload_matches_frontend_contract(package_module):
+    result_cache = package_module("pipeline.result_cache")
+    state = {
+        "hazard_identification_output": json.dumps({"hazards": [{"name": "Hot work", "confidence": 0.9}]}),
+        "permit_generator_output": {"permits": [{"permitId": "HW-1", "type": "Hot Work"}]},
+        "permit_validations": {"HW-1": {"permitId": "HW-1", "validationStatus": "Pass"}},
+    }
+
+    payload = result_cache.response_payload("WO-1", state)
+    parsed = frontend_parse([json.dumps(payload)])
+
+    assert parsed is not None
+    assert parsed["workOrderId"] == "WO-1"
+    assert [h["name"] for h in parsed["hazards"]] == ["Hot work"]
+    assert [p["permitId"] for p in parsed["permits"]] == ["HW-1"]
+    assert [v["validationStatus"] for v in parsed["validations"]] == ["Pass"]
+    assert parsed["runMeta"]["resultCacheHit"] is True
+
+
+def test_response_payload_rejects_unusable_result(package_module):
+    result_cache = package_module("pipeline.result_cache")
+
+    assert result_cache.response_payload("WO-1", {"hazard_identification_output": "not json"}) is None
+    assert result_cache.response_payload("WO-1", {}) is None
+
+
+class MemoryStore:
+    def __init__(self):
+        self.records = {}
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def put(self, key, record):
+        self.records[key] = record
+
+    def delete(self, key):
+        self.records.pop(key, None)
+
+    def delete_where(self, work_order_id=None, inputs_hash_not=None):
+        return 0
+
+    def stats(self):
+        return {"entries": len(self.records)}
+
+
+def run_cached(package_module, responses, session_state=None):
+    """Run CachedPipelineAgent over a scripted pipeline; returns the stored records."""
+    import asyncio
+    from google.adk.agents import BaseAgent
+    from google.adk.events import Event, EventActions
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    result_cache = package_module("pipeline.result_cache")
+    store = MemoryStore()
+
+    class ScriptedPipeline(BaseAgent):
+        async def _run_async_impl(self, ctx):
+            for name, response in responses:
+                yield Event(
+                    author=self.name, invocation_id=ctx.invocation_id,
+                    content=types.Content(role="user", parts=[
+                        types.Part(function_response=types.FunctionResponse(name=name, response=response))
+                    ]),
+                )
+            yield Event(
+                author=self.name, invocation_id=ctx.invocation_id,
+                actions=EventActions(state_delta={
+                    "hazard_identification_output": {"hazards": [{"name": "Hot work"}]},
+                    "permit_generator_output": {"permits": [{"permitId": "HW-1"}]},
+                }),
+            )
+
+    agent = result_cache.CachedPipelineAgent(
+        name="cached", pipeline=ScriptedPipeline(name="pipeline"), cache=result_cache.ResultCache(store),
+    )
+
+    async def main():
+        runner = InMemoryRunner(agent=agent, app_name="test")
+        session = await runner.session_service.create_session(app_name="test", user_id="u", state=session_state or {})
+        message = types.Content(role="user", parts=[types.Part(text='{"workOrderId": "WO-87231"}')])
+        async for _ in runner.run_async(user_id="u", session_id=session.id, new_message=message):
+            pass
+
+    asyncio.run(main())
+    return list(store.records.values())
+
+
+def test_stores_only_this_runs_state(package_module):
+    records = run_cached(
+        package_module,
+        [("get_weather_data", {"windKph": 12.0})],
+        session_state={"permit_remediations": {"HW-1": ["from an earlier run"]}},
+    )
+
+    assert len(records) == 1
+    assert set(records[0]["state"]) == {"hazard_identification_output", "permit_generator_output"}
+
+
+def test_does_not_store_fallback_runs(package_module):
+    records = run_cached(
+        package_module,
+        [("get_weather_data", {"windKph": 30.0, "note": "Google Maps Weather API key not configured, using default values"})],
+    )
+
+    assert records == []
+
+
+def test_weather_bucket_changes_key(package_module):
+    result_cache = package_module("pipeline.result_cache")
+    cache = result_cache.ResultCache(MemoryStore())
+    wo = {"workOrderId": "WO-1", "latitude": 28.6, "longitude": 77.2}
+    width = result_cache.PIPELINE_CACHE_WEATHER_BUCKET_SECONDS
+
+    assert cache.key_for(wo, now=10 * width) == cache.key_for(wo, now=10 * width + 1)
+    assert cache.key_for(wo, now=10 * width) != cache.key_for(wo, now=11 * width)
+    assert cache.key_for(wo, now=0) != cache.key_for({**wo, "latitude": 40.0}, now=0)
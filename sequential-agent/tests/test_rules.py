@@ -0,0 +1,19 @@
+"""Batch rule evaluation keeps one result per permit."""
+
+
+def test_evaluate_many_keeps_repeated_ids_apart(package_module):
+    rules = package_module("tools.rules")
+    complete = {"permitId": "HW-1", "type": "Hot Work", "validityHours": 4}
+    ruleset = rules.compiled_ruleset().permit_types["Hot Work"]
+    complete.update(
+        controls=list(ruleset.required_controls), ppe=list(ruleset.required_ppe),
+        signOffRoles=list(ruleset.required_signoffs),
+    )
+    empty = {"permitId": "HW-1", "type": "Hot Work", "validityHours": 4}
+
+    result = rules.evaluate_many([complete, empty, {"type": "Hot Work"}])
+
+    assert list(result["summary"]) == ["HW-1", "HW-1#1", "#2"]
+    assert result["summary"]["HW-1"] == {"errors": 0, "warnings": 0}
+    assert result["summary"]["HW-1#1"]["errors"] > 0
+    assert result["summary"]["HW-1#1"] == result["summary"]["#2"]
@@ -0,0 +1,23 @@
+"""Work-order priority classes from the description."""
+
+import pytest
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("Emergency repair of crude line CR-TF-004A: active hydrocarbon leak", "emergency"),
+    ("Active spill at loading bay 3, contain immediately", "emergency"),
+    ("Isolate after line rupture on the gas header", "emergency"),
+    ("Replace spill kit contents and inspect bund drains", "routine"),
+    ("Rupture disc replacement on vessel V-112 during turnaround", "routine"),
+    ("Annual test of the emergency shutdown valve and emergency lighting", "routine"),
+    ("Leak rate test of flange joints after reassembly", "routine"),
+    ("Urgent: replace seal before restart", "urgent"),
+])
+def test_classify_description(package_module, description, expected):
+    scheduler = package_module("pipeline.scheduler")
+    assert scheduler.classify_work_order({"description": description}) == expected
+
+
+def test_explicit_priority_wins_over_keywords(package_module):
+    scheduler = package_module("pipeline.scheduler")
+    assert scheduler.classify_work_order({"priority": "low", "description": "Active spill at bay 3"}) == "routine"
@@ -0,0 +1,51 @@
+"""Validation fan-out: one result per permit, and failed runs do not leave tasks behind."""
+
+import asyncio
+
+import pytest
+
+
+def test_validation_keys_are_unique(package_module):
+    precheck = package_module("subagents.rules_precheck_agent")
+    permits = [{"permitId": "HW-1"}, {}, {"permitId": "HW-1"}, {"permitId": ""}, {"permitId": "CS-2"}]
+
+    assert precheck.validation_keys(permits) == ["HW-1", "UNKNOWN#1", "HW-1#2", "UNKNOWN#3", "CS-2"]
+
+
+def test_merge_runs_awaits_cancelled_runs(package_module):
+    fanout = package_module("subagents.validation_fanout_agent")
+    closed = []
+
+    async def failing():
+        yield "first"
+        raise RuntimeError("validator failed")
+
+    async def slow():
+        try:
+            yield "slow"
+            await asyncio.sleep(10)
+            yield "never"
+        finally:
+            closed.append("slow")
+
+    async def run():
+        events = []
+        with pytest.raises(RuntimeError, match="validator failed"):
+            async for event in fanout.merge_runs([failing(), slow()]):
+                events.append(event)
+        # Checked before asyncio.run() cancels leftover tasks on its own
+        return events, list(closed)
+
+    events, closed_on_return = asyncio.run(run())
+    assert "never" not in events
+    assert closed_on_return == ["slow"]
+
+
+def test_fanout_validator_instruction_covers_only_its_permit(package_module):
+    a3 = package_module("subagents.a3_validator_agent")
+
+    instruction = a3.create_validator_agent(model="stand-in", index=2).instruction
+
+    assert "{permit_under_validation_2}" in instruction
+    assert "For each permit" not in instruction and "each permit" not in instruction
+    assert "{permit_under_validation" not in a3.create_validator_agent(model="stand-in").instruction
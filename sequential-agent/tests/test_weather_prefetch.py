@@ -0,0 +1,23 @@
+"""Weather prefetch: shift parsing and cache probes that leave the hit/miss stats alone."""
+
+
+def test_peek_does_not_count(package_module):
+    cache = package_module("tools.cache").TTLCache(max_entries=4, ttl_seconds=60)
+    cache.set("tile", {"tempC": 20})
+
+    value, age = cache.peek("tile")
+
+    assert value == {"tempC": 20} and age >= 0
+    assert cache.peek("other") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+
+
+def test_shift_work_order_ids(package_module, tmp_path):
+    weather = package_module("tools.weather")
+    shift_file = tmp_path / "shift.txt"
+    shift_file.write_text("WO-1\n\nWO-2\n")
+
+    assert weather.shift_work_order_ids("all") is None
+    assert weather.shift_work_order_ids(" WO-1, WO-2 ,") == ["WO-1", "WO-2"]
+    assert weather.shift_work_order_ids(f"@{shift_file}") == ["WO-1", "WO-2"]
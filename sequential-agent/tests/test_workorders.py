@@ -0,0 +1,17 @@
+"""Work order lookups with a SQLite store that has not been built."""
+
+import logging
+
+
+def test_missing_sqlite_database_falls_back_to_json(package_module, tmp_path, monkeypatch, caplog):
+    workorders = package_module("tools.workorders")
+    db_path = tmp_path / "workOrders.db"
+    monkeypatch.setattr(workorders, "WORKORDER_STORE", "sqlite")
+    monkeypatch.setattr(workorders, "WORKORDER_DB_PATH", str(db_path))
+
+    with caplog.at_level(logging.WARNING, logger=workorders.__name__):
+        wo = workorders.get_workorder_by_id("WO-87231")
+
+    assert wo["description"] != "Work order not found"
+    assert not db_path.exists()
+    assert "does not exist" in caplog.text
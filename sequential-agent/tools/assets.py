@@ -0,0 +1,254 @@
+"""Process-wide registry of parsed policy assets with mtime-based hot reload."""
+
+from typing import Dict, Any, Callable, Hashable, Optional, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import time
+
+import yaml
+from ..config.settings import ASSET_RELOAD_INTERVAL
+
+
+@dataclass(frozen=True)
+class AssetSnapshot:
+    """Immutable parsed view of one asset file."""
+    path: str
+    data: Any
+    sha256: str
+    mtime_ns: int
+    size: int
+    loaded_at: float
+    # Objects derived from `data` (indexes, compiled rules) as name -> (version, object); dropped with the snapshot
+    derived: Dict[Any, Tuple[Hashable, Any]] = field(default_factory=dict, compare=False, repr=False)
+    # Name -> lock held while that object is built (single flight per object)
+    derive_locks: Dict[Any, threading.Lock] = field(default_factory=dict, compare=False, repr=False)
+
+
+_lock = threading.RLock()
+_snapshots: Dict[str, AssetSnapshot] = {}
+_last_checked: Dict[str, float] = {}
+_stats: Dict[str, Dict[str, Any]] = {}
+# Path -> monotonic time a stat found it missing; rechecked after ASSET_RELOAD_INTERVAL
+_missing: Dict[str, float] = {}
+
+_BUNDLED_ASSETS = Path(__file__).parent.parent / "assets"
+# ASSETS_PATH values found to exist, and those found missing (value -> monotonic time checked)
+_resolved: Dict[str, Path] = {}
+_unresolved: Dict[str, float] = {}
+
+
+def _resolve_assets_path(assets_dir: str) -> Path:
+    """
+    Resolve an ASSETS_PATH value, falling back to the packaged assets.
+
+    Only a directory that exists is cached; a missing one is rechecked every
+    ASSET_RELOAD_INTERVAL, so assets mounted after startup are picked up.
+    """
+    resolved = _resolved.get(assets_dir)
+    if resolved is not None:
+        return resolved
+    now = time.monotonic()
+    checked = _unresolved.get(assets_dir)
+    if checked is not None and now - checked < ASSET_RELOAD_INTERVAL:
+        return _BUNDLED_ASSETS
+    if os.path.exists(assets_dir):
+        _resolved[assets_dir] = Path(assets_dir)
+        _unresolved.pop(assets_dir, None)
+        return _resolved[assets_dir]
+    # Fallback to relative path
+    _unresolved[assets_dir] = now
+    return _BUNDLED_ASSETS
+
+
+def assets_path() -> Path:
+    """
+    Resolve the assets directory.
+
+    Returns:
+        ASSETS_PATH if it exists, otherwise the assets/ directory shipped with the package
+    """
+    return _resolve_assets_path(os.getenv("ASSETS_PATH", "/app/assets"))
+
+
+def _file_stats(key: str) -> Dict[str, Any]:
+    """Get (or create) the counters for one asset file."""
+    stats = _stats.get(key)
+    if stats is None:
+        stats = {
+            "loads": 0,
+            "reloads": 0,
+            "hits": 0,
+            "stat_calls": 0,
+            "unchanged_rewrites": 0,
+            "last_load_seconds": 0.0,
+            "total_load_seconds": 0.0,
+        }
+        _stats[key] = stats
+    return stats
+
+
+def _parse(raw: bytes, parser: str) -> Any:
+    """Parse raw file content with the named parser."""
+    if parser == "json":
+        return json.loads(raw)
+    if parser == "yaml":
+        return yaml.safe_load(raw)
+    raise ValueError(f"Unknown asset parser: {parser}")
+
+
+def get_snapshot(relative_path: str, parser: str = "json") -> Optional[AssetSnapshot]:
+    """
+    Get the current snapshot of an asset file, (re)loading it only when it changed.
+
+    Args:
+        relative_path: Path relative to the assets directory (e.g., "compliance_rules.json")
+        parser: "json" or "yaml"
+
+    Returns:
+        AssetSnapshot, or None if the file does not exist
+    """
+    path = str(assets_path() / relative_path)
+    now = time.monotonic()
+
+    snapshot = _snapshots.get(path)
+    if snapshot is not None and now - _last_checked.get(path, 0.0) < ASSET_RELOAD_INTERVAL:
+        _file_stats(path)["hits"] += 1
+        return snapshot
+    missing_since = _missing.get(path)
+    if missing_since is not None and now - missing_since < ASSET_RELOAD_INTERVAL:
+        return None
+
+    # stat() outside the registry lock, so lookups of other files are not serialized behind it
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _missing[path] = now
+        if snapshot is not None:
+            with _lock:
+                _file_stats(path)["stat_calls"] += 1
+                _snapshots.pop(path, None)
+                _last_checked.pop(path, None)
+        return None
+    _missing.pop(path, None)
+
+    with _lock:
+        stats = _file_stats(path)
+        snapshot = _snapshots.get(path)
+        stats["stat_calls"] += 1
+        _last_checked[path] = now
+
+        if snapshot is not None and snapshot.mtime_ns == st.st_mtime_ns and snapshot.size == st.st_size:
+            stats["hits"] += 1
+            return snapshot
+
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+
+        if snapshot is not None and snapshot.sha256 == digest:
+            # Touched but not modified: keep parsed data and derived objects
+            snapshot = AssetSnapshot(
+                path=path,
+                data=snapshot.data,
+                sha256=digest,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                loaded_at=snapshot.loaded_at,
+                derived=snapshot.derived,
+                derive_locks=snapshot.derive_locks,
+            )
+            stats["unchanged_rewrites"] += 1
+        else:
+            is_reload = snapshot is not None
+            snapshot = AssetSnapshot(
+                path=path,
+                data=_parse(raw, parser),
+                sha256=digest,
+                mtime_ns=st.st_mtime_ns,
+                size=st.st_size,
+                loaded_at=time.time(),
+            )
+            elapsed = time.perf_counter() - started
+            stats["loads"] += 1
+            if is_reload:
+                stats["reloads"] += 1
+            stats["last_load_seconds"] = elapsed
+            stats["total_load_seconds"] += elapsed
+
+        # Swap in the new snapshot atomically; readers holding the old one are unaffected
+        _snapshots[path] = snapshot
+        return snapshot
+
+
+def load_json(relative_path: str) -> Optional[Any]:
+    """Get parsed JSON content of an asset file, or None if it does not exist."""
+    snapshot = get_snapshot(relative_path, "json")
+    return snapshot.data if snapshot is not None else None
+
+
+def load_yaml(relative_path: str) -> Optional[Any]:
+    """Get parsed YAML content of an asset file, or None if it does not exist."""
+    snapshot = get_snapshot(relative_path, "yaml")
+    return snapshot.data if snapshot is not None else None
+
+
+def derive(
+    snapshot: AssetSnapshot,
+    key: Any,
+    builder: Callable[[Any], Any],
+    version: Hashable = None
+) -> Any:
+    """
+    Get an object derived from a snapshot's data, building it once per snapshot.
+
+    Concurrent callers for the same object wait for a single build; the build
+    runs outside the registry lock, so other asset lookups are not blocked.
+
+    Args:
+        snapshot: Snapshot returned by get_snapshot
+        key: Name of the derived object (e.g., "work_order_index")
+        builder: Function called with snapshot.data to build the object
+        version: Identifies other inputs the object depends on (e.g., another
+            file's sha256); a different version replaces the stored object
+
+    Returns:
+        The derived object, rebuilt automatically after the file (or version) changes
+    """
+    entry = snapshot.derived.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with _lock:
+        build_lock = snapshot.derive_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        entry = snapshot.derived.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, builder(snapshot.data))
+            snapshot.derived[key] = entry
+        return entry[1]
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Get load counters and reload timings for every asset file seen so far.
+
+    Returns:
+        Dictionary keyed by absolute file path with loads, reloads, hits and timings
+    """
+    with _lock:
+        return {path: dict(stats) for path, stats in _stats.items()}
+
+
+def clear() -> None:
+    """Drop all snapshots and counters (forces the next lookup to reload)."""
+    with _lock:
+        _snapshots.clear()
+        _last_checked.clear()
+        _stats.clear()
+        _missing.clear()
+        _resolved.clear()
+        _unresolved.clear()
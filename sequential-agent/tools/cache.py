@@ -0,0 +1,132 @@
+"""Thread-safe in-memory cache with LRU eviction, TTL expiry and entry/byte bounds."""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import json
+import threading
+import time
+
+
+def json_size(value: Any) -> int:
+    """Approximate the memory footprint of a JSON-like value by its serialized length."""
+    return len(json.dumps(value, default=str))
+
+
+class TTLCache:
+    """LRU cache bounded by entry count and approximate bytes, with optional TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        sizeof: Callable[[Any], int] = json_size
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        # key -> (value, stored_at, size); most recently used last
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expirations": 0}
+
+    def get_with_age(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, age in seconds), or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            value, stored_at, size = entry
+            age = time.monotonic() - stored_at
+            if self.ttl_seconds is not None and age > self.ttl_seconds:
+                del self._entries[key]
+                self._bytes -= size
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value, age
+
+    def peek(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a key without counting a hit/miss or refreshing its LRU position.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, age in seconds), or None if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at, _ = entry
+            age = time.monotonic() - stored_at
+            if self.ttl_seconds is not None and age > self.ttl_seconds:
+                return None
+            return value, age
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a key, returning default on a miss."""
+        found = self.get_with_age(key)
+        return found[0] if found is not None else default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries to stay within bounds."""
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, time.monotonic(), size)
+            self._bytes += size
+            self._stats["sets"] += 1
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, sets, evictions, expirations, hitRate,
+            entries and bytes
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hitRate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
@@ -1,7 +1,14 @@
+import logging
+
 from google.adk.tools import ToolContext
+from ..observability.tracing import traced_tool
+
+logger = logging.getLogger(__name__)
 
+@traced_tool
 def exit_loop(tool_context: ToolContext):
   """Call this function ONLY when the critique indicates no further changes are needed, signaling the iterative process should end."""
-  print(f"  [Tool Call] exit_loop triggered by {tool_context.agent_name}")
+  # The call itself is traced as a "tool exit_loop" span under the calling agent's span
+  logger.debug("exit_loop triggered by %s", tool_context.agent_name)
   tool_context.actions.escalate = True
-  return {}
\ No newline at end of file
+  return {}
@@ -1,21 +1,201 @@
 """Tool for generating unique permit IDs."""
 
-from typing import Dict
-import random
-import string
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import contextlib
+import itertools
+import os
+import sqlite3
+import threading
 
+from ..config.settings import DB_URL, PERMIT_ID_BLOCK_SIZE
+from ..observability.tracing import traced_tool
 
-# In-memory counter for demo (in production, use database sequence)
-_permit_counters = {}
 
+class MemorySequence:
+    """Per-process sequence (no DB_URL): unique within the process only, resets on restart."""
 
+    def __init__(self):
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def lease(self, name: str, size: int) -> int:
+        """Reserve size values of a sequence and return the first."""
+        with self._lock:
+            start = self._next.get(name, 1)
+            self._next[name] = start + size
+            return start
+
+
+class SQLiteSequence:
+    """Durable sequence in a SQLite table, safe across processes sharing the file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS permit_id_sequences (name TEXT PRIMARY KEY, next_value INTEGER NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def lease(self, name: str, size: int) -> int:
+        """Reserve size values of a sequence and return the first."""
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front, so concurrent leases serialize
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT OR IGNORE INTO permit_id_sequences (name, next_value) VALUES (?, 1)", (name,))
+            start = conn.execute("SELECT next_value FROM permit_id_sequences WHERE name = ?", (name,)).fetchone()[0]
+            conn.execute("UPDATE permit_id_sequences SET next_value = ? WHERE name = ?", (start + size, name))
+            conn.execute("COMMIT")
+            return start
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+class PostgresSequence:
+    """Durable sequence in a Postgres table (atomic UPSERT ... RETURNING)."""
+
+    def __init__(self, dsn: str):
+        try:
+            import psycopg as driver
+        except ImportError:
+            try:
+                import psycopg2 as driver
+            except ImportError:
+                raise ImportError("A Postgres DB_URL requires psycopg or psycopg2") from None
+        self._driver = driver
+        self.dsn = dsn
+        with contextlib.closing(self._connect()) as conn, conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "CREATE TABLE IF NOT EXISTS permit_id_sequences (name TEXT PRIMARY KEY, next_value BIGINT NOT NULL)"
+                )
+
+    def _connect(self):
+        return self._driver.connect(self.dsn)
+
+    def lease(self, name: str, size: int) -> int:
+        """Reserve size values of a sequence and return the first."""
+        # psycopg2's "with conn" only ends the transaction; closing() releases the connection
+        with contextlib.closing(self._connect()) as conn, conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO permit_id_sequences (name, next_value) VALUES (%s, %s) "
+                    "ON CONFLICT (name) DO UPDATE SET next_value = permit_id_sequences.next_value + %s "
+                    "RETURNING next_value",
+                    (name, 1 + size, size),
+                )
+                end = cur.fetchone()[0]
+        return end - size
+
+
+def sequence_from_url(db_url: Optional[str]):
+    """
+    Create the sequence backend for DB_URL.
+
+    Args:
+        db_url: sqlite:///path/to.db, postgresql://..., or None for in-memory
+
+    Returns:
+        MemorySequence, SQLiteSequence or PostgresSequence
+    """
+    if not db_url:
+        return MemorySequence()
+    scheme = urlparse(db_url).scheme.split("+")[0]
+    if scheme == "sqlite":
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        return SQLiteSequence(db_url.split(":///", 1)[1])
+    if scheme in ("postgres", "postgresql"):
+        return PostgresSequence(db_url.replace("postgresql+psycopg://", "postgresql://", 1))
+    raise ValueError(f"Unsupported DB_URL scheme for permit IDs: {scheme}")
+
+
+class _Block:
+    """A leased range [start, end) handed out by a lock-free counter."""
+
+    __slots__ = ("counter", "end")
+
+    def __init__(self, start: int, end: int):
+        self.counter = itertools.count(start)
+        self.end = end
+
+
+class BlockAllocator:
+    """
+    Hands out sequence values from blocks leased from a durable sequence.
+
+    The hot path is next() on an itertools.count (atomic under the GIL); the
+    lock is only taken to lease a new block when the current one runs out.
+    Values are unique across processes and increasing within a process.
+    """
+
+    def __init__(self, sequence, block_size: int = 50):
+        self.sequence = sequence
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[str, _Block] = {}
+        self._lock = threading.Lock()
+
+    def next_value(self, name: str) -> int:
+        """Get the next value of a sequence."""
+        while True:
+            block = self._blocks.get(name)
+            if block is not None:
+                value = next(block.counter)
+                if value < block.end:
+                    return value
+            with self._lock:
+                # Another thread may have refilled while we waited
+                if self._blocks.get(name) is block:
+                    start = self.sequence.lease(name, self.block_size)
+                    self._blocks[name] = _Block(start, start + self.block_size)
+
+    def reset(self) -> None:
+        """Drop leased blocks (unused values are skipped, never reissued)."""
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+
+_allocator: Optional[BlockAllocator] = None
+_allocator_lock = threading.Lock()
+
+
+def _get_allocator() -> BlockAllocator:
+    """Get the process-wide allocator for DB_URL."""
+    global _allocator
+    if _allocator is None:
+        with _allocator_lock:
+            if _allocator is None:
+                _allocator = BlockAllocator(sequence_from_url(DB_URL), PERMIT_ID_BLOCK_SIZE)
+    return _allocator
+
+
+def _reset_after_fork() -> None:
+    # A forked child must not hand out the blocks its parent is still using
+    if _allocator is not None:
+        _allocator.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@traced_tool
 def new_permit_id(permit_type: str) -> str:
     """
     Generate a unique permit ID in format PERM-<TYPE>-NNNN.
-    
+
+    IDs come from a per-type durable sequence (DB_URL), leased in blocks of
+    PERMIT_ID_BLOCK_SIZE, so they are unique across instances and survive restarts.
+
     Args:
         permit_type: Permit type (e.g., "Hot Work", "Confined Space Entry")
-    
+
     Returns:
         Unique permit ID (e.g., "PERM-HW-0001")
     """
@@ -27,18 +207,12 @@ def new_permit_id(permit_type: str) -> str:
         "Electrical/LOTO": "ELEC",
         "Working at Height": "WAH"
     }
-    
+
     abbrev = type_abbrev.get(permit_type, "PERM")
-    
-    # Get or initialize counter for this type
-    if abbrev not in _permit_counters:
-        _permit_counters[abbrev] = 0
-    
-    _permit_counters[abbrev] += 1
-    counter = _permit_counters[abbrev]
-    
+
+    counter = _get_allocator().next_value(abbrev)
+
     # Format as PERM-<TYPE>-NNNN
     permit_id = f"PERM-{abbrev}-{counter:04d}"
-    
-    return permit_id
 
+    return permit_id
@@ -0,0 +1,102 @@
+"""Incremental readers for large JSON exports (bounded memory)."""
+
+from typing import Any, Dict, Iterator, Optional
+import json
+import re
+
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(path: str, key: Optional[str] = None, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array one at a time without parsing the whole file.
+
+    Args:
+        path: Path to the JSON file
+        key: Name of the top-level property holding the array (e.g., "workOrders");
+            None when the file itself is an array
+        chunk_size: Number of characters read per chunk
+
+    Returns:
+        Iterator over the decoded array items
+    """
+    decoder = json.JSONDecoder()
+    if key is None:
+        start_pattern = re.compile(r"^\s*\[")
+    else:
+        start_pattern = re.compile(r'"' + re.escape(key) + r'"\s*:\s*\[')
+
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        eof = False
+
+        # Find the opening bracket of the array
+        while True:
+            match = start_pattern.search(buf)
+            if match:
+                pos = match.end()
+                break
+            if eof:
+                return
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            # Keep a short tail so a key split across chunks is still found
+            buf = buf[-(len(key or "") + 64):] + chunk
+
+        while True:
+            # Skip separators between items
+            while True:
+                while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                if not eof and not isinstance(item, (dict, list)):
+                    # A number cut at a chunk boundary ("2." + "5", "1e" + "3") decodes as a
+                    # shorter value: accept a scalar only once the separator after it is buffered
+                    rest = buf[end:].lstrip(_WHITESPACE)
+                    if not rest or rest[0] not in ",]":
+                        raise json.JSONDecodeError("Possibly truncated scalar", buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Item spans beyond the buffer: read more and retry
+                chunk = f.read(max(chunk_size, len(buf)))
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+
+            yield item
+            pos = end
+            if pos > chunk_size:
+                # Drop consumed input so memory stays bounded by the largest item
+                buf = buf[pos:]
+                pos = 0
+
+
+def iter_json_lines(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records from a JSON Lines file, skipping blank lines.
+
+    Args:
+        path: Path to the .jsonl file
+
+    Returns:
+        Iterator over the decoded records
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,135 @@
+"""Per-run memoization of pure tools via ADK tool callbacks and temp: session state."""
+
+from typing import Any, Dict, Optional
+import copy
+import hashlib
+import json
+import threading
+
+from google.adk.agents import BaseAgent, LlmAgent
+
+from ..observability.agents import add_callback
+from ..observability.metrics import TOOL_MEMO_HITS
+from ..observability.tracing import fallback_kind
+from ..config.settings import TOOL_MEMO_TOOLS
+
+# temp: keys live in the session's in-memory state for one invocation and are never persisted
+MEMO_PREFIX = "temp:tool_memo:"
+# Session state key with per-tool call/duplicate counts of the last run
+STATS_STATE_KEY = "tool_call_stats"
+# Invocations tracked at once (counts of runs that never finished are dropped oldest first)
+_MAX_TRACKED_INVOCATIONS = 1024
+
+# invocation_id -> tool -> {"calls", "duplicates"}
+_counts: Dict[str, Dict[str, Dict[str, int]]] = {}
+_counts_lock = threading.Lock()
+_totals: Dict[str, Dict[str, int]] = {}
+
+
+def memo_key(tool_name: str, args: Optional[Dict[str, Any]]) -> str:
+    """
+    Build the state key memoizing one tool call.
+
+    Args:
+        tool_name: Tool (function) name
+        args: Call arguments
+
+    Returns:
+        temp: state key for the tool and its canonical arguments
+    """
+    canonical = json.dumps(args or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{MEMO_PREFIX}{tool_name}:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
+
+
+def _count(invocation_id: str, tool_name: str, duplicate: bool) -> None:
+    """Count a memoized tool call for the invocation and the process totals."""
+    with _counts_lock:
+        if invocation_id not in _counts and len(_counts) >= _MAX_TRACKED_INVOCATIONS:
+            _counts.pop(next(iter(_counts)))
+        for counts in (_counts.setdefault(invocation_id, {}), _totals):
+            entry = counts.setdefault(tool_name, {"calls": 0, "duplicates": 0})
+            entry["calls"] += 1
+            entry["duplicates"] += int(duplicate)
+
+
+def before_tool(tool, args, tool_context) -> Optional[Dict[str, Any]]:
+    """before_tool_callback: answer a repeated call from the run's memo."""
+    if tool.name not in TOOL_MEMO_TOOLS:
+        return None
+    cached = tool_context.state.get(memo_key(tool.name, args))
+    _count(tool_context.invocation_id, tool.name, duplicate=cached is not None)
+    if cached is None:
+        return None
+    TOOL_MEMO_HITS.inc(tool=tool.name, agent=tool_context.agent_name)
+    # Copy so the agent cannot mutate the memoized result
+    return copy.deepcopy(cached)
+
+
+def after_tool(tool, args, tool_context, tool_response) -> None:
+    """after_tool_callback: memoize a fresh result (fallback and mock results are not kept)."""
+    if tool.name not in TOOL_MEMO_TOOLS or not isinstance(tool_response, dict):
+        return None
+    key = memo_key(tool.name, args)
+    if tool_context.state.get(key) is None and fallback_kind(tool_response) in (None, "local_index"):
+        tool_context.state[key] = copy.deepcopy(tool_response)
+    return None
+
+
+def record_call_stats(callback_context) -> None:
+    """after_agent_callback for the root agent: write the run's call/duplicate counts to state."""
+    with _counts_lock:
+        counts = _counts.pop(callback_context.invocation_id, None)
+    if counts:
+        callback_context.state[STATS_STATE_KEY] = counts
+    return None
+
+
+def tool_memo_stats() -> Dict[str, Any]:
+    """
+    Get process-wide memoized tool call counts.
+
+    Returns:
+        Per-tool calls and duplicates (answered from the memo), plus the overall duplicate rate
+    """
+    with _counts_lock:
+        tools = copy.deepcopy(_totals)
+    calls = sum(entry["calls"] for entry in tools.values())
+    duplicates = sum(entry["duplicates"] for entry in tools.values())
+    return {
+        "tools": tools,
+        "calls": calls,
+        "duplicates": duplicates,
+        "duplicateRate": round(duplicates / calls, 4) if calls else 0.0,
+    }
+
+
+def memoize_agent(agent: BaseAgent) -> BaseAgent:
+    """
+    Attach the memoization callbacks to every LLM agent in a tree.
+
+    Calls to TOOL_MEMO_TOOLS with arguments already seen in this run return
+    the first result instead of running the tool again. The root agent
+    writes the run's counts to state ("tool_call_stats"). Safe to call more
+    than once.
+
+    Args:
+        agent: Root of the agent tree
+
+    Returns:
+        The same agent
+    """
+    def attached(callbacks, callback) -> bool:
+        return callbacks is callback or (isinstance(callbacks, list) and callback in callbacks)
+
+    if not attached(agent.after_agent_callback, record_call_stats):
+        add_callback(agent, "after_agent_callback", record_call_stats)
+
+    def walk(node: BaseAgent) -> None:
+        if isinstance(node, LlmAgent) and not attached(node.before_tool_callback, before_tool):
+            add_callback(node, "before_tool_callback", before_tool, first=True)
+            add_callback(node, "after_tool_callback", after_tool)
+        for sub_agent in node.sub_agents:
+            walk(sub_agent)
+
+    walk(agent)
+    return agent
@@ -1,40 +1,130 @@
 """Tool for rendering permit PDFs."""
 
-from typing import Dict, Any
-import os
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import re
+import threading
 
+from .pdf_layout import PermitLayout, content_address, layout_for, render_permit_pdf
+from .pdf_storage import create_storage
+from ..observability.tracing import traced_tool
+from ..config.settings import PDF_STORAGE, PDF_RENDER_WORKERS
 
-def render(permit: Dict[str, Any], validation: Dict[str, Any]) -> Dict[str, Any]:
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Get the process-wide PDF storage target (PDF_STORAGE), created on first use."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage(PDF_STORAGE)
+    return _storage
+
+
+def _object_name(permit_id: str, content_hash: str) -> str:
+    """Content-addressed object name: identical permit + validation -> same name."""
+    safe_id = re.sub(r"[^A-Za-z0-9._-]+", "_", permit_id) or "UNKNOWN"
+    return f"{safe_id}-{content_hash[:16]}.pdf"
+
+
+def _prepare(
+    permit: Dict[str, Any],
+    validation: Optional[Dict[str, Any]],
+    work_order: Optional[Dict[str, Any]]
+) -> Tuple[PermitLayout, str, str]:
+    """Layout, content hash and object name for one permit."""
+    layout = layout_for(str(permit.get("type", "")))
+    content_hash = content_address(layout, permit, validation, work_order)
+    return layout, content_hash, _object_name(str(permit.get("permitId", "UNKNOWN")), content_hash)
+
+
+def _render_job(job: Tuple[PermitLayout, Dict[str, Any], Optional[Dict[str, Any]], Optional[Dict[str, Any]], str]) -> bytes:
+    """Process pool entry point: render one PDF from a compiled layout."""
+    layout, permit, validation, work_order, content_hash = job
+    return render_permit_pdf(layout, permit, validation, work_order, content_hash)
+
+
+def _result(permit: Dict[str, Any], url: str, content_hash: str, cached: bool) -> Dict[str, Any]:
+    return {
+        "pdfUrl": url,
+        "permitId": permit.get("permitId", "UNKNOWN"),
+        "contentHash": content_hash,
+        "cached": cached,
+        "generatedAt": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+@traced_tool
+def render(permit: Dict[str, Any], validation: Dict[str, Any], workOrder: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Render permit and validation to PDF.
-    
+
+    The PDF is content-addressed: an identical permit + validation (+ work
+    order and template) is stored once and never rendered again.
+
     Args:
         permit: Permit object
         validation: Validation result object
-    
+        workOrder: Optional work order (fills the work details section)
+
     Returns:
-        Dictionary with pdfUrl (GCS path)
+        Dictionary with pdfUrl (file:// or gs:// path), permitId, contentHash and cached
     """
-    # Mock implementation - in production, this would call pdf-service
-    # For hackathon, return mock GCS URL
-    
-    permit_id = permit.get("permitId", "UNKNOWN")
-    gcs_bucket = os.getenv("GCS_BUCKET", "permitflowai")
-    gcs_prefix = os.getenv("GCS_PDF_PREFIX", "permits")
-    
-    # Generate GCS URL
-    pdf_url = f"gs://{gcs_bucket}/{gcs_prefix}/{permit_id}.pdf"
-    
-    # In production, this would:
-    # 1. Call pdf-service Cloud Run endpoint
-    # 2. pdf-service renders PDF from permit + validation
-    # 3. pdf-service uploads to GCS
-    # 4. Returns signed URL or GCS path
-    
-    return {
-        "pdfUrl": pdf_url,
-        "permitId": permit_id,
-        "generatedAt": datetime.utcnow().isoformat() + "Z"
-    }
+    storage = get_storage()
+    layout, content_hash, name = _prepare(permit, validation, workOrder)
+    if storage.exists(name):
+        return _result(permit, storage.url(name), content_hash, cached=True)
+    data = render_permit_pdf(layout, permit, validation, workOrder, content_hash)
+    return _result(permit, storage.put(name, data), content_hash, cached=False)
+
+
+def render_many(
+    items: Iterable[Dict[str, Any]],
+    workers: int = PDF_RENDER_WORKERS,
+    chunk_size: int = 16
+) -> List[Dict[str, Any]]:
+    """
+    Render many permit packs (e.g., a week's printed permits).
+
+    Items already in storage, and duplicates within the batch, are not
+    rendered; with workers > 0 the remaining PDFs are rendered in a process
+    pool and stored from this process.
+
+    Args:
+        items: Dictionaries with "permit", "validation" and optional "workOrder"
+        workers: Number of worker processes (0 renders in this process)
+        chunk_size: PDFs per process pool task
+
+    Returns:
+        render() results, in input order
+    """
+    storage = get_storage()
+    prepared = []
+    jobs: Dict[str, Tuple] = {}
+    existing: Dict[str, bool] = {}
+    for item in items:
+        permit, validation, work_order = item["permit"], item.get("validation"), item.get("workOrder")
+        layout, content_hash, name = _prepare(permit, validation, work_order)
+        prepared.append((permit, content_hash, name))
+        if name not in existing:
+            existing[name] = storage.exists(name)
+            if not existing[name]:
+                jobs[name] = (layout, permit, validation, work_order, content_hash)
+
+    names = list(jobs)
+    if workers > 0 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, data in zip(names, pool.map(_render_job, [jobs[n] for n in names], chunksize=chunk_size)):
+                storage.put(name, data)
+    else:
+        for name in names:
+            storage.put(name, _render_job(jobs[name]))
 
+    return [
+        _result(permit, storage.url(name), content_hash, cached=existing[name])
+        for permit, content_hash, name in prepared
+    ]
@@ -0,0 +1,340 @@
+"""Per-permit-type PDF layouts compiled from assets/permit_templates/*.yaml, and the permit pack renderer."""
+
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import hashlib
+import json
+import re
+
+from . import assets
+from .pdf_writer import PAGE_HEIGHT, PAGE_WIDTH, PdfDocument, text_width, wrap
+
+# Bump when the drawing code changes, so content-addressed PDFs are re-rendered
+RENDERER_VERSION = "1"
+
+MARGIN = 48.0
+BODY_SIZE = 9.5
+LINE_HEIGHT = 13.0
+_CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+_FOOTER_Y = 28.0
+
+# Template "Work Details"-style fields filled from the work order (field -> work order keys, first present wins)
+_WORK_ORDER_FIELDS = {
+    "location": ("location",),
+    "spaceLocation": ("location",),
+    "equipment": ("equipment",),
+    "workDescription": ("description",),
+    "spaceDescription": ("equipment", "description"),
+    "entryReason": ("description",),
+    "scheduledTime": ("scheduledTime", "plannedStart", "createdAt"),
+    "entryTime": ("scheduledTime", "plannedStart"),
+}
+_STOP_WORDS = {"and", "or", "the", "of", "on", "with", "in", "to", "for", "a"}
+
+
+@dataclass(frozen=True)
+class LayoutField:
+    """One template field, with the tokens used to tick boolean checkboxes from the permit."""
+    name: str
+    label: str
+    kind: str
+    tokens: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class LayoutSection:
+    """A template section: a checklist (all boolean fields), form fields, or sign-off roles."""
+    title: str
+    kind: str
+    fields: Tuple[LayoutField, ...]
+    roles: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PermitLayout:
+    """Compiled layout of one permit type."""
+    permit_type: str
+    description: str
+    sections: Tuple[LayoutSection, ...]
+    source_sha256: str
+
+
+def _label(name: str) -> str:
+    """fireResistantClothing -> Fire Resistant Clothing."""
+    words = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", name).replace("_", " ").split()
+    return " ".join(word if word.isupper() else word.capitalize() for word in words)
+
+
+def _tokens(text: str) -> Tuple[str, ...]:
+    return tuple(t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in _STOP_WORDS)
+
+
+def compile_layout(template: Dict[str, Any], source_sha256: str = "") -> PermitLayout:
+    """
+    Compile one parsed permit template into a layout.
+
+    Args:
+        template: Parsed permit template YAML
+        source_sha256: Hash of the template file (part of the PDF content address)
+
+    Returns:
+        PermitLayout
+    """
+    sections = []
+    for section in template.get("sections") or []:
+        fields = []
+        for entry in section.get("fields") or []:
+            for name, kind in (entry.items() if isinstance(entry, dict) else [(str(entry), "string")]):
+                label = _label(name)
+                fields.append(LayoutField(name=name, label=label, kind=str(kind), tokens=_tokens(label)))
+        roles = tuple(str(role) for role in section.get("roles") or [])
+        if roles:
+            kind = "signoffs"
+        elif fields and all(f.kind == "boolean" for f in fields):
+            kind = "checklist"
+        else:
+            kind = "fields"
+        sections.append(LayoutSection(title=str(section.get("title", "")), kind=kind, fields=tuple(fields), roles=roles))
+    return PermitLayout(
+        permit_type=str(template.get("permitType", "")),
+        description=str(template.get("description", "")),
+        sections=tuple(sections),
+        source_sha256=source_sha256,
+    )
+
+
+def _template_layout(relative_path: str) -> Optional[PermitLayout]:
+    """Compiled layout of one template file, built once per file version."""
+    snapshot = assets.get_snapshot(relative_path, "yaml")
+    if snapshot is None or not isinstance(snapshot.data, dict):
+        return None
+    return assets.derive(snapshot, "pdf_layout", lambda data: compile_layout(data, snapshot.sha256))
+
+
+def layout_for(permit_type: str) -> PermitLayout:
+    """
+    Get the compiled layout for a permit type.
+
+    Templates are matched on their permitType field (file names do not always
+    follow the type name); unknown types get a generic layout.
+
+    Args:
+        permit_type: Permit type (e.g., "Hot Work")
+
+    Returns:
+        PermitLayout
+    """
+    directory = assets.assets_path() / "permit_templates"
+    for path in sorted(directory.glob("*.yaml")) if directory.is_dir() else []:
+        layout = _template_layout(f"permit_templates/{path.name}")
+        if layout is not None and layout.permit_type.lower() == str(permit_type).lower():
+            return layout
+    return PermitLayout(permit_type=str(permit_type), description="", sections=(), source_sha256="")
+
+
+def _same_word(a: str, b: str) -> bool:
+    """Equal, or one is a prefix of the other (clear/cleared, extinguisher/extinguishers)."""
+    return a == b or (min(len(a), len(b)) >= 4 and (a.startswith(b) or b.startswith(a)))
+
+
+def _matches(field: LayoutField, items: List[str]) -> bool:
+    """Whether a permit control/PPE entry covers a checklist field (all label tokens present)."""
+    if not field.tokens:
+        return False
+    for item in items:
+        item_tokens = set(_tokens(item))
+        if all(any(_same_word(token, t) for t in item_tokens) for token in field.tokens):
+            return True
+    return False
+
+
+class _Writer:
+    """Flows blocks of text down the pages, starting a new page when one is full."""
+
+    def __init__(self, doc: PdfDocument, footer: str):
+        self.doc = doc
+        self.footer = footer
+        self.y = 0.0
+        self.new_page()
+
+    def new_page(self) -> None:
+        self.doc.add_page()
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height: float) -> None:
+        if self.y - height < _FOOTER_Y + 20:
+            self.new_page()
+
+    def heading(self, text: str) -> None:
+        self.ensure(LINE_HEIGHT * 3)
+        self.y -= 8
+        self.doc.rect(MARGIN, self.y - 4, _CONTENT_WIDTH, LINE_HEIGHT + 2, stroke=False, fill_gray=0.88)
+        self.doc.text(MARGIN + 4, self.y, text, size=10.5, bold=True)
+        self.y -= LINE_HEIGHT + 6
+
+    def paragraph(self, text: str, indent: float = 0.0, bold: bool = False, size: float = BODY_SIZE) -> None:
+        for line in wrap(text, _CONTENT_WIDTH - indent, size, bold):
+            self.ensure(LINE_HEIGHT)
+            self.doc.text(MARGIN + indent, self.y, line, size=size, bold=bold)
+            self.y -= LINE_HEIGHT
+
+    def field(self, label: str, value: str) -> None:
+        label_width = 150.0
+        lines = wrap(value, _CONTENT_WIDTH - label_width, BODY_SIZE) if value else [""]
+        self.ensure(LINE_HEIGHT * len(lines))
+        self.doc.text(MARGIN, self.y, f"{label}:", size=BODY_SIZE, bold=True)
+        if not value:
+            # Blank to fill in by hand
+            self.doc.line(MARGIN + label_width, self.y - 2, MARGIN + _CONTENT_WIDTH, self.y - 2)
+        for line in lines:
+            self.doc.text(MARGIN + label_width, self.y, line, size=BODY_SIZE)
+            self.y -= LINE_HEIGHT
+
+    def checkbox(self, label: str, checked: bool) -> None:
+        self.ensure(LINE_HEIGHT)
+        self.doc.rect(MARGIN, self.y - 1.5, 8, 8)
+        if checked:
+            self.doc.text(MARGIN + 1.2, self.y, "X", size=8, bold=True)
+        self.paragraph(label, indent=14)
+
+    def bullets(self, items: List[str], empty: str = "None") -> None:
+        for item in items or [empty]:
+            lines = wrap(str(item), _CONTENT_WIDTH - 14, BODY_SIZE)
+            self.ensure(LINE_HEIGHT * len(lines))
+            self.doc.text(MARGIN + 4, self.y, "-" if items else "", size=BODY_SIZE)
+            for line in lines:
+                self.doc.text(MARGIN + 14, self.y, line, size=BODY_SIZE)
+                self.y -= LINE_HEIGHT
+
+    def signoff(self, role: str) -> None:
+        self.ensure(LINE_HEIGHT * 2.5)
+        self.y -= 6
+        self.doc.text(MARGIN, self.y, role, size=BODY_SIZE, bold=True)
+        for x, caption, width in ((MARGIN + 150, "Name", 120), (MARGIN + 285, "Signature", 120), (MARGIN + 420, "Date/Time", 79)):
+            self.doc.line(x, self.y - 2, x + width, self.y - 2)
+            self.doc.text(x, self.y - 11, caption, size=7)
+        self.y -= LINE_HEIGHT * 1.8
+
+    def finish(self) -> None:
+        total = self.doc.page_count
+        for page in range(total):
+            self.doc.line(MARGIN, _FOOTER_Y + 10, PAGE_WIDTH - MARGIN, _FOOTER_Y + 10, width=0.3, page=page)
+            text = f"{self.footer} - page {page + 1} of {total}"
+            self.doc.text(PAGE_WIDTH - MARGIN - text_width(text, 7), _FOOTER_Y, text, size=7, page=page)
+
+
+def render_permit_pdf(
+    layout: PermitLayout,
+    permit: Dict[str, Any],
+    validation: Optional[Dict[str, Any]] = None,
+    work_order: Optional[Dict[str, Any]] = None,
+    content_hash: str = ""
+) -> bytes:
+    """
+    Render a printable permit pack: template sections, permit content, validation and sign-offs.
+
+    Checklist items from the template are ticked when the permit's controls or
+    PPE cover them; anything else is left blank to complete on site.
+
+    Args:
+        layout: Compiled layout for the permit type
+        permit: Permit object
+        validation: Validation result object
+        work_order: Work order the permit belongs to (fills work details)
+        content_hash: Content address printed in the footer
+
+    Returns:
+        PDF file content
+    """
+    validation = validation or {}
+    work_order = work_order or {}
+    permit_id = str(permit.get("permitId", "UNKNOWN"))
+    doc = PdfDocument()
+    footer = f"Permit {permit_id}" + (f" - {content_hash[:12]}" if content_hash else "")
+    w = _Writer(doc, footer)
+
+    doc.rect(MARGIN, w.y - 30, _CONTENT_WIDTH, 42, stroke=False, fill_gray=0.2)
+    doc.text(MARGIN + 10, w.y - 6, "PERMIT TO WORK", size=9, bold=True, gray=1)
+    doc.text(MARGIN + 10, w.y - 22, str(permit.get("type") or layout.permit_type), size=16, bold=True, gray=1)
+    status = str(validation.get("validationStatus", "Not validated"))
+    label = f"{permit_id}   |   {status}"
+    doc.text(MARGIN + _CONTENT_WIDTH - 10 - text_width(label, 10, True), w.y - 22, label, size=10, bold=True, gray=1)
+    w.y -= 48
+    if layout.description:
+        w.paragraph(layout.description)
+    w.field("Work order", str(work_order.get("workOrderId", "")))
+    w.field("Validity", f"{permit.get('validityHours', '')} hours")
+
+    items = [str(c) for c in permit.get("controls", [])] + [str(p) for p in permit.get("ppe", [])]
+    signoff_roles = list(permit.get("signOffRoles") or [])
+    for section in layout.sections:
+        if section.kind == "signoffs":
+            signoff_roles += [role for role in section.roles if role not in signoff_roles]
+            continue
+        w.heading(section.title)
+        for field in section.fields:
+            if section.kind == "checklist" or field.kind == "boolean":
+                w.checkbox(field.label, _matches(field, items))
+                continue
+            value = permit.get(field.name)
+            if value is None:
+                value = next((work_order[k] for k in _WORK_ORDER_FIELDS.get(field.name, ()) if work_order.get(k)), "")
+            w.field(field.label, ", ".join(map(str, value)) if isinstance(value, list) else str(value))
+
+    w.heading("Hazards")
+    w.bullets([str(h) for h in permit.get("hazardsLinked", [])])
+    w.heading("Required Controls")
+    w.bullets([str(c) for c in permit.get("controls", [])])
+    w.heading("Required PPE")
+    w.bullets([str(p) for p in permit.get("ppe", [])])
+    if permit.get("attachmentsRequired"):
+        w.heading("Attachments Required")
+        w.bullets([str(a) for a in permit["attachmentsRequired"]])
+
+    w.heading(f"Validation: {status}")
+    for title, key in (("Errors", "errors"), ("Warnings", "warnings"), ("Recommendations", "recommendations")):
+        if validation.get(key):
+            w.paragraph(title, bold=True)
+            w.bullets([str(v) for v in validation[key]])
+    for check in validation.get("checks", []):
+        if isinstance(check, dict):
+            w.paragraph(f"[{str(check.get('result', '')).upper()}] {check.get('check', '')}: {check.get('details', '')}")
+
+    w.heading("Sign-offs")
+    for role in signoff_roles:
+        w.signoff(str(role))
+    w.finish()
+    return doc.to_bytes(title=f"Permit {permit_id}", author="PermitFlow")
+
+
+def content_address(
+    layout: PermitLayout,
+    permit: Dict[str, Any],
+    validation: Optional[Dict[str, Any]],
+    work_order: Optional[Dict[str, Any]]
+) -> str:
+    """
+    Hash everything that determines a rendered PDF.
+
+    Args:
+        layout: Compiled layout (its template hash is included)
+        permit: Permit object
+        validation: Validation result object
+        work_order: Work order
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {
+            "renderer": RENDERER_VERSION,
+            "template": layout.source_sha256,
+            "permit": permit,
+            "validation": validation or {},
+            "workOrder": work_order or {},
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,90 @@
+"""Storage targets for rendered permit PDFs: a local directory, or a GCS bucket."""
+
+from typing import Optional
+from pathlib import Path
+import os
+import tempfile
+
+from ..config.settings import GCS_BUCKET, GCS_PDF_PREFIX, PDF_OUTPUT_DIR
+
+
+class LocalStorage:
+    """PDFs in a local directory (development, batch print runs, stand-in for GCS)."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def url(self, name: str) -> str:
+        return (self.directory / name).resolve().as_uri()
+
+    def exists(self, name: str) -> bool:
+        return (self.directory / name).exists()
+
+    def put(self, name: str, data: bytes) -> str:
+        """Store a PDF (atomically, so readers never see a partial file) and return its URL."""
+        path = self.directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per call: concurrent renders of one permit in a process must not share it
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600; PDFs are served to other users
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return self.url(name)
+
+
+class GCSStorage:
+    """PDFs in a Google Cloud Storage bucket under a prefix."""
+
+    def __init__(self, bucket: str, prefix: str = ""):
+        try:
+            from google.cloud import storage
+        except ImportError:
+            raise ImportError("PDF_STORAGE=gcs requires google-cloud-storage") from None
+        self.bucket_name = bucket
+        self.prefix = prefix.strip("/")
+        self._bucket = storage.Client().bucket(bucket)
+
+    def _blob_name(self, name: str) -> str:
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    def url(self, name: str) -> str:
+        return f"gs://{self.bucket_name}/{self._blob_name(name)}"
+
+    def exists(self, name: str) -> bool:
+        return self._bucket.blob(self._blob_name(name)).exists()
+
+    def put(self, name: str, data: bytes) -> str:
+        """Upload a PDF unless the object already exists (content-addressed names never change) and return its URL."""
+        from google.api_core.exceptions import PreconditionFailed
+
+        try:
+            self._bucket.blob(self._blob_name(name)).upload_from_string(
+                data, content_type="application/pdf", if_generation_match=0
+            )
+        except PreconditionFailed:
+            pass  # Another worker stored the same content first
+        return self.url(name)
+
+
+def create_storage(backend: str = "local", location: Optional[str] = None):
+    """
+    Create a PDF storage target.
+
+    Args:
+        backend: "local" or "gcs"
+        location: Directory (local) or bucket (gcs); defaults to PDF_OUTPUT_DIR / GCS_BUCKET
+
+    Returns:
+        LocalStorage or GCSStorage
+    """
+    if backend == "gcs":
+        return GCSStorage(location or GCS_BUCKET, GCS_PDF_PREFIX)
+    if backend == "local":
+        return LocalStorage(location or PDF_OUTPUT_DIR or os.path.join(tempfile.gettempdir(), "permitflow_pdfs"))
+    raise ValueError(f"Unknown PDF storage backend: {backend}")
@@ -0,0 +1,208 @@
+"""Minimal pure-Python PDF writer: text, lines and boxes in the standard Helvetica fonts.
+
+Output is deterministic (no timestamps or random IDs), so identical content
+always produces identical bytes.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import zlib
+
+
+# A4 portrait, in points
+PAGE_WIDTH = 595.0
+PAGE_HEIGHT = 842.0
+
+FONTS = {"regular": ("F1", "Helvetica"), "bold": ("F2", "Helvetica-Bold")}
+
+# Helvetica advance widths (1/1000 em) for ASCII 32..126, from the standard AFM metrics
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+# Helvetica-Bold runs about 5% wider on average; close enough for wrapping
+_BOLD_FACTOR = 1.06
+
+
+def _encode(text: str) -> bytes:
+    """Encode text for a WinAnsiEncoding font (unsupported characters become '?')."""
+    return str(text).encode("cp1252", errors="replace")
+
+
+def _escape(data: bytes) -> bytes:
+    """Escape a PDF literal string."""
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"").replace(b"\n", b" ")
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """
+    Width of a line of text in points.
+
+    Args:
+        text: Text to measure
+        size: Font size in points
+        bold: Helvetica-Bold instead of Helvetica
+
+    Returns:
+        Advance width in points
+    """
+    units = sum(_HELVETICA_WIDTHS[c - 32] if 32 <= c <= 126 else 556 for c in _encode(text))
+    return units * size / 1000 * (_BOLD_FACTOR if bold else 1.0)
+
+
+def wrap(text: str, width: float, size: float, bold: bool = False) -> List[str]:
+    """
+    Break text into lines that fit a width (words longer than a line are split).
+
+    Args:
+        text: Text to wrap
+        width: Available width in points
+        size: Font size in points
+        bold: Helvetica-Bold instead of Helvetica
+
+    Returns:
+        Lines (at least one, possibly empty)
+    """
+    lines: List[str] = []
+    for paragraph in str(text).splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if text_width(candidate, size, bold) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            while text_width(word, size, bold) > width and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], size, bold) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+    return lines
+
+
+class PdfDocument:
+    """
+    A PDF built page by page from drawing operations.
+
+    Coordinates are in points from the bottom-left corner of the page.
+    """
+
+    def __init__(self, width: float = PAGE_WIDTH, height: float = PAGE_HEIGHT):
+        self.width = width
+        self.height = height
+        self._pages: List[List[bytes]] = []
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def add_page(self) -> int:
+        """Start a new page; drawing goes to it. Returns its index."""
+        self._pages.append([])
+        return len(self._pages) - 1
+
+    def _ops(self, page: Optional[int]) -> List[bytes]:
+        if not self._pages:
+            self.add_page()
+        return self._pages[-1 if page is None else page]
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text: str,
+        size: float = 10,
+        bold: bool = False,
+        gray: float = 0.0,
+        page: Optional[int] = None
+    ) -> None:
+        """Draw one line of text with its baseline at (x, y), in a gray level (0 black .. 1 white)."""
+        font = FONTS["bold" if bold else "regular"][0]
+        op = b"BT /%s %.2f Tf %.2f %.2f Td (%s) Tj ET" % (font.encode(), size, x, y, _escape(_encode(text)))
+        self._ops(page).append(b"q %.2f g %s Q" % (gray, op) if gray else op)
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, width: float = 0.5, page: Optional[int] = None) -> None:
+        """Draw a straight line."""
+        self._ops(page).append(b"%.2f w %.2f %.2f m %.2f %.2f l S" % (width, x1, y1, x2, y2))
+
+    def rect(
+        self,
+        x: float,
+        y: float,
+        w: float,
+        h: float,
+        stroke: bool = True,
+        fill_gray: Optional[float] = None,
+        page: Optional[int] = None
+    ) -> None:
+        """Draw a rectangle from its bottom-left corner, optionally filled with a gray level (0 black .. 1 white)."""
+        ops = self._ops(page)
+        if fill_gray is not None:
+            ops.append(b"q %.2f g %.2f %.2f %.2f %.2f re f Q" % (fill_gray, x, y, w, h))
+        if stroke:
+            ops.append(b"0.5 w %.2f %.2f %.2f %.2f re S" % (x, y, w, h))
+
+    def to_bytes(self, title: str = "", author: str = "") -> bytes:
+        """
+        Serialize the document.
+
+        Args:
+            title: Document title (Info dictionary)
+            author: Document author (Info dictionary)
+
+        Returns:
+            PDF file content
+        """
+        if not self._pages:
+            self.add_page()
+        objects: Dict[int, bytes] = {}
+        font_ids = {}
+        next_id = 3  # 1 = catalog, 2 = page tree
+        for name, base_font in FONTS.values():
+            font_ids[name] = next_id
+            objects[next_id] = (
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font.encode()
+            )
+            next_id += 1
+        fonts = b" ".join(b"/%s %d 0 R" % (name.encode(), oid) for name, oid in font_ids.items())
+
+        page_ids = []
+        for ops in self._pages:
+            content = zlib.compress(b"\n".join(ops), 6)
+            content_id, page_id = next_id, next_id + 1
+            next_id += 2
+            objects[content_id] = b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content)
+            objects[page_id] = (
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /Font << %s >> >> /Contents %d 0 R >>"
+                % (self.width, self.height, fonts, content_id)
+            )
+            page_ids.append(page_id)
+        objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+        objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % pid for pid in page_ids), len(page_ids)
+        )
+        info_id = next_id
+        objects[info_id] = b"<< /Title (%s) /Author (%s) /Producer (PermitFlow) >>" % (
+            _escape(_encode(title)), _escape(_encode(author))
+        )
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets: List[Tuple[int, int]] = []
+        for oid in sorted(objects):
+            offsets.append((oid, len(out)))
+            out += b"%d 0 obj\n%s\nendobj\n" % (oid, objects[oid])
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for _, offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+            len(objects) + 1, info_id, xref
+        )
+        return bytes(out)
@@ -1,11 +1,186 @@
 """Vertex AI RAG Engine tool - custom function tool."""
 
+import copy
+import json
 import os
-from typing import Dict, Any, List, Optional
+import re
+import threading
+from typing import Dict, Any, Hashable, List, Optional
 from google.adk.tools import FunctionTool
-from ..config.settings import GCP_PROJECT_ID, GCP_REGION, RAG_CORPUS
+from ..config.settings import (
+    GCP_PROJECT_ID, GCP_REGION, RAG_CORPUS, VECTOR_STORE_TYPE, RAG_LOCAL_FALLBACK,
+    RAG_CACHE_ENABLED, RAG_CACHE_MAX_ENTRIES, RAG_CACHE_MAX_BYTES, RAG_CACHE_TTL_SECONDS, RAG_CACHE_NORMALIZE,
+)
+from .cache import TTLCache
+from ..observability.tracing import traced_tool
 
 
+# Retrieval result cache; only successful backend results are stored, never fallbacks
+_result_cache = TTLCache(
+    max_entries=RAG_CACHE_MAX_ENTRIES,
+    max_bytes=RAG_CACHE_MAX_BYTES,
+    ttl_seconds=RAG_CACHE_TTL_SECONDS,
+)
+_cache_snapshot: Optional[Hashable] = None
+_cache_snapshot_lock = threading.Lock()
+
+_QUERY_TOKEN = re.compile(r"[a-z0-9]+(?:[-/.][a-z0-9]+)*")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "to", "with",
+})
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for cache lookups: lowercase, punctuation/whitespace
+    collapsed, stopwords dropped. Identifiers like "CR-TF-004A" stay intact.
+    """
+    tokens = _QUERY_TOKEN.findall(query.lower())
+    kept = [t for t in tokens if t not in _STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def _cache_key(query: str, namespace: Optional[str], top_k: int, filters: Optional[Dict[str, Any]]) -> Hashable:
+    """Build the result cache key for a search."""
+    return (
+        normalize_query(query) if RAG_CACHE_NORMALIZE else query,
+        namespace,
+        top_k,
+        json.dumps(filters, sort_keys=True, default=str) if filters else None,
+    )
+
+
+def _current_snapshot() -> Hashable:
+    """
+    Identify the corpus version results were computed against.
+
+    Combines RAG_SNAPSHOT (set by the RAG job, read live so a redeploy-free
+    update takes effect), the backend and, for the local backend, the version
+    of the index files or rag_data the index is built from.
+    """
+    snapshot = os.getenv("RAG_SNAPSHOT")
+    if VECTOR_STORE_TYPE == "local":
+        from .rag_index import local_index_version
+        return (snapshot, "local", local_index_version())
+    return (snapshot, VECTOR_STORE_TYPE)
+
+
+def _check_snapshot() -> None:
+    """Invalidate the result cache when the corpus snapshot changed."""
+    global _cache_snapshot
+    snapshot = _current_snapshot()
+    if snapshot != _cache_snapshot:
+        with _cache_snapshot_lock:
+            if snapshot != _cache_snapshot:
+                _result_cache.invalidate()
+                _cache_snapshot = snapshot
+
+
+def rag_cache_stats() -> Dict[str, Any]:
+    """
+    Get RAG result cache metrics.
+    
+    Returns:
+        Dictionary with hits, misses, hitRate, evictions, expirations, entries and bytes
+    """
+    return _result_cache.stats()
+
+
+def _local_search(
+    query: str,
+    namespace: Optional[str],
+    top_k: int,
+    filters: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Search the in-process local index built from assets/rag_data.
+    
+    Returns:
+        Dictionary in the same format as the Vertex AI results
+    """
+    # Imported on first use: the index module pulls in numpy (see startup.warm_up)
+    from .rag_index import get_local_index
+
+    # Namespace and filters narrow the candidate set before similarity scoring
+    results = get_local_index().search(query, top_k=top_k, namespace=namespace, filters=filters)
+    return {
+        "results": results,
+        "query": query,
+        "namespace": namespace,
+        "total": len(results)
+    }
+
+
+def _vertex_search(
+    query: str,
+    namespace: Optional[str],
+    top_k: int,
+    filters: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Search the Vertex AI RAG corpus.
+    
+    Returns:
+        Dictionary with search results
+    
+    Raises:
+        ValueError: If no RAG corpus is configured
+    """
+    # Try to use Vertex AI RAG API
+    from vertexai.preview import rag
+    
+    rag_corpus_resource = os.getenv("RAG_CORPUS")
+    
+    if not rag_corpus_resource and GCP_PROJECT_ID:
+        location = GCP_REGION
+        corpus = RAG_CORPUS or "permitflowai-corpus"
+        rag_corpus_resource = f"projects/{GCP_PROJECT_ID}/locations/{location}/ragCorpora/{corpus}"
+    
+    if rag_corpus_resource:
+        # Create RAG resource
+        rag_resource = rag.RagResource(rag_corpus=rag_corpus_resource)
+        
+        # Use Vertex AI RAG retrieve_context
+        from vertexai.preview.rag import retrieve_context
+        
+        retrieval_config = rag.RetrievalConfig(
+            similarity_top_k=top_k,
+            vector_distance_threshold=0.6,
+        )
+        
+        contexts = retrieve_context(
+            rag_resources=[rag_resource],
+            query=query,
+            config=retrieval_config,
+        )
+        
+        # Format results
+        results = []
+        for i, context in enumerate(contexts):
+            results.append({
+                "id": f"rag_result_{i}",
+                "title": getattr(context, "title", f"Result {i+1}"),
+                "snippet": getattr(context, "text", str(context)),
+                "score": getattr(context, "score", 0.8),
+                "meta": {
+                    "source": getattr(context, "source", ""),
+                    "namespace": namespace or "default"
+                }
+            })
+        
+        return {
+            "results": results,
+            "query": query,
+            "namespace": namespace,
+            "total": len(results)
+        }
+    else:
+        # RAG not configured; rag_search falls back to the local index or mock data
+        raise ValueError("RAG_CORPUS not configured")
+
+
+@traced_tool
 def rag_search(
     query: str,
     namespace: Optional[str] = None,
@@ -25,60 +200,38 @@ def rag_search(
     Returns:
         Dictionary with search results containing id, title, snippet, score, and meta fields
     """
+    key = None
+    if RAG_CACHE_ENABLED:
+        try:
+            _check_snapshot()
+            key = _cache_key(query, namespace, top_k, filters)
+            cached = _result_cache.get(key)
+            if cached is not None:
+                # Copy so callers cannot mutate the cached entry; echo this caller's query
+                return {**copy.deepcopy(cached), "query": query}
+        except Exception:
+            key = None
+    
     try:
-        # Try to use Vertex AI RAG API
-        from vertexai.preview import rag
-        
-        rag_corpus_resource = os.getenv("RAG_CORPUS")
-        
-        if not rag_corpus_resource and GCP_PROJECT_ID:
-            location = GCP_REGION
-            corpus = RAG_CORPUS or "permitflowai-corpus"
-            rag_corpus_resource = f"projects/{GCP_PROJECT_ID}/locations/{location}/ragCorpora/{corpus}"
-        
-        if rag_corpus_resource:
-            # Create RAG resource
-            rag_resource = rag.RagResource(rag_corpus=rag_corpus_resource)
-            
-            # Use Vertex AI RAG retrieve_context
-            from vertexai.preview.rag import retrieve_context
-            
-            retrieval_config = rag.RetrievalConfig(
-                similarity_top_k=top_k,
-                vector_distance_threshold=0.6,
-            )
-            
-            contexts = retrieve_context(
-                rag_resources=[rag_resource],
-                query=query,
-                config=retrieval_config,
-            )
-            
-            # Format results
-            results = []
-            for i, context in enumerate(contexts):
-                results.append({
-                    "id": f"rag_result_{i}",
-                    "title": getattr(context, "title", f"Result {i+1}"),
-                    "snippet": getattr(context, "text", str(context)),
-                    "score": getattr(context, "score", 0.8),
-                    "meta": {
-                        "source": getattr(context, "source", ""),
-                        "namespace": namespace or "default"
-                    }
-                })
-            
-            return {
-                "results": results,
-                "query": query,
-                "namespace": namespace,
-                "total": len(results)
-            }
+        if VECTOR_STORE_TYPE == "local":
+            result = _local_search(query, namespace, top_k, filters)
         else:
-            # RAG not configured, return mock data
-            raise ValueError("RAG_CORPUS not configured")
-            
+            result = _vertex_search(query, namespace, top_k, filters)
+        if key is not None:
+            _result_cache.set(key, copy.deepcopy(result))
+        return result
     except Exception as e:
+        if RAG_LOCAL_FALLBACK and VECTOR_STORE_TYPE != "local":
+            # Vertex AI unavailable: answer from the local index instead of mock data
+            try:
+                result = _local_search(query, namespace, top_k, filters)
+                for item in result["results"]:
+                    item["meta"]["note"] = "Vertex AI RAG unavailable, using local index"
+                    item["meta"]["error"] = str(e) if str(e) else None
+                return result
+            except Exception:
+                pass
+        
         # Fallback: return mock data if RAG is not configured or fails
         return {
             "results": [
@@ -0,0 +1,133 @@
+"""Build RAG documents from the incidents and historical permits data.
+
+Standard library only, so the corpus setup scripts can import it without the agent runtime.
+Records are streamed from the exports, so memory does not grow with file size.
+"""
+
+import os
+from pathlib import Path
+
+from .jsonstream import iter_json_array, iter_json_lines
+
+
+def _rag_data_path(name: str) -> Path:
+    """Locate assets/rag_data/<name>.jsonl, or <name>.json when there is no JSON Lines export."""
+    assets_path = os.getenv("ASSETS_PATH", "/app/assets")
+    if not os.path.exists(assets_path):
+        current_dir = Path(__file__).parent.parent
+        assets_path = current_dir / "assets"
+    jsonl_file = Path(assets_path) / "rag_data" / f"{name}.jsonl"
+    return jsonl_file if jsonl_file.exists() else Path(assets_path) / "rag_data" / f"{name}.json"
+
+
+def iter_records(path, key):
+    """
+    Stream records from a JSON export.
+
+    Args:
+        path: A .jsonl file (one record per line) or a .json file
+        key: Top-level key of the record array in a .json file (e.g., "incidents")
+
+    Yields:
+        Record dictionaries, one at a time
+    """
+    if str(path).endswith(".jsonl"):
+        yield from iter_json_lines(str(path))
+    else:
+        yield from iter_json_array(str(path), key)
+
+
+def load_rag_data(incidents_path=None, permits_path=None):
+    """
+    Open the incidents and historical permits exports as record streams.
+
+    Args:
+        incidents_path: Incidents export (default: assets/rag_data/incidents.jsonl or .json)
+        permits_path: Historical permits export (default: assets/rag_data/historical_permits.jsonl or .json)
+
+    Returns:
+        Tuple of (incidents iterator, historical permits iterator); records are
+        parsed lazily as the iterators are consumed
+    """
+    incidents = iter_records(incidents_path or _rag_data_path("incidents"), "incidents")
+    permits = iter_records(permits_path or _rag_data_path("historical_permits"), "historicalPermits")
+    return incidents, permits
+
+
+def create_rag_documents(incidents, permits):
+    """
+    Convert incidents and permits into RAG document format.
+
+    Args:
+        incidents: Iterable of incident records
+        permits: Iterable of historical permit records
+
+    Yields:
+        Documents formatted for RAG ingestion, one per record
+    """
+    # Process incidents
+    for incident in incidents:
+        # Create document text with metadata
+        doc_text = f"""
+Title: {incident.get('title', '')}
+Site: {incident.get('site', '')}
+Area: {incident.get('area', '')}
+Date: {incident.get('date', '')}
+Severity: {incident.get('severity', '')}
+
+Summary: {incident.get('summary', '')}
+
+Description: {incident.get('description', '')}
+
+Hazards: {', '.join(incident.get('hazards', []))}
+Root Cause: {incident.get('rootCause', '')}
+Lessons Learned: {incident.get('lessonsLearned', '')}
+"""
+        yield {
+            "text": doc_text.strip(),
+            "metadata": {
+                "namespace": "incidents",
+                "id": incident.get("id"),
+                "title": incident.get("title"),
+                "site": incident.get("site"),
+                "area": incident.get("area"),
+                "date": incident.get("date"),
+                "severity": incident.get("severity"),
+                "tags": ",".join(incident.get("tags", []))
+            }
+        }
+    
+    # Process historical permits
+    for permit in permits:
+        doc_text = f"""
+Title: {permit.get('title', '')}
+Site: {permit.get('site', '')}
+Area: {permit.get('area', '')}
+Permit Type: {permit.get('permitType', '')}
+Date: {permit.get('date', '')}
+Status: {permit.get('status', '')}
+
+Summary: {permit.get('summary', '')}
+
+Description: {permit.get('description', '')}
+
+Hazards: {', '.join(permit.get('hazards', []))}
+Controls: {', '.join(permit.get('controls', []))}
+PPE: {', '.join(permit.get('ppe', []))}
+Sign-off Roles: {', '.join(permit.get('signOffRoles', []))}
+Validity Hours: {permit.get('validityHours', '')}
+Outcome: {permit.get('outcome', '')}
+"""
+        yield {
+            "text": doc_text.strip(),
+            "metadata": {
+                "namespace": "historical_permits",
+                "id": permit.get("id"),
+                "title": permit.get("title"),
+                "site": permit.get("site"),
+                "area": permit.get("area"),
+                "permitType": permit.get("permitType"),
+                "date": permit.get("date"),
+                "status": permit.get("status")
+            }
+        }
@@ -0,0 +1,609 @@
+"""Local in-process vector index for RAG retrieval (flat and HNSW), persisted as memory-mapped files."""
+
+from typing import Dict, Any, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+from array import array
+from pathlib import Path
+import heapq
+import json
+import math
+import mmap
+import os
+import random
+import re
+import struct
+import threading
+import zlib
+
+from . import assets
+from .rag_corpus import create_rag_documents
+from .rag_lexical import BM25Index, reciprocal_rank_fusion
+from ..config.settings import RAG_INDEX_PATH, RAG_INDEX_TYPE, RAG_EMBEDDING_DIM, RAG_RETRIEVAL_MODE
+
+try:
+    import numpy as np
+except ImportError:  # Optional: falls back to pure-Python array math
+    np = None
+
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_HEADER = struct.Struct("<4sIII")  # magic, format version, dim, count
+_MAGIC = b"PFVI"
+_FORMAT_VERSION = 1
+
+# Above this many documents "auto" switches from exact flat search to HNSW
+AUTO_HNSW_THRESHOLD = 5000
+
+# Hybrid search fuses this many candidates per retriever (at least top_k)
+HYBRID_DEPTH = 50
+
+
+def embed(text: str, dim: int = 256) -> List[float]:
+    """
+    Embed text with signed feature hashing over word unigrams and bigrams.
+
+    Deterministic and dependency-free, so indexes build offline and queries
+    need no model call. Vectors are L2-normalized (dot product = cosine).
+
+    Args:
+        text: Text to embed
+        dim: Vector dimension
+
+    Returns:
+        List of dim floats
+    """
+    vec = [0.0] * dim
+    tokens = _TOKEN.findall(text.lower())
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vec[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm:
+        vec = [v / norm for v in vec]
+    return vec
+
+
+class VectorStore:
+    """Row-major float32 vectors, backed by NumPy when available and array('f') otherwise."""
+
+    def __init__(self, dim: int, data: Any = None, count: int = 0):
+        self.dim = dim
+        self.count = count
+        # NumPy: (capacity, dim) matrix whose first count rows are valid (possibly a
+        # read-only memory map until the first append); else flat array('f')
+        if data is None:
+            data = np.zeros((0, dim), dtype=np.float32) if np is not None else array("f")
+        self._data = data
+
+    def append(self, vector: Sequence[float]) -> int:
+        """Append a vector and return its row number."""
+        if np is not None:
+            if self.count == self._data.shape[0] or not self._data.flags.writeable:
+                # Grow geometrically so appends stay amortized O(dim)
+                grown = np.zeros((max(16, self.count * 2), self.dim), dtype=np.float32)
+                grown[:self.count] = self._data[:self.count]
+                self._data = grown
+            self._data[self.count] = vector
+        else:
+            self._data.extend(vector)
+        self.count += 1
+        return self.count - 1
+
+    def _matrix(self) -> Any:
+        """Get the valid rows as a (count, dim) matrix."""
+        return self._data[:self.count]
+
+    def row(self, i: int) -> Any:
+        """Get one vector."""
+        if np is not None:
+            return self._matrix()[i]
+        return self._data[i * self.dim:(i + 1) * self.dim]
+
+    def dot(self, query: Sequence[float], rows: Optional[Sequence[int]] = None) -> List[float]:
+        """
+        Dot products of a query with stored vectors.
+
+        Args:
+            query: Query vector
+            rows: Row numbers to score (None scores every row)
+
+        Returns:
+            Scores in the order of rows
+        """
+        if np is not None:
+            matrix = self._matrix()
+            q = np.asarray(query, dtype=np.float32)
+            if rows is None:
+                return (matrix @ q).tolist()
+            return (matrix[np.asarray(rows, dtype=np.int64)] @ q).tolist() if len(rows) else []
+        dim = self.dim
+        data = self._data
+        indices = range(self.count) if rows is None else rows
+        return [sum(a * b for a, b in zip(data[i * dim:(i + 1) * dim], query)) for i in indices]
+
+    def save(self, path: str) -> None:
+        """Write the vectors to a binary file (header + float32 rows)."""
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, self.dim, self.count))
+            if np is not None:
+                f.write(np.ascontiguousarray(self._matrix(), dtype=np.float32).tobytes())
+            else:
+                f.write(self._data.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> "VectorStore":
+        """Memory-map a vector file written by save()."""
+        with open(path, "rb") as f:
+            magic, version, dim, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError(f"Not a vector index file: {path}")
+            if count == 0:
+                return cls(dim)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if np is not None:
+            data = np.frombuffer(mapped, dtype=np.float32, count=count * dim, offset=_HEADER.size).reshape(count, dim)
+        else:
+            data = array("f", memoryview(mapped)[_HEADER.size:_HEADER.size + count * dim * 4].cast("f"))
+        return cls(dim, data=data, count=count)
+
+
+class HNSWIndex:
+    """Hierarchical navigable small-world graph for approximate inner-product search."""
+
+    def __init__(self, vectors: VectorStore, m: int = 16, ef_construction: int = 100, ef_search: int = 64, seed: int = 42):
+        self.vectors = vectors
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_mult = 1 / math.log(m)
+        self._random = random.Random(seed)
+        # neighbors[node][level] -> list of node ids
+        self.neighbors: List[List[List[int]]] = []
+        self.entry_point = -1
+        self.max_level = -1
+
+    def _search_layer(self, query: Sequence[float], entry_points: List[int], ef: int, level: int) -> List[Tuple[float, int]]:
+        """Best-first search of one layer; returns up to ef (score, node) pairs."""
+        visited = set(entry_points)
+        scores = self.vectors.dot(query, entry_points)
+        candidates = [(-s, n) for s, n in zip(scores, entry_points)]
+        heapq.heapify(candidates)
+        results = [(s, n) for s, n in zip(scores, entry_points)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_score < results[0][0]:
+                break
+            fresh = [n for n in self.neighbors[node][level] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            for score, n in zip(self.vectors.dot(query, fresh), fresh):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(candidates, (-score, n))
+                    heapq.heappush(results, (score, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return results
+
+    def add(self, node: int) -> None:
+        """Insert an already-stored vector row into the graph."""
+        query = self.vectors.row(node)
+        level = int(-math.log(1.0 - self._random.random()) * self._level_mult)
+        self.neighbors.append([[] for _ in range(level + 1)])
+
+        if self.entry_point < 0:
+            self.entry_point, self.max_level = node, level
+            return
+
+        entry = [self.entry_point]
+        for lvl in range(self.max_level, level, -1):
+            entry = [max(self._search_layer(query, entry, 1, lvl))[1]]
+
+        for lvl in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(query, entry, self.ef_construction, lvl)
+            max_links = self.m * 2 if lvl == 0 else self.m
+            chosen = [n for _, n in heapq.nlargest(self.m, found)]
+            self.neighbors[node][lvl] = chosen
+            for n in chosen:
+                links = self.neighbors[n][lvl]
+                links.append(node)
+                if len(links) > max_links:
+                    # Keep the neighbor's closest links
+                    scores = self.vectors.dot(self.vectors.row(n), links)
+                    self.neighbors[n][lvl] = [x for _, x in heapq.nlargest(max_links, zip(scores, links))]
+            entry = [n for _, n in found]
+
+        if level > self.max_level:
+            self.entry_point, self.max_level = node, level
+
+    def search(self, query: Sequence[float], k: int, ef: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        Approximate top-k search.
+
+        Args:
+            query: Query vector
+            k: Number of results
+            ef: Search breadth (default: max(ef_search, k))
+
+        Returns:
+            List of (score, node) pairs, best first
+        """
+        if self.entry_point < 0:
+            return []
+        entry = [self.entry_point]
+        for lvl in range(self.max_level, 0, -1):
+            entry = [max(self._search_layer(query, entry, 1, lvl))[1]]
+        found = self._search_layer(query, entry, max(ef or self.ef_search, k), 0)
+        return heapq.nlargest(k, found)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize graph parameters and links."""
+        return {
+            "m": self.m,
+            "efConstruction": self.ef_construction,
+            "efSearch": self.ef_search,
+            "entryPoint": self.entry_point,
+            "maxLevel": self.max_level,
+            "neighbors": self.neighbors,
+        }
+
+    @classmethod
+    def from_dict(cls, vectors: VectorStore, data: Dict[str, Any]) -> "HNSWIndex":
+        """Restore a graph serialized by to_dict()."""
+        index = cls(vectors, m=data["m"], ef_construction=data["efConstruction"], ef_search=data["efSearch"])
+        index.entry_point = data["entryPoint"]
+        index.max_level = data["maxLevel"]
+        index.neighbors = data["neighbors"]
+        return index
+
+
+# Metadata fields with postings lists; "tags" is split on commas
+INDEXED_FIELDS = ("namespace", "site", "area", "severity", "permitType", "status", "tags")
+
+# Filtered HNSW searches with at most this many candidates are answered exactly by brute force
+FILTER_BRUTE_FORCE_LIMIT = 20000
+
+
+def _field_values(field: str, value: Any) -> List[str]:
+    """Normalized postings keys for one metadata value."""
+    if value is None:
+        return []
+    if field == "tags" and isinstance(value, str):
+        value = value.split(",")
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip().lower() for v in value if str(v).strip()]
+    return [str(value).strip().lower()]
+
+
+class MetadataIndex:
+    """Inverted index from (field, value) to ascending row numbers."""
+
+    def __init__(self):
+        self.postings: Dict[Tuple[str, str], array] = {}
+
+    def add(self, row: int, metadata: Dict[str, Any]) -> None:
+        """Index one document's metadata (rows must be added in increasing order)."""
+        for field in INDEXED_FIELDS:
+            for value in set(_field_values(field, metadata.get(field))):
+                self.postings.setdefault((field, value), array("I")).append(row)
+
+    def candidates(self, filters: Dict[str, Any]) -> Optional[List[int]]:
+        """
+        Rows matching every indexed filter (any of the values given per field).
+
+        Args:
+            filters: Field -> value or list of values; non-indexed fields are ignored here
+
+        Returns:
+            Sorted row numbers, or None when no filter field is indexed
+        """
+        result: Optional[set] = None
+        for field, value in filters.items():
+            if field not in INDEXED_FIELDS or value is None:
+                continue
+            rows: set = set()
+            for key in _field_values(field, value):
+                rows.update(self.postings.get((field, key), ()))
+            result = rows if result is None else result & rows
+            if not result:
+                return []
+        return sorted(result) if result is not None else None
+
+
+def _matches(metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Check filters on non-indexed fields against a document's metadata."""
+    for field, value in filters.items():
+        if field in INDEXED_FIELDS or value is None:
+            continue
+        wanted = set(_field_values(field, value))
+        if not wanted & set(_field_values(field, metadata.get(field))):
+            return False
+    return True
+
+
+def _document_key(document: Dict[str, Any]) -> str:
+    """Stable ID for a RAG document ("<namespace>/<id>")."""
+    metadata = document.get("metadata", {})
+    return f"{metadata.get('namespace', 'default')}/{metadata.get('id')}"
+
+
+class LocalRagIndex:
+    """RAG documents plus their vectors, searchable in-process."""
+
+    def __init__(self, dim: int = 256, index_type: str = "flat", vectors: Optional[VectorStore] = None):
+        self.dim = dim
+        self.index_type = index_type
+        self.vectors = vectors or VectorStore(dim)
+        self.documents: List[Dict[str, Any]] = []
+        # Live document key -> row; replaced or removed rows are tombstoned in deleted
+        self.rows: Dict[str, int] = {}
+        self.deleted: Set[int] = set()
+        self.metadata_index = MetadataIndex()
+        self.lexical = BM25Index()
+        self.hnsw: Optional[HNSWIndex] = HNSWIndex(self.vectors) if index_type == "hnsw" else None
+
+    @classmethod
+    def build(cls, documents: Iterable[Dict[str, Any]], index_type: str = "auto", dim: int = 256) -> "LocalRagIndex":
+        """
+        Build an index from documents produced by rag_corpus.create_rag_documents.
+
+        Documents are consumed one at a time, so a generator is never materialized.
+
+        Args:
+            documents: Documents with "text" and "metadata"
+            index_type: "flat" (exact), "hnsw" (approximate) or "auto"
+            dim: Embedding dimension
+
+        Returns:
+            LocalRagIndex
+        """
+        index = cls(dim=dim, index_type="flat" if index_type == "auto" else index_type)
+        index.add_documents(documents)
+        if index_type == "auto" and len(index.documents) > AUTO_HNSW_THRESHOLD:
+            index.index_type = "hnsw"
+            index.hnsw = HNSWIndex(index.vectors)
+            for row in range(len(index.documents)):
+                index.hnsw.add(row)
+        return index
+
+    @property
+    def live_count(self) -> int:
+        """Number of documents not removed."""
+        return len(self.documents) - len(self.deleted)
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """Embed and append documents; a document whose key is already indexed replaces it."""
+        for document in documents:
+            key = _document_key(document)
+            if key in self.rows:
+                self.remove_documents([key])
+            row = self.vectors.append(embed(document.get("text", ""), self.dim))
+            self.documents.append({
+                "key": key,
+                "text": document.get("text", ""),
+                "metadata": document.get("metadata", {}),
+            })
+            self.rows[key] = row
+            self.metadata_index.add(row, self.documents[row]["metadata"])
+            self.lexical.add(self.documents[row]["text"])
+            if self.hnsw is not None:
+                self.hnsw.add(row)
+
+    def remove_documents(self, keys: Iterable[str]) -> int:
+        """
+        Remove documents by key ("<namespace>/<id>").
+
+        Rows are tombstoned and skipped by every search; compact() reclaims them.
+
+        Returns:
+            Number of documents removed
+        """
+        removed = 0
+        for key in keys:
+            row = self.rows.pop(key, None)
+            if row is None:
+                continue
+            self.deleted.add(row)
+            self.lexical.remove(row, self.documents[row]["text"])
+            removed += 1
+        return removed
+
+    def compact(self) -> "LocalRagIndex":
+        """Build a new index from the live documents only, dropping tombstoned rows."""
+        live = (self.documents[row] for row in sorted(self.rows.values()))
+        index = type(self)(dim=self.dim, index_type=self.index_type)
+        index.add_documents({"text": d["text"], "metadata": d["metadata"]} for d in live)
+        return index
+
+    def _result(self, row: int, score: float) -> Dict[str, Any]:
+        """Format one hit like the Vertex AI results of rag_search."""
+        document = self.documents[row]
+        metadata = document["metadata"]
+        return {
+            "id": document["key"],
+            "title": metadata.get("title") or metadata.get("id") or document["key"],
+            "snippet": document["text"][:1000],
+            "score": round(float(score), 4),
+            "meta": {**metadata, "source": "local"},
+        }
+
+    def _filtered_hnsw(self, query_vec: List[float], top_k: int, allowed: set) -> List[Tuple[float, int]]:
+        """HNSW search restricted to allowed rows, widening the beam until top_k are found."""
+        ef = max(self.hnsw.ef_search, top_k)
+        while True:
+            hits = [hit for hit in self.hnsw.search(query_vec, ef, ef=ef) if hit[1] in allowed]
+            if len(hits) >= top_k or ef >= len(self.documents):
+                return hits[:top_k]
+            ef *= 4
+
+    def _vector_hits(self, query: str, top_k: int, candidates: Optional[List[int]]) -> List[Tuple[float, int]]:
+        """Top-k (cosine, row) pairs, restricted to candidates when given."""
+        query_vec = embed(query, self.dim)
+        if candidates is None:
+            # Over-fetch by the tombstone count so removed rows never shorten the result
+            fetch = top_k + len(self.deleted)
+            if self.hnsw is not None:
+                hits = self.hnsw.search(query_vec, fetch)
+            else:
+                hits = heapq.nlargest(fetch, zip(self.vectors.dot(query_vec), range(len(self.documents))))
+            return [hit for hit in hits if hit[1] not in self.deleted][:top_k]
+        if self.hnsw is None or len(candidates) <= FILTER_BRUTE_FORCE_LIMIT:
+            # Exact top-k over the pre-filtered candidates only
+            return heapq.nlargest(top_k, zip(self.vectors.dot(query_vec, candidates), candidates))
+        return self._filtered_hnsw(query_vec, top_k, set(candidates))
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        namespace: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index, narrowing candidates by metadata before scoring.
+
+        Args:
+            query: Query text
+            top_k: Number of results
+            namespace: Optional namespace (e.g., "incidents")
+            filters: Optional metadata filters (e.g., {"site": "Plant-A"});
+                a list value matches any of its entries
+            mode: "vector", "lexical" (BM25) or "hybrid" (both, fused by
+                reciprocal rank); defaults to RAG_RETRIEVAL_MODE
+
+        Returns:
+            List of results with id, title, snippet, score and meta, best first
+            (hybrid scores are RRF scores)
+        """
+        if not self.live_count:
+            return []
+        mode = mode or RAG_RETRIEVAL_MODE
+        filters = dict(filters or {})
+        if namespace:
+            filters["namespace"] = namespace
+
+        candidates = self.metadata_index.candidates(filters) if filters else None
+        if candidates is not None and any(f not in INDEXED_FIELDS for f in filters):
+            candidates = [row for row in candidates if _matches(self.documents[row]["metadata"], filters)]
+        elif candidates is None and filters:
+            candidates = [row for row in range(len(self.documents)) if _matches(self.documents[row]["metadata"], filters)]
+        if candidates is not None and self.deleted:
+            candidates = [row for row in candidates if row not in self.deleted]
+        if candidates is not None and not candidates:
+            return []
+
+        if mode == "vector":
+            hits = self._vector_hits(query, top_k, candidates)
+        elif mode == "lexical":
+            hits = self.lexical.search(query, top_k, set(candidates) if candidates is not None else None)
+        else:
+            depth = max(top_k, HYBRID_DEPTH)
+            lexical_hits = self.lexical.search(query, depth, set(candidates) if candidates is not None else None)
+            hits = reciprocal_rank_fusion([self._vector_hits(query, depth, candidates), lexical_hits])[:top_k]
+        return [self._result(row, score) for score, row in hits]
+
+    def save(self, base_path: str) -> None:
+        """
+        Persist to <base_path>.vectors (memory-mappable float32), <base_path>.lexical
+        (BM25 postings) and <base_path>.json.
+
+        Args:
+            base_path: Path prefix for the two files
+        """
+        Path(base_path).parent.mkdir(parents=True, exist_ok=True)
+        self.vectors.save(f"{base_path}.vectors.tmp")
+        self.lexical.save(f"{base_path}.lexical.tmp")
+        with open(f"{base_path}.json.tmp", "w") as f:
+            json.dump({
+                "dim": self.dim,
+                "indexType": self.index_type,
+                "documents": self.documents,
+                "deleted": sorted(self.deleted),
+                "hnsw": self.hnsw.to_dict() if self.hnsw is not None else None,
+            }, f)
+        os.replace(f"{base_path}.vectors.tmp", f"{base_path}.vectors")
+        os.replace(f"{base_path}.lexical.tmp", f"{base_path}.lexical")
+        os.replace(f"{base_path}.json.tmp", f"{base_path}.json")
+
+    @classmethod
+    def load(cls, base_path: str) -> "LocalRagIndex":
+        """Load an index saved with save(); vectors are memory-mapped, not read."""
+        with open(f"{base_path}.json") as f:
+            data = json.load(f)
+        vectors = VectorStore.load(f"{base_path}.vectors")
+        index = cls(dim=data["dim"], index_type="flat", vectors=vectors)
+        index.index_type = data["indexType"]
+        index.documents = data["documents"]
+        index.deleted = set(data.get("deleted", []))
+        for row, document in enumerate(index.documents):
+            index.metadata_index.add(row, document["metadata"])
+            if row not in index.deleted:
+                index.rows[document["key"]] = row
+        if os.path.exists(f"{base_path}.lexical"):
+            index.lexical = BM25Index.load(f"{base_path}.lexical", len(index.documents))
+        else:  # Saved before lexical search existed
+            for document in index.documents:
+                index.lexical.add(document["text"])
+        if data.get("hnsw"):
+            index.hnsw = HNSWIndex.from_dict(vectors, data["hnsw"])
+        return index
+
+
+_index_lock = threading.Lock()
+_loaded: Dict[str, Tuple[int, LocalRagIndex]] = {}
+
+
+def get_local_index() -> LocalRagIndex:
+    """
+    Get the process-wide local index.
+
+    Loads RAG_INDEX_PATH when it has been built (reloading when the file
+    changes); otherwise builds in memory from assets/rag_data, once per
+    change of the data files.
+
+    Returns:
+        LocalRagIndex
+    """
+    if RAG_INDEX_PATH and os.path.exists(f"{RAG_INDEX_PATH}.json"):
+        mtime = os.stat(f"{RAG_INDEX_PATH}.json").st_mtime_ns
+        cached = _loaded.get(RAG_INDEX_PATH)
+        if cached is None or cached[0] != mtime:
+            with _index_lock:
+                cached = _loaded.get(RAG_INDEX_PATH)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, LocalRagIndex.load(RAG_INDEX_PATH))
+                    _loaded[RAG_INDEX_PATH] = cached
+        return cached[1]
+
+    incidents = assets.get_snapshot("rag_data/incidents.json")
+    permits = assets.get_snapshot("rag_data/historical_permits.json")
+    if incidents is None or permits is None:
+        return LocalRagIndex(dim=RAG_EMBEDDING_DIM)
+
+    def build(incidents_data: Dict[str, Any]) -> LocalRagIndex:
+        documents = create_rag_documents(incidents_data.get("incidents", []), permits.data.get("historicalPermits", []))
+        return LocalRagIndex.build(documents, index_type=RAG_INDEX_TYPE, dim=RAG_EMBEDDING_DIM)
+
+    return assets.derive(incidents, "local_rag_index", build, version=permits.sha256)
+
+
+def local_index_version() -> Hashable:
+    """
+    Identify the data get_local_index() serves, without loading or building it.
+
+    Returns:
+        ("file", path, mtime_ns) for a built RAG_INDEX_PATH, ("rag_data",
+        incidents sha256, permits sha256) for the in-memory index, or None
+        while there is no data
+    """
+    if RAG_INDEX_PATH and os.path.exists(f"{RAG_INDEX_PATH}.json"):
+        return ("file", RAG_INDEX_PATH, os.stat(f"{RAG_INDEX_PATH}.json").st_mtime_ns)
+    incidents = assets.get_snapshot("rag_data/incidents.json")
+    permits = assets.get_snapshot("rag_data/historical_permits.json")
+    if incidents is None or permits is None:
+        return None
+    return ("rag_data", incidents.sha256, permits.sha256)
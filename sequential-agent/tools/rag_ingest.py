@@ -0,0 +1,395 @@
+"""Incremental RAG corpus ingestion: chunking, content hashing, manifest diffing and batched sink updates."""
+
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+
+# Long documents are split on paragraph/sentence boundaries into chunks of at most this many characters
+DEFAULT_CHUNK_CHARS = 4000
+DEFAULT_CHUNK_OVERLAP = 200
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def document_key(document: Dict[str, Any]) -> str:
+    """Stable ID for a RAG document ("<namespace>/<id>"), matching the local index keys."""
+    metadata = document.get("metadata", {})
+    return f"{metadata.get('namespace', 'default')}/{metadata.get('id')}"
+
+
+def document_hash(document: Dict[str, Any]) -> str:
+    """SHA-256 over a document's text and metadata (canonical JSON)."""
+    canonical = json.dumps({"text": document.get("text", ""), "metadata": document.get("metadata", {})},
+                           sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _split_text(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most max_chars, preferring paragraph, then sentence boundaries."""
+    pieces: List[str] = []
+    for paragraph in text.split("\n\n"):
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            # Hard-wrap a single sentence longer than a chunk
+            pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+    return pieces
+
+
+def chunk_document(
+    document: Dict[str, Any],
+    max_chars: int = DEFAULT_CHUNK_CHARS,
+    overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> Iterator[Dict[str, Any]]:
+    """
+    Split a long document into chunks; short documents are yielded unchanged.
+
+    Each chunk repeats the document header (text up to the first blank line,
+    i.e. title/site/area/date) so it retrieves on its own, and carries the
+    tail of the previous chunk as overlap. Chunk metadata gets
+    id "<id>#<n>", parentId and chunk number.
+
+    Args:
+        document: Document with "text" and "metadata"
+        max_chars: Maximum chunk length
+        overlap: Characters of the previous chunk repeated at the start of the next
+
+    Yields:
+        Documents with "text" and "metadata"
+    """
+    text = document.get("text", "")
+    if len(text) <= max_chars:
+        yield document
+        return
+
+    header, _, body = text.partition("\n\n")
+    budget = max(max_chars - len(header) - overlap - 2, max_chars // 4)
+    chunks: List[str] = []
+    current = ""
+    for piece in _split_text(body, budget):
+        if current and len(current) + len(piece) + 2 > budget:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+
+    metadata = document.get("metadata", {})
+    for n, chunk in enumerate(chunks):
+        yield {
+            "text": f"{header}\n\n{chunk.strip()}",
+            "metadata": {**metadata, "id": f"{metadata.get('id')}#{n}", "parentId": metadata.get("id"), "chunk": n},
+        }
+
+
+class Manifest:
+    """Persisted map of document key -> {"hash", "ref"} for what a sink currently holds."""
+
+    def __init__(self, path: str, target: str):
+        self.path = path
+        self.target = target
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Sink workers record documents while the ingesting thread saves
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            # A manifest written for a different index/corpus says nothing about this one
+            if data.get("target") == target:
+                self.entries = data.get("documents", {})
+
+    def record(self, key: str, digest: str, ref: Any) -> None:
+        """Record that the sink holds a document version."""
+        with self._lock:
+            self.entries[key] = {"hash": digest, "ref": ref}
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Copy of the (key, entry) pairs."""
+        with self._lock:
+            return list(self.entries.items())
+
+    def remove(self, key: str) -> None:
+        """Forget a document the sink no longer holds."""
+        with self._lock:
+            self.entries.pop(key, None)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        with self._lock:
+            data = json.dumps({"target": self.target, "documents": self.entries})
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(Path(self.path).parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+def _with_retry(func, retries: int, backoff: float):
+    """Call func, retrying with exponential backoff on any exception."""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** attempt))
+
+
+def ingest(
+    documents: Iterable[Dict[str, Any]],
+    sink: Any,
+    manifest: Manifest,
+    batch_size: int = 100,
+    workers: int = 4,
+    retries: int = 3,
+    backoff: float = 1.0,
+    prune: bool = True,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """
+    Bring a sink in line with documents, touching only what changed.
+
+    Documents are streamed: each is hashed and compared with the manifest as
+    it arrives, and changed ones are sent in batches of batch_size on a pool
+    of workers with retry, with at most two batches per worker in flight.
+    Memory is bounded by the batches in flight plus the manifest, never by
+    the corpus. Documents missing from the input are deleted at the end.
+    The manifest records every document as the sink stores it and is saved
+    after every batch, so a failed or killed run resumes where it stopped
+    (retries skip documents of the batch that were already stored). Sinks
+    that only persist on close() (persists_on_close = True) get the
+    manifest saved after close() instead.
+
+    Args:
+        documents: Documents (already chunked), typically a generator
+        sink: Object with upsert(documents, previous, stored) and
+            delete(entries), where previous/entries are (key, ref) pairs of
+            what the sink holds and stored(key, ref) is called as each
+            document is stored, and optionally close()
+        manifest: Manifest of what the sink holds (updated and saved)
+        batch_size: Documents per sink call
+        workers: Parallel sink calls
+        retries: Retries per batch
+        backoff: Initial retry delay in seconds (doubles per retry)
+        prune: Delete documents missing from the input
+        dry_run: Only report the diff (sink is not called)
+
+    Returns:
+        Dictionary with upserted, deleted, unchanged, pendingUpserts/pendingDeletes
+        (the diff), failedBatches, errors and elapsedSeconds
+    """
+    started = time.perf_counter()
+    stats: Dict[str, Any] = {"upserted": 0, "deleted": 0, "unchanged": 0, "failedBatches": 0,
+                             "pendingUpserts": 0, "pendingDeletes": 0, "errors": []}
+    stats_lock = threading.Lock()
+    save_per_batch = not getattr(sink, "persists_on_close", False)
+
+    def run_upsert(batch):
+        digests = {key: digest for key, digest, _ in batch}
+
+        def stored(key: str, ref: Any) -> None:
+            manifest.record(key, digests[key], ref)
+            with stats_lock:
+                stats["upserted"] += 1
+
+        def attempt():
+            # A retry only sends what earlier attempts did not store
+            remaining = [(key, document) for key, digest, document in batch
+                         if manifest.entries.get(key, {}).get("hash") != digest]
+            # Replaced documents may have an old copy to remove once the new one is stored (e.g. Vertex files)
+            previous = [(key, manifest.entries[key].get("ref")) for key, _ in remaining if key in manifest.entries]
+            sink.upsert([document for _, document in remaining], previous, stored)
+
+        _with_retry(attempt, retries, backoff)
+
+    def run_delete(batch):
+        _with_retry(lambda: sink.delete(batch), retries, backoff)
+        for key, _ in batch:
+            manifest.remove(key)
+        with stats_lock:
+            stats["deleted"] += len(batch)
+
+    def record(future) -> None:
+        try:
+            future.result()
+        except Exception as e:
+            stats["failedBatches"] += 1
+            stats["errors"].append(str(e))
+        # Documents stored before a failure are recorded too
+        if save_per_batch:
+            manifest.save()
+
+    in_flight: set = set()
+    max_in_flight = max(1, workers) * 2
+
+    def submit(executor, func, batch) -> None:
+        if dry_run:
+            return
+        while len(in_flight) >= max_in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                record(future)
+        in_flight.add(executor.submit(func, batch))
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        seen = set()
+        batch: List[Tuple[str, str, Dict[str, Any]]] = []
+        for document in documents:
+            key = document_key(document)
+            seen.add(key)
+            digest = document_hash(document)
+            entry = manifest.entries.get(key)
+            if entry is not None and entry.get("hash") == digest:
+                stats["unchanged"] += 1
+                continue
+            stats["pendingUpserts"] += 1
+            batch.append((key, digest, document))
+            if len(batch) >= batch_size:
+                submit(executor, run_upsert, batch)
+                batch = []
+        if batch:
+            submit(executor, run_upsert, batch)
+
+        if prune:
+            deletes = [(key, entry.get("ref")) for key, entry in manifest.items() if key not in seen]
+            stats["pendingDeletes"] = len(deletes)
+            for i in range(0, len(deletes), batch_size):
+                submit(executor, run_delete, deletes[i:i + batch_size])
+
+        for future in as_completed(list(in_flight)):
+            record(future)
+    finally:
+        executor.shutdown(wait=True)
+        if not dry_run:
+            if hasattr(sink, "close"):
+                sink.close()
+            manifest.save()
+
+    stats["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+class LocalIndexSink:
+    """Ingestion sink for the local RAG index at <base_path>.vectors/.lexical/.json."""
+
+    # Rebuild without tombstones once this fraction of rows is dead
+    COMPACT_RATIO = 0.25
+    # Changes reach disk in close(); the manifest is saved after it, not per batch
+    persists_on_close = True
+
+    def __init__(self, base_path: str, index_type: str = "auto", dim: int = 256):
+        from .rag_index import LocalRagIndex
+
+        self.base_path = base_path
+        if os.path.exists(f"{base_path}.json"):
+            self.index = LocalRagIndex.load(base_path)
+        else:
+            self.index = LocalRagIndex(dim=dim, index_type="flat" if index_type == "auto" else index_type)
+        self.changed = False
+        # The index is single-writer; batches from parallel workers are applied one at a time
+        self._lock = threading.Lock()
+
+    def upsert(
+        self,
+        documents: List[Dict[str, Any]],
+        previous: List[Tuple[str, Any]],
+        stored: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, str]:
+        """Add or replace documents; returns their keys as refs."""
+        with self._lock:
+            self.index.add_documents(documents)
+            self.changed = True
+        refs = {document_key(d): document_key(d) for d in documents}
+        if stored is not None:
+            for key, ref in refs.items():
+                stored(key, ref)
+        return refs
+
+    def delete(self, entries: List[Tuple[str, Any]]) -> None:
+        """Remove documents by key."""
+        with self._lock:
+            self.index.remove_documents(key for key, _ in entries)
+            self.changed = True
+
+    def close(self) -> None:
+        """Compact if needed and save the index."""
+        if not self.changed:
+            return
+        if len(self.index.deleted) > self.COMPACT_RATIO * max(len(self.index.documents), 1):
+            self.index = self.index.compact()
+        self.index.save(self.base_path)
+
+
+class VertexRagSink:
+    """Ingestion sink for a Vertex AI RAG corpus (one RAG file per document)."""
+
+    def __init__(self, corpus_name: str):
+        from vertexai.preview import rag
+
+        self.rag = rag
+        self.corpus_name = corpus_name
+        self.tmp_dir = tempfile.mkdtemp(prefix="rag_ingest_")
+
+    def upsert(
+        self,
+        documents: List[Dict[str, Any]],
+        previous: List[Tuple[str, Any]],
+        stored: Optional[Callable[[str, Any], None]] = None
+    ) -> Dict[str, str]:
+        """
+        Upload documents as RAG files, replacing their previous versions; returns RAG file names.
+
+        Each document's previous file is deleted only after its new file is
+        uploaded and reported through stored, so a failure part way through a
+        batch never leaves a document missing from the corpus or unrecorded.
+        """
+        previous_refs = dict(previous)
+        refs = {}
+        for document in documents:
+            key = document_key(document)
+            path = os.path.join(self.tmp_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".txt")
+            with open(path, "w") as f:
+                f.write(document.get("text", ""))
+            try:
+                rag_file = self.rag.upload_file(
+                    corpus_name=self.corpus_name,
+                    path=path,
+                    display_name=key,
+                    description=json.dumps(document.get("metadata", {}), default=str),
+                )
+            finally:
+                os.remove(path)
+            refs[key] = rag_file.name
+            if stored is not None:
+                stored(key, rag_file.name)
+            old_ref = previous_refs.get(key)
+            if old_ref and old_ref != rag_file.name:
+                try:
+                    self.rag.delete_file(name=old_ref)
+                except Exception:
+                    pass  # Already gone; the new file is recorded either way
+        return refs
+
+    def delete(self, entries: List[Tuple[str, Any]]) -> None:
+        """Delete RAG files by name."""
+        for _, ref in entries:
+            if ref:
+                self.rag.delete_file(name=ref)
+
+    def close(self) -> None:
+        """Remove the staging directory."""
+        try:
+            os.rmdir(self.tmp_dir)
+        except OSError:
+            pass
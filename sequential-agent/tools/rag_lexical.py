@@ -0,0 +1,239 @@
+"""BM25 lexical index over RAG documents, with array-backed postings and incremental updates."""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from array import array
+import heapq
+import json
+import math
+import re
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # Optional: falls back to scoring postings in pure Python
+    np = None
+
+
+# Identifiers keep their inner separators ("cr-tf-004a", "v-2047", "1.8"), so exact tags match exactly
+_TOKEN = re.compile(r"[a-z0-9]+(?:[-/.][a-z0-9]+)*")
+_SPLIT = re.compile(r"[-/.]")
+_HEADER = struct.Struct("<4sII")  # magic, format version, JSON metadata length
+_MAGIC = b"PFLX"
+_FORMAT_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize text for BM25.
+
+    Compound identifiers are emitted whole and as their parts, so "CR-TF-004A"
+    matches both the exact tag and a query for "004A".
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        if _SPLIT.search(token):
+            tokens.extend(part for part in _SPLIT.split(token) if part)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over documents addressed by row number."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        # Per term: ascending rows and matching term frequencies
+        self.rows: List[array] = []
+        self.tfs: List[array] = []
+        self.df = array("I")
+        self.doc_lengths = array("I")
+        self.deleted: Set[int] = set()
+        self.total_length = 0
+
+    @property
+    def live_count(self) -> int:
+        """Number of documents not deleted."""
+        return len(self.doc_lengths) - len(self.deleted)
+
+    def add(self, text: str) -> int:
+        """
+        Index a document as the next row.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Row number of the document
+        """
+        row = len(self.doc_lengths)
+        counts: Dict[str, int] = {}
+        tokens = tokenize(text)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            term = self.vocab.get(token)
+            if term is None:
+                term = len(self.rows)
+                self.vocab[token] = term
+                self.rows.append(array("I"))
+                self.tfs.append(array("I"))
+                self.df.append(0)
+            self.rows[term].append(row)
+            self.tfs[term].append(tf)
+            self.df[term] += 1
+        self.doc_lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        return row
+
+    def remove(self, row: int, text: str) -> None:
+        """
+        Delete a document (tombstoned; postings are skipped at query time).
+
+        Args:
+            row: Row number returned by add()
+            text: The text that was indexed for the row (to update document frequencies)
+        """
+        if row in self.deleted or row >= len(self.doc_lengths):
+            return
+        self.deleted.add(row)
+        self.total_length -= self.doc_lengths[row]
+        for token in set(tokenize(text)):
+            term = self.vocab.get(token)
+            if term is not None and self.df[term]:
+                self.df[term] -= 1
+
+    def search(self, query: str, top_k: int = 5, candidates: Optional[Set[int]] = None) -> List[Tuple[float, int]]:
+        """
+        Score documents against a query.
+
+        Args:
+            query: Query text
+            top_k: Number of results
+            candidates: Optional set of rows allowed in the results
+
+        Returns:
+            List of (score, row) pairs, best first
+        """
+        n = self.live_count
+        if not n:
+            return []
+        avg_length = self.total_length / n or 1.0
+        terms = []
+        for token in set(tokenize(query)):
+            term = self.vocab.get(token)
+            if term is not None and self.df[term]:
+                df = self.df[term]
+                terms.append((term, math.log(1 + (n - df + 0.5) / (df + 0.5))))
+        if not terms:
+            return []
+        if np is not None:
+            return self._search_numpy(terms, avg_length, top_k, candidates)
+
+        k1, b = self.k1, self.b
+        lengths = self.doc_lengths
+        scores: Dict[int, float] = {}
+        for term, idf in terms:
+            for row, tf in zip(self.rows[term], self.tfs[term]):
+                if row in self.deleted or (candidates is not None and row not in candidates):
+                    continue
+                norm = tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[row] / avg_length))
+                scores[row] = scores.get(row, 0.0) + idf * norm
+        return [(score, row) for row, score in heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])]
+
+    def _search_numpy(
+        self,
+        terms: List[Tuple[int, float]],
+        avg_length: float,
+        top_k: int,
+        candidates: Optional[Set[int]]
+    ) -> List[Tuple[float, int]]:
+        """Vectorized scoring: one dense accumulator, one array op per query term."""
+        count = len(self.doc_lengths)
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32).astype(np.float32)
+        scores = np.zeros(count, dtype=np.float32)
+        k1, b = self.k1, self.b
+        for term, idf in terms:
+            rows = np.frombuffer(self.rows[term], dtype=np.uint32)
+            tfs = np.frombuffer(self.tfs[term], dtype=np.uint32).astype(np.float32)
+            # Rows are unique within a posting list, so fancy-index += is safe
+            scores[rows] += idf * tfs * (k1 + 1) / (tfs + k1 * (1 - b + b * lengths[rows] / avg_length))
+        allowed = scores > 0
+        if self.deleted:
+            allowed[np.fromiter(self.deleted, dtype=np.int64)] = False
+        if candidates is not None:
+            mask = np.zeros(count, dtype=bool)
+            mask[np.fromiter(candidates, dtype=np.int64)] = True
+            allowed &= mask
+        rows = np.flatnonzero(allowed)
+        if len(rows) > top_k:
+            rows = rows[np.argpartition(-scores[rows], top_k)[:top_k]]
+        rows = rows[np.argsort(-scores[rows], kind="stable")]
+        return [(float(scores[row]), int(row)) for row in rows]
+
+    def save(self, path: str) -> None:
+        """Write the index to a compact binary file (JSON header + concatenated arrays)."""
+        meta = {
+            "k1": self.k1,
+            "b": self.b,
+            "vocab": sorted(self.vocab, key=self.vocab.get),
+            "postingLengths": [len(r) for r in self.rows],
+            "deleted": sorted(self.deleted),
+            "totalLength": self.total_length,
+        }
+        encoded = json.dumps(meta).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(self.doc_lengths.tobytes())
+            f.write(self.df.tobytes())
+            for rows, tfs in zip(self.rows, self.tfs):
+                f.write(rows.tobytes())
+                f.write(tfs.tobytes())
+
+    @classmethod
+    def load(cls, path: str, doc_count: int) -> "BM25Index":
+        """
+        Load an index written by save().
+
+        Args:
+            path: Index file path
+            doc_count: Number of rows (documents) the index covers
+        """
+        with open(path, "rb") as f:
+            magic, version, meta_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError(f"Not a lexical index file: {path}")
+            meta = json.loads(f.read(meta_length))
+            index = cls(k1=meta["k1"], b=meta["b"])
+            index.doc_lengths.frombytes(f.read(doc_count * index.doc_lengths.itemsize))
+            index.df.frombytes(f.read(len(meta["vocab"]) * index.df.itemsize))
+            for term, (token, length) in enumerate(zip(meta["vocab"], meta["postingLengths"])):
+                rows, tfs = array("I"), array("I")
+                rows.frombytes(f.read(length * rows.itemsize))
+                tfs.frombytes(f.read(length * tfs.itemsize))
+                index.vocab[token] = term
+                index.rows.append(rows)
+                index.tfs.append(tfs)
+        index.deleted = set(meta["deleted"])
+        index.total_length = meta["totalLength"]
+        return index
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[Tuple[float, int]]], k: int = 60) -> List[Tuple[float, int]]:
+    """
+    Fuse ranked lists with reciprocal rank fusion.
+
+    Args:
+        rankings: Lists of (score, row) pairs, each best first
+        k: RRF damping constant
+
+    Returns:
+        Fused list of (fused score, row) pairs, best first
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, (_, row) in enumerate(ranking):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(((score, row) for row, score in fused.items()), reverse=True)
@@ -0,0 +1,74 @@
+"""Deterministic auto-remediation of mechanical permit defects."""
+
+from typing import Dict, Any, List, Tuple, Union
+import copy
+
+from .rules import compiled_ruleset, check_results
+from ..schemas.permit_schema import PermitGeneratorOutput
+from ..observability.tracing import traced_tool
+
+
+def remediate_permit(permit: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Apply rule-driven fixes to one permit.
+
+    Only fixes that make the permit more restrictive without claiming that
+    anything was done in the field are applied: validityHours is clamped to
+    validity_hours_max. Missing controls, PPE and sign-offs are findings for
+    the validator and refiner; adding them here would assert safety measures
+    nobody has verified.
+
+    Args:
+        permit: Permit dictionary (not modified)
+
+    Returns:
+        Tuple of (remediated permit copy, list of changes)
+    """
+    fixed = copy.deepcopy(permit)
+    changes: List[Dict[str, Any]] = []
+
+    ruleset = compiled_ruleset()
+    permit_type = permit.get("type", "")
+    if ruleset is None or permit_type not in ruleset.permit_types:
+        return fixed, changes
+
+    permit_rules = ruleset.permit_types[permit_type]
+    permit_id = permit.get("permitId", "UNKNOWN")
+
+    for kind, requirement, result in check_results(permit, permit_rules):
+        if kind == "validity" and result != "ok":
+            previous = permit.get("validityHours", 0)
+            fixed["validityHours"] = permit_rules.validity_hours_max
+            changes.append({"permitId": permit_id, "field": "validityHours", "action": "clamp",
+                            "value": permit_rules.validity_hours_max, "previous": previous,
+                            "reason": f"Validity hours ({previous}h) exceeds maximum ({permit_rules.validity_hours_max}h)"})
+
+    return fixed, changes
+
+
+@traced_tool
+def remediate(permit_output: Union[PermitGeneratorOutput, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply rule-driven fixes to every permit of a permit generator output.
+
+    Args:
+        permit_output: PermitGeneratorOutput (or its dict form)
+
+    Returns:
+        Dictionary with the remediated "permitGeneratorOutput" (dict form) and
+        "changes", the list of applied fixes (permitId, field, action, value, reason)
+    """
+    if isinstance(permit_output, PermitGeneratorOutput):
+        permit_output = permit_output.model_dump()
+
+    permits = []
+    changes = []
+    for permit in permit_output.get("permits", []):
+        fixed, permit_changes = remediate_permit(permit)
+        permits.append(fixed)
+        changes.extend(permit_changes)
+
+    return {
+        "permitGeneratorOutput": {**permit_output, "permits": permits},
+        "changes": changes,
+    }
@@ -0,0 +1,153 @@
+"""Compiled matchers for compliance rule requirements (Aho-Corasick over normalized text)."""
+
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from collections import deque
+import re
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Separator placed between items when scanning several at once; normalize() never emits it
+_ITEM_SEPARATOR = "\n"
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for requirement matching.
+
+    Lowercases and collapses punctuation/whitespace runs to a single space, so
+    "Fire-resistant clothing" and "fire resistant  clothing" compare equal.
+    """
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton mapping normalized phrases to requirement indices."""
+
+    def __init__(self, phrases: Dict[str, Iterable[int]]):
+        # Trie transitions, failure links and per-state outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[int]] = [frozenset()]
+
+        outputs: List[Set[int]] = [set()]
+        for phrase, targets in phrases.items():
+            if not phrase:
+                continue
+            state = 0
+            for char in phrase:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].update(targets)
+
+        # Breadth-first pass to build failure links and merge outputs along them
+        # (depth-1 states keep the root as their failure link)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(char, 0)
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        self._out = [frozenset(o) for o in outputs]
+
+    def scan_normalized(self, text: str) -> Set[int]:
+        """Get the requirement indices whose phrases occur in already-normalized text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def scan(self, items: Iterable[str]) -> Set[int]:
+        """
+        Scan several free-text items in a single pass.
+
+        Args:
+            items: Permit entries (e.g., controls or PPE)
+
+        Returns:
+            Indices of requirements matched by at least one item
+        """
+        return self.scan_normalized(_ITEM_SEPARATOR.join(normalize(item) for item in items))
+
+
+def _phrase_table(requirements: Tuple[str, ...], synonyms: Dict[str, List[str]]) -> Dict[str, Set[int]]:
+    """Map every normalized requirement phrase and synonym to requirement indices."""
+    table: Dict[str, Set[int]] = {}
+    for index, requirement in enumerate(requirements):
+        for phrase in [requirement] + list(synonyms.get(requirement, [])):
+            table.setdefault(normalize(phrase), set()).add(index)
+    return table
+
+
+@dataclass(frozen=True)
+class CompiledPermitRules:
+    """Requirements for one permit type, compiled for single-pass checking."""
+    permit_type: str
+    required_controls: Tuple[str, ...]
+    controls_matcher: PhraseMatcher
+    required_ppe: Tuple[str, ...]
+    ppe_matcher: PhraseMatcher
+    required_signoffs: Tuple[str, ...]
+    signoff_keys: Tuple[str, ...]
+    validity_hours_max: Any
+
+    def missing_signoffs(self, signoffs: Iterable[str]) -> List[int]:
+        """Get indices of required sign-offs not present (normalized equality)."""
+        present = {normalize(role) for role in signoffs}
+        return [i for i, key in enumerate(self.signoff_keys) if key not in present]
+
+
+@dataclass(frozen=True)
+class CompiledRuleset:
+    """All permit types of one compliance_rules.json version."""
+    version: Optional[str]
+    permit_types: Dict[str, CompiledPermitRules]
+
+
+def compile_ruleset(rules_data: Dict[str, Any]) -> CompiledRuleset:
+    """
+    Compile parsed compliance_rules.json content into matchers.
+
+    The optional top-level "synonyms" map lists accepted alternative wordings
+    per requirement (e.g., "Fire extinguisher on site" -> ["fire extinguisher"]).
+
+    Args:
+        rules_data: Parsed compliance_rules.json content
+
+    Returns:
+        CompiledRuleset with one CompiledPermitRules per permit type
+    """
+    synonyms = rules_data.get("synonyms", {})
+    permit_types = {}
+    for permit_type, permit_rules in rules_data.get("permitTypes", {}).items():
+        required_controls = tuple(permit_rules.get("required_controls", []))
+        required_ppe = tuple(permit_rules.get("required_ppe", []))
+        required_signoffs = tuple(permit_rules.get("required_signoffs", []))
+        permit_types[permit_type] = CompiledPermitRules(
+            permit_type=permit_type,
+            required_controls=required_controls,
+            controls_matcher=PhraseMatcher(_phrase_table(required_controls, synonyms)),
+            required_ppe=required_ppe,
+            ppe_matcher=PhraseMatcher(_phrase_table(required_ppe, synonyms)),
+            required_signoffs=required_signoffs,
+            signoff_keys=tuple(normalize(role) for role in required_signoffs),
+            validity_hours_max=permit_rules.get("validity_hours_max", 24),
+        )
+    return CompiledRuleset(version=rules_data.get("version"), permit_types=permit_types)
@@ -1,107 +1,273 @@
 """Tool for deterministic rule evaluation."""
 
-from typing import Dict, Any, List
-import json
-import os
-from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from . import assets
+from .rule_matcher import CompiledRuleset, CompiledPermitRules, compile_ruleset
+from ..observability.tracing import traced_tool
 
 
+def compiled_ruleset() -> Optional[CompiledRuleset]:
+    """
+    Get the compiled compliance ruleset, compiling once per rules file version.
+
+    Returns:
+        CompiledRuleset, or None if the rules file is missing
+    """
+    snapshot = assets.get_snapshot("compliance_rules.json")
+    if snapshot is None:
+        return None
+    return assets.derive(snapshot, "compiled_ruleset", compile_ruleset)
+
+
+def check_results(permit: Dict[str, Any], permit_rules: CompiledPermitRules) -> List[Tuple[str, str, str]]:
+    """
+    Run every check for a permit against the compiled rules of its permit type.
+
+    Controls and PPE are each scanned in a single pass, so cost grows with the
+    permit's text length rather than requirements x entries.
+
+    Args:
+        permit: Permit object to validate
+        permit_rules: Compiled rules for the permit's type
+
+    Returns:
+        List of (kind, requirement, result) tuples in check order
+    """
+    results = []
+
+    matched_controls = permit_rules.controls_matcher.scan(permit.get("controls", []))
+    for index, req_control in enumerate(permit_rules.required_controls):
+        results.append(("control", req_control, "ok" if index in matched_controls else "error"))
+
+    matched_ppe = permit_rules.ppe_matcher.scan(permit.get("ppe", []))
+    for index, req_ppe_item in enumerate(permit_rules.required_ppe):
+        results.append(("ppe", req_ppe_item, "ok" if index in matched_ppe else "warn"))
+
+    missing_signoffs = set(permit_rules.missing_signoffs(permit.get("signOffRoles", [])))
+    for index, req_signoff in enumerate(permit_rules.required_signoffs):
+        results.append(("signoff", req_signoff, "error" if index in missing_signoffs else "ok"))
+
+    permit_validity = permit.get("validityHours", 0)
+    results.append(("validity", "", "ok" if permit_validity <= permit_rules.validity_hours_max else "error"))
+
+    return results
+
+
+def _evaluate_compiled(permit: Dict[str, Any], permit_rules: CompiledPermitRules) -> Dict[str, Any]:
+    """
+    Evaluate a permit against the compiled rules of its permit type.
+
+    Args:
+        permit: Permit object to validate
+        permit_rules: Compiled rules for the permit's type
+
+    Returns:
+        Evaluation result with errors, warnings, checks
+    """
+    errors = []
+    warnings = []
+    checks = []
+
+    for kind, requirement, result in check_results(permit, permit_rules):
+        if kind == "control":
+            # Check required controls
+            checks.append({
+                "check": f"Required control: {requirement}",
+                "result": result,
+                "details": f"Control '{requirement}' is required"
+            })
+            if result == "error":
+                errors.append(f"Missing required control: {requirement}")
+        elif kind == "ppe":
+            # Check required PPE
+            checks.append({
+                "check": f"Required PPE: {requirement}",
+                "result": result,
+                "details": f"PPE '{requirement}' is recommended"
+            })
+            if result == "warn":
+                warnings.append(f"Missing recommended PPE: {requirement}")
+        elif kind == "signoff":
+            # Check required signoffs
+            checks.append({
+                "check": f"Required sign-off: {requirement}",
+                "result": result,
+                "details": f"Sign-off from '{requirement}' is required"
+            })
+            if result == "error":
+                errors.append(f"Missing required sign-off: {requirement}")
+        else:
+            # Check validity hours
+            max_validity = permit_rules.validity_hours_max
+            permit_validity = permit.get("validityHours", 0)
+            checks.append({
+                "check": f"Validity hours within limit ({max_validity}h max)",
+                "result": result,
+                "details": f"Permit validity is {permit_validity}h, maximum is {max_validity}h"
+            })
+            if result == "error":
+                errors.append(f"Validity hours ({permit_validity}h) exceeds maximum ({max_validity}h)")
+
+    return {
+        "errors": errors,
+        "warnings": warnings,
+        "checks": checks
+    }
+
+
+@traced_tool
 def evaluate(permit: Dict[str, Any], rulesetVersion: str = "v1.0") -> Dict[str, Any]:
     """
     Evaluate permit against compliance rules.
-    
+
     Args:
         permit: Permit object to validate
         rulesetVersion: Version of ruleset to use (default: "v1.0")
-    
+
     Returns:
         Evaluation result with errors, warnings, checks
     """
-    # Load compliance rules
-    assets_path = os.getenv("ASSETS_PATH", "/app/assets")
-    if not os.path.exists(assets_path):
-        current_dir = Path(__file__).parent.parent
-        assets_path = current_dir / "assets"
-    
-    rules_path = Path(assets_path) / "compliance_rules.json"
-    if not rules_path.exists():
+    # Load compiled compliance rules from the shared asset registry
+    ruleset = compiled_ruleset()
+    if ruleset is None:
         return {
             "errors": ["Compliance rules file not found"],
             "warnings": [],
             "checks": []
         }
-    
-    with open(rules_path, 'r') as f:
-        rules_data = json.load(f)
-    
+
     # Get rules for this permit type
     permit_type = permit.get("type", "")
-    if not permit_type or permit_type not in rules_data.get("permitTypes", {}):
+    if not permit_type or permit_type not in ruleset.permit_types:
         return {
             "errors": [f"Unknown permit type: {permit_type}"],
             "warnings": [],
             "checks": []
         }
-    
-    permit_rules = rules_data["permitTypes"][permit_type]
-    errors = []
-    warnings = []
-    checks = []
-    
-    # Check required controls
-    required_controls = permit_rules.get("required_controls", [])
-    permit_controls = permit.get("controls", [])
-    for req_control in required_controls:
-        check_result = {
-            "check": f"Required control: {req_control}",
-            "result": "ok" if any(req_control.lower() in ctrl.lower() for ctrl in permit_controls) else "error",
-            "details": f"Control '{req_control}' is required"
-        }
-        checks.append(check_result)
-        if check_result["result"] == "error":
-            errors.append(f"Missing required control: {req_control}")
-    
-    # Check required PPE
-    required_ppe = permit_rules.get("required_ppe", [])
-    permit_ppe = permit.get("ppe", [])
-    for req_ppe_item in required_ppe:
-        check_result = {
-            "check": f"Required PPE: {req_ppe_item}",
-            "result": "ok" if any(req_ppe_item.lower() in ppe.lower() for ppe in permit_ppe) else "warn",
-            "details": f"PPE '{req_ppe_item}' is recommended"
-        }
-        checks.append(check_result)
-        if check_result["result"] == "warn":
-            warnings.append(f"Missing recommended PPE: {req_ppe_item}")
-    
-    # Check required signoffs
-    required_signoffs = permit_rules.get("required_signoffs", [])
-    permit_signoffs = permit.get("signOffRoles", [])
-    for req_signoff in required_signoffs:
-        check_result = {
-            "check": f"Required sign-off: {req_signoff}",
-            "result": "ok" if req_signoff in permit_signoffs else "error",
-            "details": f"Sign-off from '{req_signoff}' is required"
-        }
-        checks.append(check_result)
-        if check_result["result"] == "error":
-            errors.append(f"Missing required sign-off: {req_signoff}")
-    
-    # Check validity hours
-    max_validity = permit_rules.get("validity_hours_max", 24)
-    permit_validity = permit.get("validityHours", 0)
-    check_result = {
-        "check": f"Validity hours within limit ({max_validity}h max)",
-        "result": "ok" if permit_validity <= max_validity else "error",
-        "details": f"Permit validity is {permit_validity}h, maximum is {max_validity}h"
-    }
-    checks.append(check_result)
-    if check_result["result"] == "error":
-        errors.append(f"Validity hours ({permit_validity}h) exceeds maximum ({max_validity}h)")
-    
-    return {
-        "errors": errors,
-        "warnings": warnings,
-        "checks": checks
-    }
 
+    return _evaluate_compiled(permit, ruleset.permit_types[permit_type])
+
+
+def iter_unique_ids(permits: Iterable[Dict[str, Any]], missing: str = "") -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Pair each permit with an ID that is unique within the batch.
+
+    Permits without an ID, or repeating an earlier permit's ID, get
+    "<id>#<position>" (e.g., "#3", "HW-1#5"), so per-permit results never merge.
+
+    Args:
+        permits: Permit objects (any iterable, consumed lazily)
+        missing: ID used before "#<position>" for permits without one
+
+    Returns:
+        Iterator of (unique ID, permit) in input order
+    """
+    seen = set()
+    for position, permit in enumerate(permits):
+        permit_id = permit.get("permitId")
+        key = str(permit_id) if permit_id else missing
+        if not permit_id or key in seen:
+            base, key, n = key, f"{key}#{position}", position
+            while key in seen:
+                n += 1
+                key = f"{base}#{n}"
+        seen.add(key)
+        yield key, permit
+
+
+def iter_evaluations(permits: Iterable[Dict[str, Any]], rulesetVersion: str = "v1.0") -> Iterator[Tuple[str, str, str]]:
+    """
+    Stream compact check results for many permits.
+
+    The ruleset is resolved once for the whole stream, so permits are checked
+    without reloading or recompiling rules.
+
+    Args:
+        permits: Permit objects to validate (any iterable, consumed lazily)
+        rulesetVersion: Version of ruleset to use (default: "v1.0")
+
+    Returns:
+        Iterator of (permitId, checkId, result) rows, with permit IDs made
+        unique by iter_unique_ids; checkId is
+        "<control|ppe|signoff>:<requirement>", "validity", or "type" for
+        permits of an unknown type
+    """
+    ruleset = compiled_ruleset()
+    for permit_id, permit in iter_unique_ids(permits):
+        if ruleset is None:
+            yield permit_id, "rules", "error"
+            continue
+        permit_rules = ruleset.permit_types.get(permit.get("type", ""))
+        if permit_rules is None:
+            yield permit_id, "type", "error"
+            continue
+        for kind, requirement, result in check_results(permit, permit_rules):
+            yield permit_id, f"{kind}:{requirement}" if requirement else kind, result
+
+
+def _evaluate_columns(permits: List[Dict[str, Any]], rulesetVersion: str) -> Dict[str, List[str]]:
+    """Evaluate a list of permits into columnar lists (process pool entry point)."""
+    columns = {"permitId": [], "checkId": [], "result": []}
+    for permit_id, check_id, result in iter_evaluations(permits, rulesetVersion):
+        columns["permitId"].append(permit_id)
+        columns["checkId"].append(check_id)
+        columns["result"].append(result)
+    return columns
+
+
+def evaluate_many(
+    permits: Iterable[Dict[str, Any]],
+    rulesetVersion: str = "v1.0",
+    workers: int = 0,
+    chunk_size: int = 5000
+) -> Dict[str, Any]:
+    """
+    Evaluate many permits (e.g., a nightly audit) against compliance rules.
+
+    Permits are grouped by type so each group runs against one compiled rule
+    block; with workers > 0, chunks of each group fan out to a process pool.
+
+    Args:
+        permits: Permit objects to validate
+        rulesetVersion: Version of ruleset to use (default: "v1.0")
+        workers: Number of worker processes (0 evaluates in this process)
+        chunk_size: Permits per process pool task
+
+    Returns:
+        Columnar results {"permitId": [...], "checkId": [...], "result": [...]}
+        plus "summary" with per-permit error and warning counts, keyed by the
+        permit IDs made unique by iter_unique_ids
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for permit_id, permit in iter_unique_ids(permits):
+        if permit.get("permitId") != permit_id:
+            # Pin the unique ID before grouping reorders permits
+            permit = {**permit, "permitId": permit_id}
+        groups.setdefault(permit.get("type", ""), []).append(permit)
+
+    chunks = [
+        group[i:i + chunk_size]
+        for group in groups.values()
+        for i in range(0, len(group), chunk_size)
+    ]
+
+    if workers > 0 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_evaluate_columns, chunks, [rulesetVersion] * len(chunks)))
+    else:
+        parts = [_evaluate_columns(chunk, rulesetVersion) for chunk in chunks]
+
+    columns = {"permitId": [], "checkId": [], "result": []}
+    summary: Dict[str, Dict[str, int]] = {}
+    for part in parts:
+        for key in columns:
+            columns[key].extend(part[key])
+        for permit_id, result in zip(part["permitId"], part["result"]):
+            counts = summary.setdefault(permit_id, {"errors": 0, "warnings": 0})
+            if result == "error":
+                counts["errors"] += 1
+            elif result == "warn":
+                counts["warnings"] += 1
+
+    return {**columns, "summary": summary}
@@ -1,11 +1,38 @@
 """Tool for weather snapshot using Google Maps Platform Weather API."""
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+import copy
+import logging
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import os
-from ..config.settings import WEATHER_API_KEY
+from ..config.settings import (
+    WEATHER_API_KEY, WEATHER_API_URL, WEATHER_TILE_DEGREES, WEATHER_CACHE_TTL_SECONDS, WEATHER_STALE_SECONDS, WEATHER_POOL_SIZE,
+)
 from ..schemas.weather_schema import WeatherSnapshot, Coordinates
+from .cache import TTLCache
+from .workorders import get_workorder_by_id, list_workorder_ids
+from ..observability.tracing import traced_tool
+
+
+WEATHER_URL = WEATHER_API_URL
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Tile -> snapshot dict; entries outlive the TTL by the stale window (stale-while-revalidate)
+_weather_cache = TTLCache(max_entries=4096, ttl_seconds=WEATHER_CACHE_TTL_SECONDS + WEATHER_STALE_SECONDS)
+# Tile -> fetch in progress; concurrent misses wait on it instead of calling upstream
+_inflight: Dict[Tuple[int, int], Future] = {}
+_inflight_lock = threading.Lock()
+_stats = {"upstreamCalls": 0, "upstreamErrors": 0, "coalesced": 0, "staleServed": 0}
+_stats_lock = threading.Lock()
 
 
 def _extract_weather_data(data: Dict[str, Any], lat: float, lon: float) -> WeatherSnapshot:
@@ -118,9 +145,123 @@ def _extract_weather_data(data: Dict[str, Any], lat: float, lon: float) -> Weath
     )
 
 
+def _get_session() -> requests.Session:
+    """Get the process-wide HTTP session (keep-alive connection pool)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=WEATHER_POOL_SIZE, pool_maxsize=WEATHER_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def weather_tile(lat: float, lon: float) -> Tuple[int, int]:
+    """Quantize coordinates to the cache tile (WEATHER_TILE_DEGREES grid)."""
+    return round(lat / WEATHER_TILE_DEGREES), round(lon / WEATHER_TILE_DEGREES)
+
+
+def _count(name: str) -> None:
+    """Increment a weather counter."""
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _fetch_snapshot(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
+    """Call the Weather API once; raises on failure."""
+    # API parameters - Google Weather API uses nested location parameters
+    params = {
+        "location.latitude": lat,
+        "location.longitude": lon,
+        "key": api_key,
+        "units": "METRIC"  # Get temperature in Celsius, wind in km/h
+    }
+    _count("upstreamCalls")
+    try:
+        response = _get_session().get(WEATHER_URL, params=params, timeout=10)
+        response.raise_for_status()
+        return _extract_weather_data(response.json(), lat, lon).model_dump()
+    except Exception:
+        _count("upstreamErrors")
+        raise
+
+
+def _load_tile(tile: Tuple[int, int], lat: float, lon: float, api_key: str) -> Dict[str, Any]:
+    """
+    Fetch and cache a tile's snapshot, coalescing concurrent requests (single flight).
+
+    Raises:
+        Whatever the upstream call raised; failures are not cached
+    """
+    with _inflight_lock:
+        future = _inflight.get(tile)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[tile] = future
+        else:
+            _count("coalesced")
+    if not leader:
+        return future.result()
+
+    try:
+        snapshot = _fetch_snapshot(lat, lon, api_key)
+        if WEATHER_CACHE_TTL_SECONDS > 0:
+            _weather_cache.set(tile, snapshot)
+        future.set_result(snapshot)
+        return snapshot
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(tile, None)
+
+
+def _refresh_in_background(tile: Tuple[int, int], lat: float, lon: float, api_key: str) -> None:
+    """Re-fetch a stale tile on a daemon thread unless a fetch is already running."""
+    with _inflight_lock:
+        if tile in _inflight:
+            return
+
+    def refresh():
+        try:
+            _load_tile(tile, lat, lon, api_key)
+        except Exception:
+            pass  # Keep serving the stale snapshot until it expires
+
+    threading.Thread(target=refresh, name=f"weather-refresh-{tile}", daemon=True).start()
+
+
+def _for_location(snapshot: Dict[str, Any], lat: float, lon: float) -> Dict[str, Any]:
+    """Copy a tile snapshot, reporting the caller's own coordinates."""
+    result = copy.deepcopy(snapshot)
+    result["coordinates"] = {"lat": lat, "lon": lon}
+    return result
+
+
+def weather_cache_stats() -> Dict[str, Any]:
+    """
+    Get weather cache and upstream counters.
+
+    Returns:
+        Dictionary with the cache stats (hits, misses, entries, ...) plus
+        upstreamCalls, upstreamErrors, coalesced and staleServed
+    """
+    return {**_weather_cache.stats(), **_stats}
+
+
+@traced_tool
 def get_weather_data(lat: float, lon: float) -> Dict[str, Any]:
     """
     Get weather snapshot for a location using Google Maps Platform Weather API.
+
+    Snapshots are cached per lat/lon tile for WEATHER_CACHE_TTL_SECONDS; after
+    that they are served stale (up to WEATHER_STALE_SECONDS more) while one
+    background refresh runs. Concurrent misses for a tile share one API call.
     
     Args:
         lat: Latitude of the location
@@ -146,30 +287,19 @@ def get_weather_data(lat: float, lon: float) -> Dict[str, Any]:
             note="Google Maps Weather API key not configured, using default values"
         ).model_dump()
     
+    tile = weather_tile(lat, lon)
+    if WEATHER_CACHE_TTL_SECONDS > 0:
+        cached = _weather_cache.get_with_age(tile)
+        if cached is not None:
+            snapshot, age = cached
+            if age > WEATHER_CACHE_TTL_SECONDS:
+                _count("staleServed")
+                _refresh_in_background(tile, lat, lon, api_key)
+            return _for_location(snapshot, lat, lon)
+
     try:
-        # Google Maps Platform Weather API endpoint for current conditions
-        # Format: https://weather.googleapis.com/v1/currentConditions:lookup
-        base_url = "https://weather.googleapis.com/v1/currentConditions:lookup"
-        
-        # API parameters - Google Weather API uses nested location parameters
-        params = {
-            "location.latitude": lat,
-            "location.longitude": lon,
-            "key": api_key,
-            "units": "METRIC"  # Get temperature in Celsius, wind in km/h
-        }
-        
-        # Make API request
-        response = requests.get(base_url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Extract and normalize weather data using Pydantic model
-        weather_snapshot = _extract_weather_data(data, lat, lon)
-        
-        # Return as dictionary (for ADK tool compatibility)
-        return weather_snapshot.model_dump()
+        # Returned as dictionary (for ADK tool compatibility)
+        return _for_location(_load_tile(tile, lat, lon, api_key), lat, lon)
         
     except requests.exceptions.RequestException as e:
         # If API call fails, return fallback WeatherSnapshot with error
@@ -197,3 +327,157 @@ def get_weather_data(lat: float, lon: float) -> Dict[str, Any]:
             error=f"Unexpected error: {str(e)}",
             note="Using default values due to error"
         ).model_dump()
+
+
+def prefetch_weather(
+    work_order_ids: Optional[List[str]] = None,
+    max_workers: int = 8,
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    Warm the weather cache for a shift's work orders.
+
+    Coordinates are deduplicated to cache tiles and each tile not already
+    fresh in the cache is fetched once, at most max_workers at a time.
+
+    Args:
+        work_order_ids: Work orders scheduled for the shift (None = all work orders)
+        max_workers: Maximum concurrent Weather API calls
+        force: Re-fetch tiles even when their cached snapshot is still fresh
+
+    Returns:
+        Report with workOrders, withoutCoordinates, tiles, fetched, alreadyCached,
+        failed, covered (work orders whose tile is now cached), coverage (ratio),
+        errors and elapsedSeconds
+    """
+    started = time.perf_counter()
+    api_key = WEATHER_API_KEY or os.getenv("GOOGLE_MAPS_API_KEY")
+    if work_order_ids is None:
+        work_order_ids = list_workorder_ids()
+
+    # Tile -> (lat, lon of its first work order, work order IDs)
+    tiles: Dict[Tuple[int, int], Tuple[float, float, List[str]]] = {}
+    without_coordinates = 0
+    for work_order_id in work_order_ids:
+        wo = get_workorder_by_id(work_order_id)
+        lat, lon = wo.get("latitude"), wo.get("longitude")
+        if lat is None or lon is None:
+            without_coordinates += 1
+            continue
+        tile = weather_tile(lat, lon)
+        tiles.setdefault(tile, (lat, lon, []))[2].append(work_order_id)
+
+    report: Dict[str, Any] = {
+        "workOrders": len(work_order_ids),
+        "withoutCoordinates": without_coordinates,
+        "tiles": len(tiles),
+        "fetched": 0,
+        "alreadyCached": 0,
+        "failed": 0,
+        "covered": 0,
+        "coverage": 0.0,
+        "errors": [],
+    }
+    if not api_key or WEATHER_CACHE_TTL_SECONDS <= 0:
+        report["note"] = "Weather API key not configured or cache disabled; nothing to prefetch"
+        report["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+    pending = []
+    for tile, (lat, lon, ids) in tiles.items():
+        # Peek so that prefetch probes do not count as cache hits/misses
+        cached = _weather_cache.peek(tile)
+        if cached is not None and cached[1] <= WEATHER_CACHE_TTL_SECONDS and not force:
+            report["alreadyCached"] += 1
+            report["covered"] += len(ids)
+        else:
+            pending.append((tile, lat, lon, ids))
+
+    def fetch(item):
+        tile, lat, lon, ids = item
+        if force:
+            # Bypass the fresh entry: fetch directly and overwrite it
+            _weather_cache.set(tile, _fetch_snapshot(lat, lon, api_key))
+        else:
+            _load_tile(tile, lat, lon, api_key)
+        return ids
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [(item, executor.submit(fetch, item)) for item in pending]
+            for (tile, _, _, ids), future in futures:
+                try:
+                    future.result()
+                    report["fetched"] += 1
+                    report["covered"] += len(ids)
+                except Exception as e:
+                    report["failed"] += 1
+                    report["errors"].append({"workOrderIds": ids, "error": str(e)})
+
+    report["coverage"] = round(report["covered"] / len(work_order_ids), 4) if work_order_ids else 1.0
+    report["elapsedSeconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def shift_work_order_ids(shift: str) -> Optional[List[str]]:
+    """
+    Resolve a shift's work orders (WEATHER_PREFETCH_WORK_ORDERS format).
+
+    Args:
+        shift: Comma-separated work order IDs, @path to a file with one ID per line, or "all"
+
+    Returns:
+        Work order IDs, or None for all work orders
+    """
+    shift = shift.strip()
+    if shift.lower() == "all":
+        return None
+    if shift.startswith("@"):
+        with open(shift[1:], "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    return [wo_id.strip() for wo_id in shift.split(",") if wo_id.strip()]
+
+
+def start_weather_prefetch(
+    interval_seconds: Optional[float] = None,
+    work_order_ids: Optional[List[str]] = None,
+    max_workers: int = 8,
+    shift: Optional[str] = None
+) -> threading.Thread:
+    """
+    Keep the shift's weather warm in this process with a daemon thread.
+
+    The cache is per process, so this runs inside the agent server (main.py
+    starts it when WEATHER_PREFETCH_WORK_ORDERS is set): it prefetches
+    immediately, then again every interval_seconds (default: 80% of
+    WEATHER_CACHE_TTL_SECONDS, so tiles are refreshed before they go stale).
+
+    Args:
+        interval_seconds: Seconds between prefetches
+        work_order_ids: Work orders scheduled for the shift (None = all work orders)
+        max_workers: Maximum concurrent Weather API calls
+        shift: Shift spec for shift_work_order_ids(), resolved again before every
+            prefetch (an updated @file takes effect); overrides work_order_ids
+
+    Returns:
+        The started thread
+    """
+    interval = interval_seconds or max(WEATHER_CACHE_TTL_SECONDS * 0.8, 1.0)
+
+    def run():
+        while True:
+            try:
+                ids = shift_work_order_ids(shift) if shift is not None else work_order_ids
+                report = prefetch_weather(ids, max_workers=max_workers)
+                logger.info(
+                    "Weather prefetch: %d/%d work orders covered, %d tiles fetched, %d failed",
+                    report["covered"], report["workOrders"], report["fetched"], report["failed"],
+                )
+            except Exception as e:
+                # Work order store or shift file unavailable; try again next interval
+                logger.warning("Weather prefetch failed: %s", e)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="weather-prefetch", daemon=True)
+    thread.start()
+    return thread
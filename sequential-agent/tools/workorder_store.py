@@ -0,0 +1,259 @@
+"""SQLite-backed work order store with indexed lookups."""
+
+from typing import Dict, Any, Iterable, List, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from .jsonstream import iter_json_array
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_orders (
+    work_order_id TEXT PRIMARY KEY,
+    site TEXT,
+    area TEXT,
+    location TEXT,
+    content_hash TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_work_orders_site ON work_orders(site);
+CREATE INDEX IF NOT EXISTS idx_work_orders_area ON work_orders(area);
+CREATE INDEX IF NOT EXISTS idx_work_orders_location ON work_orders(location);
+"""
+
+
+def index_fields(wo: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """
+    Extract the secondary index columns from a work order.
+
+    CMMS exports carry explicit site/area fields; the demo data only has a
+    location like "Tank Farm - Zone 2", whose first segment is used as the area.
+    """
+    location = wo.get("location")
+    area = wo.get("area")
+    if not area and isinstance(location, str):
+        area = location.split(" - ")[0].strip() or None
+    return {
+        "site": wo.get("site") or wo.get("plant"),
+        "area": area,
+        "location": location,
+    }
+
+
+def _content_hash(body: str) -> str:
+    """Hash the canonical JSON body of a work order."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class WorkOrderStore:
+    """Work orders stored one row per ID, with indexes on site, area and location."""
+
+    def __init__(self, db_path: str):
+        self.db_path = str(db_path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, work_order_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up one work order by ID.
+
+        Args:
+            work_order_id: Work order ID (e.g., "WO-87231")
+
+        Returns:
+            Work order data, or None if not found
+        """
+        row = self._connect().execute(
+            "SELECT body FROM work_orders WHERE work_order_id = ?", (work_order_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(
+        self,
+        site: Optional[str] = None,
+        area: Optional[str] = None,
+        location: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find work orders by site, area and/or location (exact match, indexed).
+
+        Args:
+            site: Site/plant name (e.g., "Plant-A")
+            area: Area name (e.g., "Tank Farm")
+            location: Full location string
+            limit: Maximum number of work orders to return
+
+        Returns:
+            List of matching work orders
+        """
+        clauses = []
+        params: List[Any] = []
+        for column, value in (("site", site), ("area", area), ("location", location)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        rows = self._connect().execute(
+            f"SELECT body FROM work_orders {where} ORDER BY work_order_id LIMIT ?", params
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def ids(self) -> List[str]:
+        """Get all stored work order IDs."""
+        rows = self._connect().execute("SELECT work_order_id FROM work_orders ORDER BY work_order_id").fetchall()
+        return [row[0] for row in rows]
+
+    def count(self) -> int:
+        """Get the number of stored work orders."""
+        return self._connect().execute("SELECT COUNT(*) FROM work_orders").fetchone()[0]
+
+    def upsert_many(self, work_orders: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert or update a batch of work orders, skipping unchanged ones.
+
+        Args:
+            work_orders: Work order dictionaries with a workOrderId
+
+        Returns:
+            Counts of inserted, updated and unchanged work orders
+        """
+        rows = {}
+        for wo in work_orders:
+            work_order_id = wo.get("workOrderId")
+            if not work_order_id:
+                continue
+            body = json.dumps(wo, sort_keys=True, separators=(",", ":"))
+            rows[work_order_id] = (body, _content_hash(body), index_fields(wo))
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+        if not rows:
+            return counts
+
+        conn = self._connect()
+        with conn:
+            existing = {}
+            ids = list(rows)
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(ids), 500):
+                part = ids[i:i + 500]
+                placeholders = ",".join("?" * len(part))
+                existing.update(conn.execute(
+                    f"SELECT work_order_id, content_hash FROM work_orders WHERE work_order_id IN ({placeholders})",
+                    part
+                ).fetchall())
+
+            changed = []
+            for work_order_id, (body, digest, fields) in rows.items():
+                old_digest = existing.get(work_order_id)
+                if old_digest == digest:
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated" if old_digest else "inserted"] += 1
+                changed.append((work_order_id, fields["site"], fields["area"], fields["location"], digest, body))
+
+            conn.executemany(
+                """INSERT INTO work_orders (work_order_id, site, area, location, content_hash, body)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(work_order_id) DO UPDATE SET
+                    site = excluded.site,
+                    area = excluded.area,
+                    location = excluded.location,
+                    content_hash = excluded.content_hash,
+                    body = excluded.body""",
+                changed
+            )
+        return counts
+
+    def delete_missing(self, keep_ids: Iterable[str]) -> int:
+        """
+        Delete work orders whose IDs are not in keep_ids.
+
+        Args:
+            keep_ids: IDs present in the latest export
+
+        Returns:
+            Number of deleted work orders
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS import_seen (work_order_id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM import_seen")
+            conn.executemany("INSERT OR IGNORE INTO import_seen VALUES (?)", ((i,) for i in keep_ids))
+            cursor = conn.execute(
+                "DELETE FROM work_orders WHERE work_order_id NOT IN (SELECT work_order_id FROM import_seen)"
+            )
+            conn.execute("DELETE FROM import_seen")
+        return cursor.rowcount
+
+    def import_json(self, json_path: str, batch_size: int = 1000, prune: bool = False) -> Dict[str, int]:
+        """
+        Incrementally import a workOrders.json export.
+
+        The export is streamed, so memory stays bounded by batch_size regardless
+        of file size, and unchanged work orders are not rewritten.
+
+        Args:
+            json_path: Path to a JSON file with a top-level "workOrders" array
+            batch_size: Number of work orders written per transaction
+            prune: Delete stored work orders that are absent from the export
+
+        Returns:
+            Counts of inserted, updated, unchanged and deleted work orders
+        """
+        totals = {"inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+        seen_ids = [] if prune else None
+        batch = []
+        for wo in iter_json_array(json_path, "workOrders"):
+            batch.append(wo)
+            if seen_ids is not None and wo.get("workOrderId"):
+                seen_ids.append(wo["workOrderId"])
+            if len(batch) >= batch_size:
+                for key, value in self.upsert_many(batch).items():
+                    totals[key] += value
+                batch = []
+        if batch:
+            for key, value in self.upsert_many(batch).items():
+                totals[key] += value
+        if seen_ids is not None:
+            totals["deleted"] = self.delete_missing(seen_ids)
+        return totals
+
+
+_stores: Dict[str, WorkOrderStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(db_path: str) -> WorkOrderStore:
+    """
+    Get the process-wide store for a database path.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        WorkOrderStore instance (created on first use)
+    """
+    store = _stores.get(db_path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(db_path)
+            if store is None:
+                store = WorkOrderStore(db_path)
+                _stores[db_path] = store
+    return store
@@ -1,33 +1,30 @@
 """Tool for retrieving work order information."""
 
-from typing import Dict, Any
-import json
+from typing import Dict, Any, List, Optional
+import copy
+import logging
 import os
-from pathlib import Path
+from . import assets
+from .workorder_store import WorkOrderStore, get_store, index_fields
+from ..config.settings import WORKORDER_STORE, WORKORDER_DB_PATH
+from ..observability.tracing import traced_tool
 
+logger = logging.getLogger(__name__)
 
-def _load_work_orders() -> Dict[str, Dict[str, Any]]:
+# Database paths already reported missing (warned once per path)
+_missing_databases = set()
+
+
+def _index_work_orders(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     """
-    Load work orders from workOrders.json file.
+    Build the workOrderId index for parsed workOrders.json content.
+    
+    Args:
+        data: Parsed workOrders.json content
     
     Returns:
         Dictionary mapping workOrderId to work order data
     """
-    # Get assets path
-    assets_path = os.getenv("ASSETS_PATH", "/app/assets")
-    if not os.path.exists(assets_path):
-        # Fallback to relative path
-        current_dir = Path(__file__).parent.parent
-        assets_path = current_dir / "assets"
-    
-    work_orders_file = Path(assets_path) / "workOrders.json"
-    
-    if not work_orders_file.exists():
-        return {}
-    
-    with open(work_orders_file, 'r') as f:
-        data = json.load(f)
-    
     # Convert list to dictionary keyed by workOrderId
     work_orders = {}
     for wo in data.get("workOrders", []):
@@ -38,6 +35,49 @@ def _load_work_orders() -> Dict[str, Dict[str, Any]]:
     return work_orders
 
 
+def _load_work_orders() -> Dict[str, Dict[str, Any]]:
+    """
+    Load work orders from workOrders.json file.
+    
+    The file is parsed and indexed once per change via the shared asset registry.
+    
+    Returns:
+        Dictionary mapping workOrderId to work order data
+    """
+    snapshot = assets.get_snapshot("workOrders.json")
+    if snapshot is None:
+        return {}
+    
+    return assets.derive(snapshot, "work_order_index", _index_work_orders)
+
+
+def _sqlite_store() -> Optional[WorkOrderStore]:
+    """
+    Get the SQLite work order store when WORKORDER_STORE=sqlite.
+    
+    A missing database file is not created here (it would be empty and every
+    lookup would miss): lookups fall back to workOrders.json, with a warning,
+    until scripts/import_work_orders.py has built it.
+    
+    Returns:
+        WorkOrderStore, or None when the JSON file is the configured backend
+        or the database has not been built
+    """
+    if WORKORDER_STORE != "sqlite":
+        return None
+    db_path = WORKORDER_DB_PATH or str(assets.assets_path() / "workOrders.db")
+    if not os.path.exists(db_path):
+        if db_path not in _missing_databases:
+            _missing_databases.add(db_path)
+            logger.warning(
+                "WORKORDER_STORE=sqlite but %s does not exist; using workOrders.json "
+                "(build the database with scripts/import_work_orders.py)", db_path
+            )
+        return None
+    return get_store(db_path)
+
+
+@traced_tool
 def get_workorder_by_id(id: str) -> Dict[str, Any]:
     """
     Retrieve work order by ID.
@@ -46,13 +86,15 @@ def get_workorder_by_id(id: str) -> Dict[str, Any]:
         id: Work order ID (e.g., "WO-87231")
     
     Returns:
-        Work order data from JSON file
+        Work order data from the configured store (workOrders.json or SQLite)
     """
-    # Load work orders from JSON file
-    work_orders = _load_work_orders()
-    
-    # Find and return the work order directly
-    wo = work_orders.get(id)
+    store = _sqlite_store()
+    if store is not None:
+        # Indexed lookup; the row is decoded fresh so no copy is needed
+        wo = store.get(id)
+    else:
+        # Load work orders from JSON file
+        wo = copy.deepcopy(_load_work_orders().get(id))
     
     if not wo:
         # Return minimal structure if not found
@@ -65,5 +107,58 @@ def get_workorder_by_id(id: str) -> Dict[str, Any]:
             "longitude": None
         }
     
-    # Return work order as-is from JSON
     return wo
+
+
+@traced_tool
+def find_workorders(
+    site: Optional[str] = None,
+    area: Optional[str] = None,
+    location: Optional[str] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    Find work orders by site, area and/or location.
+    
+    Args:
+        site: Site/plant name (e.g., "Plant-A")
+        area: Area name (e.g., "Tank Farm")
+        location: Full location string (e.g., "Tank Farm - Zone 2")
+        limit: Maximum number of work orders to return
+    
+    Returns:
+        List of matching work orders
+    """
+    store = _sqlite_store()
+    if store is not None:
+        return store.find(site=site, area=area, location=location, limit=limit)
+    
+    # JSON backend: scan the cached index
+    matches = []
+    work_orders = _load_work_orders()
+    for work_order_id in sorted(work_orders):
+        wo = work_orders[work_order_id]
+        fields = index_fields(wo)
+        if site is not None and fields["site"] != site:
+            continue
+        if area is not None and fields["area"] != area:
+            continue
+        if location is not None and fields["location"] != location:
+            continue
+        matches.append(copy.deepcopy(wo))
+        if len(matches) >= limit:
+            break
+    return matches
+
+
+def list_workorder_ids() -> List[str]:
+    """
+    List all work order IDs in the configured store.
+    
+    Returns:
+        Sorted list of work order IDs
+    """
+    store = _sqlite_store()
+    if store is not None:
+        return store.ids()
+    return sorted(_load_work_orders())